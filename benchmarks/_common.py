@@ -0,0 +1,49 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import sys
+import time
+from typing import Callable, Iterable, List
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make the package and the test fixtures importable when run as a script
+for path in (ROOT, os.path.join(ROOT, "tests")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class StaticCatalogAPI:
+    """Minimal API client stand-in that serves a fixed catalog."""
+    
+    def __init__(self, cards):
+        self.cards = cards
+    
+    def get_all_cards(self):
+        return self.cards
+    
+    def get_card_by_name(self, card_name):
+        return None
+    
+    def search_cards(self, query):
+        return []
+
+
+def time_per_call(func: Callable, inputs: Iterable, repeat: int = 1) -> float:
+    """Return the mean wall-clock seconds per call of ``func`` over ``inputs``."""
+    inputs = list(inputs)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            func(item)
+    return (time.perf_counter() - start) / (len(inputs) * repeat)
+
+
+def report(title: str, rows: List[tuple]):
+    """Print a simple aligned results table."""
+    print(f"\n{title}")
+    print("-" * len(title))
+    width = max(len(str(row[0])) for row in rows)
+    for label, value in rows:
+        print(f"  {str(label).ljust(width)}  {value}")
@@ -0,0 +1,119 @@
+"""Benchmark disk footprint and read latency of compressed cache entries.
+
+Writes per-card responses (``cardinfo.php?name=``) and the full catalog
+dump with each codec, then reads them back. "Cold" reads drop the files
+from the page cache first (``posix_fadvise``; on filesystems that ignore
+it, such as tmpfs, they are warm too) and use a new cache instance, so
+dictionaries and decompression contexts are loaded again; "warm" reads
+repeat them. Sizes are of the response bodies, without the metadata
+sidecars; "on disk" counts their allocated blocks, which is what
+thousands of small files really cost.
+
+Usage: python benchmarks/bench_cache_compression.py [catalog_size] [card_entries]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from _common import report
+
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.cache_codec import CacheCodec
+from yugioh_db_generator.api.response_cache import ResponseCache
+
+CATALOG_ENDPOINT = "/cardinfo.php"
+
+
+def disk_usage(cache_dir):
+    """Return (bytes, allocated bytes) of the response bodies under ``cache_dir``."""
+    size = allocated = 0
+    for directory, _, names in os.walk(cache_dir):
+        if os.path.basename(directory) == ResponseCache.DICTIONARY_DIR:
+            continue
+        for name in names:
+            if name.endswith(ResponseCache.META_SUFFIX):
+                continue
+            stat = os.stat(os.path.join(directory, name))
+            size += stat.st_size
+            allocated += stat.st_blocks * 512
+    return size, allocated
+
+
+def drop_page_cache(cache_dir):
+    for directory, _, names in os.walk(cache_dir):
+        for name in names:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def read_all(cache_dir, compression, endpoints):
+    """Return (seconds per card entry, seconds for the catalog dump) with a new cache instance."""
+    cache = ResponseCache(cache_dir, compression=compression)
+    start = time.perf_counter()
+    for endpoint in endpoints:
+        cache.read(endpoint)
+    per_card = (time.perf_counter() - start) / len(endpoints)
+    
+    start = time.perf_counter()
+    with cache.reader(CATALOG_ENDPOINT) as f:
+        while f.read(1 << 16):
+            pass
+    return per_card, time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    entries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    
+    catalog = build_catalog(size)
+    training = [json.dumps({"data": [card]}).encode("utf-8") for card in catalog[:2000]]
+    cards = catalog[-entries:]
+    endpoints = [f"/cardinfo.php?name={card['id']}" for card in cards]
+    
+    codecs = [("none", False), ("gzip", False)]
+    if CacheCodec.is_zstd_available():
+        codecs += [("zstd", False), ("zstd", True)]
+    
+    footprint, latency = [], []
+    for compression, dictionary in codecs:
+        label = f"{compression} + dictionary" if dictionary else compression
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResponseCache(cache_dir, compression=compression)
+            if dictionary:
+                cache.codec.train_dictionary(training)
+            with cache.writer(CATALOG_ENDPOINT) as f:
+                f.write(json.dumps({"data": catalog}).encode("utf-8"))
+            catalog_size, catalog_allocated = disk_usage(cache_dir)
+            for endpoint, card in zip(endpoints, cards):
+                cache.write(endpoint, {"data": [card]})
+            card_size, card_allocated = disk_usage(cache_dir)
+            card_size -= catalog_size
+            card_allocated -= catalog_allocated
+            
+            drop_page_cache(cache_dir)
+            cold = read_all(cache_dir, compression, endpoints)
+            warm = read_all(cache_dir, compression, endpoints)
+        
+        footprint.append((
+            label,
+            f"catalog {catalog_size / 1e6:.1f} MB, {entries} cards {card_size / 1e6:.2f} MB "
+            f"({card_allocated / 1e6:.1f} MB on disk)"
+        ))
+        latency.append((
+            label,
+            f"card cold {cold[0] * 1e6:.0f} us / warm {warm[0] * 1e6:.0f} us, "
+            f"catalog cold {cold[1] * 1e3:.0f} ms / warm {warm[1] * 1e3:.0f} ms"
+        ))
+    
+    report(f"Cache footprint ({size}-card catalog)", footprint)
+    report("Cache read latency", latency)
+
+
+if __name__ == "__main__":
+    main()
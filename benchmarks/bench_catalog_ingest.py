@@ -0,0 +1,63 @@
+"""Benchmark peak memory of ingesting a catalog dump: json.load vs. streaming.
+
+The "json.load" row parses the whole cached response, then projects the
+cards. The "streaming" row is ``YGOPRODeckAPI``'s ingestion, which parses
+the file in chunks and writes the snapshot as it goes. Load times are
+measured untraced; peak memory with tracemalloc in a second run.
+
+Usage: python benchmarks/bench_catalog_ingest.py [catalog_size]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _common import report
+
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+from yugioh_db_generator.api.card_record import CardRecord
+
+
+def measure(load):
+    """Return (seconds, cards, peak traced bytes) of ``load()``, timed untraced."""
+    start = time.perf_counter()
+    cards = load()
+    elapsed = time.perf_counter() - start
+    del cards
+    
+    tracemalloc.start()
+    cards = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, len(cards), peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        api = YGOPRODeckAPI(cache_dir=cache_dir)
+        source_path = api._get_cache_path(api.CARD_INFO_ENDPOINT)
+        api._save_to_cache(api.CARD_INFO_ENDPOINT, {"data": build_catalog(size)})
+        
+        def load_whole():
+            with open(source_path, "r", encoding="utf-8") as f:
+                return [CardRecord(card) for card in json.load(f)["data"]]
+        
+        def load_streaming():
+            return api._ingest_catalog(api._stream_catalog())
+        
+        rows = []
+        for label, load in (("json.load", load_whole), ("streaming", load_streaming)):
+            elapsed, count, peak = measure(load)
+            rows.append((label, f"peak {peak / 1e6:.0f} MB, {count} cards in {elapsed:.1f} s"))
+        
+        report(f"Catalog ingestion ({os.path.getsize(source_path) / 1e6:.0f} MB dump)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark the memory held by the loaded catalog: raw card dicts vs. CardRecords.
+
+Both catalogs are parsed from the same JSON dump, as the API client does;
+the records are projected as when the snapshot holds the heavy fields.
+
+Usage: python benchmarks/bench_catalog_memory.py [catalog_size]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from _common import report
+
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.card_record import CardRecord
+
+
+def retained(load):
+    """Return (seconds, bytes still allocated by the result) of ``load()``."""
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    dump = json.dumps({"data": build_catalog(size)})
+    
+    def load_extras(card_id):
+        return {}
+    
+    def load_records():
+        return [CardRecord(card, load_extras) for card in json.loads(dump)["data"]]
+    
+    dict_seconds, dict_bytes = retained(lambda: json.loads(dump)["data"])
+    record_seconds, record_bytes = retained(load_records)
+    
+    report(f"Catalog memory ({size} cards)", [
+        ("card dicts", f"{dict_bytes / 1e6:.1f} MB, parsed in {dict_seconds * 1e3:.0f} ms"),
+        ("CardRecords", f"{record_bytes / 1e6:.1f} MB ({dict_bytes / record_bytes:.1f}x smaller), "
+                        f"parsed and projected in {record_seconds * 1e3:.0f} ms"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark catalog startup: parsing the cached JSON dump vs. the SQLite snapshot.
+
+Each load runs in a fresh interpreter so its time and peak RSS growth are
+measured in isolation (Linux only: reads /proc/self/status).
+
+Usage: python benchmarks/bench_catalog_startup.py [catalog_size]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from _common import ROOT, report
+
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+
+
+LOADER = """
+import sys, time
+sys.path.insert(0, {root!r})
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+
+def peak_rss_kb():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+
+api = YGOPRODeckAPI(cache_dir={cache_dir!r})
+if {mode!r} == "json":
+    api.catalog_snapshot = None
+# Reset the peak so the package imports (NumPy, SciPy) are not counted
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")
+before = peak_rss_kb()
+start = time.perf_counter()
+cards = api.get_all_cards()
+elapsed = time.perf_counter() - start
+print(elapsed, len(cards), peak_rss_kb() - before)
+"""
+
+
+def measure(cache_dir, mode):
+    """Load the catalog in a subprocess, returning (seconds, cards, peak RSS growth in MB)."""
+    script = LOADER.format(root=ROOT, cache_dir=cache_dir, mode=mode)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    elapsed, count, rss_growth = output.stdout.split()
+    return float(elapsed), int(count), int(rss_growth) / 1024
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        api = YGOPRODeckAPI(cache_dir=cache_dir)
+        source_path = api._get_cache_path(api.CARD_INFO_ENDPOINT)
+        api._save_to_cache(api.CARD_INFO_ENDPOINT, {"data": build_catalog(size)})
+        
+        # The first load parses the dump and writes the snapshot
+        api.get_all_cards()
+        
+        rows = []
+        for label, mode in (("JSON dump", "json"), ("SQLite snapshot", "snapshot")):
+            elapsed, count, rss_growth = measure(cache_dir, mode)
+            rows.append((label, f"{elapsed * 1e3:.0f} ms, {count} cards, peak RSS +{rss_growth:.0f} MB"))
+        
+        report(
+            f"Catalog startup ({os.path.getsize(source_path) / 1e6:.1f} MB dump, "
+            f"{os.path.getsize(api.catalog_snapshot.path) / 1e6:.1f} MB snapshot)",
+            rows
+        )
+
+
+if __name__ == "__main__":
+    main()
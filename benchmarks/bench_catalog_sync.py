@@ -0,0 +1,78 @@
+"""Benchmark refreshing the cached catalog: clear and re-download vs. an incremental sync.
+
+A local stand-in server serves the catalog and its database version. The
+"clear cache" refresh deletes the cache and loads the catalog again; the
+sync checks the version first, and when the catalog changed rewrites only
+the heavy-field snapshot rows of the cards whose sets, images or prices
+changed.
+
+Usage: python benchmarks/bench_catalog_sync.py [catalog_size] [changed_cards]
+"""
+
+import copy
+import sys
+import tempfile
+import time
+
+from _common import report
+
+from catalog_fixture import build_catalog
+from stub_server import StubAPIServer
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+
+
+def new_client(server, cache_dir):
+    api = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=True)
+    api.BASE_URL = server.url
+    return api
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    
+    catalog = build_catalog(size)
+    updated = copy.deepcopy(catalog)
+    for card in updated[:changed]:
+        card["desc"] += " (Updated)"
+    
+    rows = []
+    with StubAPIServer(catalog) as server, tempfile.TemporaryDirectory() as cache_dir:
+        new_client(server, cache_dir).sync_catalog()
+        
+        def clear_and_reload():
+            api = new_client(server, cache_dir)
+            api.clear_cache()
+            return api.get_all_cards()
+        
+        seconds, _ = timed(clear_and_reload)
+        rows.append(("clear cache + reload", f"{seconds * 1e3:.0f} ms, 1 catalog download"))
+        new_client(server, cache_dir).sync_catalog()
+        
+        requests = server.requests
+        seconds, result = timed(lambda: new_client(server, cache_dir).sync_catalog())
+        rows.append((
+            "sync, same version",
+            f"{seconds * 1e3:.0f} ms, {server.requests - requests} request(s), {result['status']}"
+        ))
+        
+        server.cards = updated
+        server.database_version = "2.0"
+        seconds, result = timed(lambda: new_client(server, cache_dir).sync_catalog())
+        rows.append((
+            f"sync, {changed} cards changed",
+            f"{seconds * 1e3:.0f} ms, {len(result['changed'])} changed, "
+            f"{result['snapshot_rows_written']} snapshot rows rewritten"
+        ))
+    
+    report(f"Catalog refresh ({size} cards)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark local fuzzy name resolution: difflib scan vs. BK-tree index.
+
+Usage: python benchmarks/bench_fuzzy_search.py [catalog_size]
+"""
+
+import difflib
+import random
+import sys
+
+from _common import StaticCatalogAPI, report, time_per_call
+
+from catalog_fixture import build_catalog, make_typo
+from yugioh_db_generator.core.search_engine import CardSearchEngine
+
+
+def legacy_local_fuzzy_search(engine, card_name):
+    """The original difflib-based local fuzzy search, kept here for comparison."""
+    for alt in engine._generate_alternative_spellings(card_name):
+        matches = difflib.get_close_matches(
+            alt, engine.all_card_names, n=1, cutoff=engine.similarity_threshold
+        )
+        if matches:
+            return matches[0]
+    return None
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    catalog = build_catalog(size)
+    engine = CardSearchEngine(StaticCatalogAPI(catalog))
+
+    rng = random.Random(11)
+    sample = rng.sample(catalog, 20)
+    queries = [make_typo(card['name'], rng) for card in sample]
+
+    before = time_per_call(lambda q: legacy_local_fuzzy_search(engine, q), queries)
+    after = time_per_call(engine._local_fuzzy_search, queries)
+
+    resolved = sum(
+        1 for card, query in zip(sample, queries)
+        if (engine._local_fuzzy_search(query) or {}).get('name') == card['name']
+    )
+
+    report(f"Local fuzzy search over {len(catalog)} cards ({len(queries)} typo queries)", [
+        ("before (difflib scan)", f"{before * 1000:.2f} ms/query"),
+        ("after (BK-tree + rerank)", f"{after * 1000:.2f} ms/query"),
+        ("speed-up", f"{before / after:.1f}x"),
+        ("BK-tree resolved correctly", f"{resolved}/{len(queries)}"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark per-request latency: a new connection per request vs. a pooled session.
+
+The stand-in server delays every new connection to model the TCP and TLS
+handshakes of db.ygoprodeck.com.
+
+Usage: python benchmarks/bench_http_pooling.py [requests] [connect_delay_ms]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from _common import report
+
+from catalog_fixture import build_catalog
+from stub_server import StubAPIServer
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+from yugioh_db_generator.api.rate_limiter import TokenBucket
+
+
+class UnpooledSession:
+    """Session stand-in reproducing the old module-level ``requests.get`` calls."""
+    
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+
+def run(server, names, workers, session):
+    # No rate limit: the benchmark measures connection handling only
+    unlimited = TokenBucket(rate=1e9, burst=len(names))
+    api = YGOPRODeckAPI(
+        cache_dir=None, use_cache=False, max_workers=workers, session=session, rate_limiter=unlimited
+    )
+    api.BASE_URL = server.url
+    
+    connections = server.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(api.get_card_by_name, names))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(names), server.connections - connections
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    connect_delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    catalog = build_catalog(2000)
+    names = [card['name'] for card in catalog[:count]]
+    
+    rows = []
+    with StubAPIServer(catalog, connect_delay=connect_delay) as server:
+        for workers in (1, 4):
+            for label, session in (("new connection", UnpooledSession()), ("pooled session", None)):
+                per_request, connections = run(server, names, workers, session)
+                rows.append((
+                    f"{label}, {workers} thread(s)",
+                    f"{per_request * 1e3:.2f} ms/request, {connections} connections"
+                ))
+    
+    report(f"{len(names)} name lookups, {connect_delay * 1e3:.0f} ms connection setup", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark the similarity upper bound used to prune candidate scoring.
+
+Counts full _calculate_similarity calls made by the fuzzy API and token
+stages with and without pruning.
+
+Usage: python benchmarks/bench_similarity_pruning.py [catalog_size]
+"""
+
+import random
+import sys
+import time
+
+from _common import StaticCatalogAPI, report
+
+from catalog_fixture import build_catalog, make_typo
+from yugioh_db_generator.core.search_engine import CardSearchEngine
+
+
+class SubstringCatalogAPI(StaticCatalogAPI):
+    """Answers ``search_cards`` like the remote ``fname`` search."""
+    
+    def search_cards(self, query):
+        query = query.lower()
+        return [card for card in self.cards if query in card['name'].lower()]
+
+
+def measure(engine, queries):
+    """Return (full similarity calls, ms per query) for both stages."""
+    calls = [0]
+    calculate = engine._calculate_similarity
+    
+    def counting_similarity(str1, str2):
+        calls[0] += 1
+        return calculate(str1, str2)
+    
+    engine._calculate_similarity = counting_similarity
+    start = time.perf_counter()
+    for query in queries:
+        engine._fuzzy_api_search(query)
+        engine._token_search(query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    return calls[0], elapsed * 1000
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    catalog = build_catalog(size)
+    api_client = SubstringCatalogAPI(catalog)
+
+    rng = random.Random(5)
+    queries = [make_typo(card['name'], rng) for card in rng.sample(catalog, 20)]
+
+    unpruned = CardSearchEngine(api_client)
+    unpruned._similarity_upper_bound = lambda profile, name: float('inf')
+    before_calls, before_ms = measure(unpruned, queries)
+    after_calls, after_ms = measure(CardSearchEngine(api_client), queries)
+
+    report(f"Similarity pruning over {len(catalog)} cards ({len(queries)} typo queries)", [
+        ("full similarity calls before", before_calls),
+        ("full similarity calls after", after_calls),
+        ("before", f"{before_ms:.2f} ms/query"),
+        ("after", f"{after_ms:.2f} ms/query"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark local fname emulation: linear scan vs. trigram substring index.
+
+Usage: python benchmarks/bench_substring_search.py [catalog_size]
+"""
+
+import random
+import sys
+
+from _common import report, time_per_call
+
+from catalog_fixture import build_catalog
+from yugioh_db_generator.index.substring_index import SubstringIndex
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    names = [card['name'] for card in build_catalog(size)]
+    lowered = [name.lower() for name in names]
+
+    index = SubstringIndex()
+    index.build(names)
+
+    # Queries shaped like the ones _generate_search_queries produces
+    rng = random.Random(9)
+    queries = []
+    for name in rng.sample(names, 100):
+        words = name.split()
+        queries.extend([name[:5], words[0], max(words, key=len)])
+
+    scan = time_per_call(lambda q: [i for i, n in enumerate(lowered) if q.lower() in n], queries)
+    indexed = time_per_call(index.search, queries)
+
+    report(f"Substring search over {len(names)} names ({len(queries)} queries)", [
+        ("linear scan", f"{scan * 1e6:.0f} us/query"),
+        ("trigram index", f"{indexed * 1e6:.0f} us/query"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark CardSearchEngine._token_search before and after the token index.
+
+Usage: python benchmarks/bench_token_search.py [catalog_size]
+"""
+
+import random
+import re
+import sys
+
+from _common import StaticCatalogAPI, report, time_per_call
+
+from catalog_fixture import build_catalog, make_typo
+from yugioh_db_generator.core.search_engine import CardSearchEngine
+
+
+def legacy_token_search(engine, card_name):
+    """The original linear-scan token search, kept here for comparison."""
+    tokens = re.findall(r'\b\w+\b', card_name)
+    if len(tokens) < 2 or not engine.all_cards:
+        return None
+    candidates = []
+    for card in engine.all_cards:
+        card_name_lower = card['name'].lower()
+        card_tokens = set(re.findall(r'\b\w+\b', card_name_lower))
+        matching_tokens = 0
+        for token in tokens:
+            if token.lower() in card_tokens:
+                matching_tokens += len(token)
+        similarity = engine._calculate_similarity(card_name.lower(), card_name_lower)
+        if matching_tokens > 0 or similarity > engine.similarity_threshold / 2:
+            score = matching_tokens + (similarity * 10)
+            candidates.append((score, similarity, card['name']))
+    candidates.sort(reverse=True)
+    if candidates and candidates[0][1] >= engine.similarity_threshold / 1.5:
+        return candidates[0][2]
+    return None
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 13500
+    catalog = build_catalog(size)
+    engine = CardSearchEngine(StaticCatalogAPI(catalog))
+
+    rng = random.Random(7)
+    queries = [make_typo(card['name'], rng) for card in rng.sample(catalog, 20)]
+    queries = [q for q in queries if len(q.split()) >= 2]
+
+    before = time_per_call(lambda q: legacy_token_search(engine, q), queries)
+    after = time_per_call(engine._token_search, queries)
+
+    report(f"Token search over {len(catalog)} cards ({len(queries)} queries)", [
+        ("before (linear scan)", f"{before * 1000:.2f} ms/query"),
+        ("after (token index)", f"{after * 1000:.2f} ms/query"),
+        ("speed-up", f"{before / after:.1f}x"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,12 @@ setup(
         "python-levenshtein>=0.21.0",
         "pyyaml>=6.0.0",
     ],
+    extras_require={
+        "vector": ["numpy>=1.21.0", "scipy>=1.7.0"],
+        "async": ["aiohttp>=3.8.0"],
+        "zstd": ["zstandard>=0.18.0"],
+        "web": ["flask[async]>=2.0.0", "aiohttp>=3.8.0"],
+    },
     entry_points={
         "console_scripts": [
             "yugioh-db-generator=yugioh_db_generator.__main__:main",
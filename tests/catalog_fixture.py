@@ -0,0 +1,165 @@
+"""Synthetic full-size card catalog used by tests and benchmarks."""
+
+import random
+from typing import Any, Dict, List
+
+
+REAL_CARDS = [
+    ("Dark Magician", "Normal Monster", "Spellcaster", "DARK"),
+    ("Blue-Eyes White Dragon", "Normal Monster", "Dragon", "LIGHT"),
+    ("Snake-Eye Ash", "Effect Monster", "Pyro", "FIRE"),
+    ("Snake-Eye Oak", "Effect Monster", "Pyro", "FIRE"),
+    ("Snake-Eyes Poplar", "Effect Monster", "Pyro", "FIRE"),
+    ("Snake-Eyes Flamberge Dragon", "Effect Monster", "Dragon", "FIRE"),
+    ("Fiendsmith Engraver", "Effect Monster", "Fiend", "LIGHT"),
+    ("Fiendsmith's Tract", "Spell Card", "Normal", None),
+    ("Crystal Beast Sapphire Pegasus", "Effect Monster", "Beast", "WIND"),
+    ("Crystal Beast Ruby Carbuncle", "Effect Monster", "Beast", "LIGHT"),
+    ("Magicians' Souls", "Effect Monster", "Spellcaster", "DARK"),
+    ("Harpie's Feather Storm", "Trap Card", "Normal", None),
+    ("Infinite Impermanence", "Trap Card", "Normal", None),
+    ("Called by the Grave", "Spell Card", "Quick-Play", None),
+    ("Pot of Greed", "Spell Card", "Normal", None),
+    ("Mirror Force", "Trap Card", "Normal", None),
+    ("Magistus Chorozo", "Fusion Monster", "Spellcaster", "LIGHT"),
+    ("Rciela, Sinister Soul of the White Forest", "Synchro Monster", "Spellcaster", "LIGHT"),
+    ("Chosen by the World Chalice", "Spell Card", "Normal", None),
+    ("World Legacy - \"World Chalice\"", "Effect Monster", "Cyberse", "LIGHT"),
+]
+
+PREFIXES = [
+    "Ancient", "Blazing", "Celestial", "Crimson", "Cyber", "Dark", "Divine",
+    "Dragon", "Elemental", "Eternal", "Evil", "Fallen", "Galaxy", "Gem",
+    "Ghost", "Gladiator", "Gold", "Infernal", "Iron", "Lunar", "Magical",
+    "Mystic", "Neo", "Number", "Phantom", "Primal", "Radiant", "Royal",
+    "Shadow", "Silent", "Star", "Storm", "Sunny", "Thunder", "Twilight",
+    "Void", "White", "Wind", "Zombie", "Frost",
+]
+
+NOUNS = [
+    "Knight", "Dragon", "Wizard", "Warrior", "Beast", "Angel", "Golem",
+    "Serpent", "Phoenix", "Titan", "Sorceress", "Guardian", "Hunter",
+    "Dancer", "Soldier", "Spirit", "Witch", "Samurai", "Archfiend", "Lord",
+    "Paladin", "Mermaid", "Sentinel", "Monarch", "Emperor", "Lancer",
+    "Jester", "Fairy", "Chimera", "Wyvern",
+]
+
+SUFFIXES = [
+    "", "", "", "of the Abyss", "of Chaos", "of Light", "of the Forest",
+    "Lv3", "Lv5", "Mk-II", "the Wanderer", "Reborn", "Overlord", "Zero",
+    "of Destruction", "of the Ice Barrier", "Omega", "Alpha",
+]
+
+SPELL_WORDS = [
+    "Ritual", "Rebirth", "Fusion", "Draw", "Burial", "Storm", "Charge",
+    "Barrier", "Bond", "Tactics", "Calling", "Sanctuary", "Temple",
+    "Gateway", "Treasure", "Emblem", "Formation", "Cyclone", "Veil",
+]
+
+RACES = ["Dragon", "Spellcaster", "Warrior", "Beast", "Fiend", "Fairy",
+         "Machine", "Zombie", "Pyro", "Aqua", "Cyberse", "Wyrm"]
+ATTRIBUTES = ["DARK", "LIGHT", "FIRE", "WATER", "EARTH", "WIND"]
+MONSTER_TYPES = ["Effect Monster", "Normal Monster", "Fusion Monster",
+                 "Synchro Monster", "Xyz Monster", "Link Monster"]
+
+
+def _make_card(card_id: int, name: str, card_type: str, race: str,
+               attribute: str, rng: random.Random) -> Dict[str, Any]:
+    """Build a card payload shaped like a YGOPRODeck ``cardinfo.php`` entry."""
+    card = {
+        "id": card_id,
+        "name": name,
+        "type": card_type,
+        "frameType": card_type.split(" ")[0].lower(),
+        "desc": f"Card text for {name}. " * rng.randint(2, 6),
+        "race": race,
+        "ygoprodeck_url": f"https://ygoprodeck.com/card/{card_id}",
+        "card_sets": [
+            {
+                "set_name": f"Set {rng.randint(1, 400)}",
+                "set_code": f"SET-EN{rng.randint(0, 999):03d}",
+                "set_rarity": rng.choice(["Common", "Rare", "Super Rare", "Ultra Rare"]),
+                "set_rarity_code": "(C)",
+                "set_price": f"{rng.random() * 10:.2f}",
+            }
+            for _ in range(rng.randint(1, 8))
+        ],
+        "card_images": [
+            {
+                "id": card_id,
+                "image_url": f"https://images.ygoprodeck.com/images/cards/{card_id}.jpg",
+                "image_url_small": f"https://images.ygoprodeck.com/images/cards_small/{card_id}.jpg",
+                "image_url_cropped": f"https://images.ygoprodeck.com/images/cards_cropped/{card_id}.jpg",
+            }
+        ],
+        "card_prices": [
+            {
+                "cardmarket_price": f"{rng.random():.2f}",
+                "tcgplayer_price": f"{rng.random():.2f}",
+                "ebay_price": f"{rng.random() * 5:.2f}",
+                "amazon_price": f"{rng.random() * 5:.2f}",
+                "coolstuffinc_price": f"{rng.random() * 5:.2f}",
+            }
+        ],
+    }
+    if "Monster" in card_type:
+        card["attribute"] = attribute
+        card["atk"] = rng.randrange(0, 3100, 100)
+        if "Link" in card_type:
+            card["linkval"] = rng.randint(1, 5)
+        else:
+            card["def"] = rng.randrange(0, 3100, 100)
+            card["level"] = rng.randint(1, 12)
+    return card
+
+
+def build_catalog(size: int = 13500, seed: int = 1996) -> List[Dict[str, Any]]:
+    """Build a deterministic synthetic catalog of ``size`` cards.
+
+    The first entries are real card names so tests can resolve familiar
+    misspellings; the rest are generated from archetype-like word lists.
+    """
+    rng = random.Random(seed)
+    cards = []
+    seen = set()
+
+    for name, card_type, race, attribute in REAL_CARDS:
+        cards.append(_make_card(10000 + len(cards), name, card_type, race, attribute, rng))
+        seen.add(name)
+
+    while len(cards) < size:
+        if rng.random() < 0.75:
+            name = f"{rng.choice(PREFIXES)} {rng.choice(NOUNS)}"
+            suffix = rng.choice(SUFFIXES)
+            if suffix:
+                name = f"{name} {suffix}"
+            card_type = rng.choice(MONSTER_TYPES)
+            race = rng.choice(RACES)
+        else:
+            name = f"{rng.choice(PREFIXES)} {rng.choice(SPELL_WORDS)}"
+            if rng.random() < 0.5:
+                name = f"{name} of the {rng.choice(NOUNS)}"
+            card_type = rng.choice(["Spell Card", "Trap Card"])
+            race = rng.choice(["Normal", "Quick-Play", "Continuous", "Field", "Counter"])
+        while name in seen:
+            name = f"{name} {rng.choice(PREFIXES)}"
+        seen.add(name)
+        cards.append(_make_card(10000 + len(cards), name, card_type, race,
+                                rng.choice(ATTRIBUTES), rng))
+
+    return cards
+
+
+def make_typo(name: str, rng: random.Random) -> str:
+    """Apply a single random edit (swap, drop, duplicate or case change) to ``name``."""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 2)
+    edit = rng.choice(["swap", "drop", "double", "case"])
+    if edit == "swap":
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if edit == "drop":
+        return name[:i] + name[i + 1:]
+    if edit == "double":
+        return name[:i] + name[i] + name[i:]
+    return name[:i] + name[i].swapcase() + name[i + 1:]
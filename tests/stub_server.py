@@ -0,0 +1,162 @@
+"""Local stand-in for the YGOPRODeck API used by tests and benchmarks."""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+class StubAPIServer:
+    """Threaded HTTP server answering ``/api/v7/cardinfo.php`` from a catalog.
+    
+    Supports the ``name`` (``|``-separated), ``id`` (comma-separated),
+    ``fname`` and ``banlist`` parameters; without parameters the whole catalog is returned. The
+    server counts connections and requests, and can add a delay to every
+    new connection to stand in for the TCP and TLS handshakes of the real
+    host, plus a per-request latency. ``queue_response`` makes the next
+    requests fail with a given status (e.g. 429 with Retry-After), drop the
+    connection without answering when the status is None, or drop it
+    halfway through the real answer when it is ``TRUNCATE``. Answers
+    carry an ETag, and a matching If-None-Match gets 304 Not Modified.
+    ``/api/v7/checkDBVer.php`` reports ``database_version``.
+    
+    Use as a context manager; ``url`` is the base URL to give the client.
+    """
+    
+    TRUNCATE = "truncate"
+    
+    def __init__(self, cards: List[Dict[str, Any]], connect_delay: float = 0.0, latency: float = 0.0):
+        self.cards = cards
+        self.connect_delay = connect_delay
+        self.latency = latency
+        self.database_version = "1.0"
+        self.connections = 0
+        self.requests = 0
+        self.paths: List[str] = []
+        self.queued: List[Tuple[int, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def cards(self) -> List[Dict[str, Any]]:
+        return self._cards
+    
+    @cards.setter
+    def cards(self, cards: List[Dict[str, Any]]):
+        """Replace the catalog; name and ID lookups follow it."""
+        self._cards = cards
+        self.by_name = {card['name'].lower(): card for card in cards}
+        # Alternate artwork IDs resolve to their card, like on the real API
+        self.by_id = {image['id']: card for card in cards for image in card.get('card_images', ())}
+        self.by_id.update((card['id'], card) for card in cards)
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v7"
+    
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def queue_response(
+        self,
+        status: Union[int, str, None],
+        headers: Optional[Dict[str, str]] = None,
+        count: int = 1
+    ):
+        """Answer the next ``count`` requests with ``status`` instead of data (see the class docstring)."""
+        with self._lock:
+            self.queued.extend([(status, headers or {})] * count)
+    
+    def respond(self, path: str):
+        """Build the (status, payload) answer for a request path."""
+        url = urlsplit(path)
+        if url.path.endswith("/checkDBVer.php"):
+            return 200, [{"database_version": self.database_version, "last_update": "2024-01-01 00:00:00"}]
+        
+        query = parse_qs(url.query)
+        if "name" in query:
+            # The client pre-escapes quotes, so names arrive encoded twice
+            names = [unquote(name) for name in query["name"][0].split("|")]
+            cards = [self.by_name[name.lower()] for name in names if name.lower() in self.by_name]
+        elif "id" in query:
+            ids = [int(card_id) for card_id in query["id"][0].split(",") if card_id.isdigit()]
+            cards = [self.by_id[card_id] for card_id in ids if card_id in self.by_id]
+        elif "fname" in query:
+            fragment = query["fname"][0].lower()
+            cards = sorted(
+                (card for card in self.cards if fragment in card['name'].lower()),
+                key=lambda card: card['name']
+            )
+        elif "banlist" in query:
+            cards = [card for card in self.cards if card.get('banlist_info')]
+        else:
+            cards = self.cards
+        
+        if not cards:
+            return 400, {"error": "No card matching your query was found in the database."}
+        return 200, {"data": cards}
+    
+    def _make_handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep connections open between requests
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+            
+            def setup(self):
+                with stub._lock:
+                    stub.connections += 1
+                time.sleep(stub.connect_delay)
+                super().setup()
+            
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.paths.append(self.path)
+                    queued = stub.queued.pop(0) if stub.queued else None
+                time.sleep(stub.latency)
+                
+                truncate = queued and queued[0] == stub.TRUNCATE
+                if queued and not truncate:
+                    status, headers = queued
+                    if status is None:
+                        self.close_connection = True
+                        return
+                    payload = {"error": f"Injected HTTP {status}"}
+                else:
+                    (status, payload), headers = stub.respond(self.path), {}
+                body = json.dumps(payload).encode("utf-8")
+                if status == 200:
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    headers = {"ETag": etag}
+                    if self.headers.get("If-None-Match") == etag:
+                        status, body = 304, b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if truncate:
+                    self.wfile.write(body[:len(body) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
@@ -0,0 +1,33 @@
+# tests/test_alias_store.py
+import json
+from yugioh_db_generator.core.alias_store import AliasStore
+
+def test_aliases_persist_by_normalized_name(tmp_path):
+    path = str(tmp_path / 'aliases.json')
+    store = AliasStore(path)
+    store.add('Snake-eye Oak', 'Snake-Eye Oak', 'v1')
+    store.save()
+    
+    reloaded = AliasStore(path)
+    assert reloaded.get('snakeeye  OAK') == 'Snake-Eye Oak'
+    assert reloaded.items() == {'snakeeye oak': {'name': 'Snake-Eye Oak', 'catalog_version': 'v1'}}
+    
+    assert reloaded.remove('Snake-eye Oak')
+    assert not reloaded.remove('Snake-eye Oak')
+    reloaded.save()
+    assert len(AliasStore(path)) == 0
+
+def test_prune_drops_names_missing_from_catalog(tmp_path):
+    path = str(tmp_path / 'aliases.json')
+    store = AliasStore(path)
+    store.add('Magisitus Chorozo', 'Magistus Chorozo', 'v1')
+    store.add('Retired Crad', 'Retired Card', 'v1')
+    
+    assert store.prune(['Magistus Chorozo', 'Dark Magician'], 'v2') == 1
+    assert store.get('Retired Crad') is None
+    assert store.items()['magisitus chorozo']['catalog_version'] == 'v2'
+
+def test_unknown_format_is_ignored(tmp_path):
+    path = tmp_path / 'aliases.json'
+    path.write_text(json.dumps({'format_version': 99, 'aliases': {'x': {}}}))
+    assert len(AliasStore(str(path))) == 0
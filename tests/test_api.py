@@ -1,4 +1,6 @@
 # tests/test_api.py
+import os
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from yugioh_db_generator.api.card_api import YGOPRODeckAPI
@@ -9,7 +11,7 @@ def test_api_initialization():
     assert api.use_cache is False
     assert api.cache_dir is None
 
-@patch('yugioh_db_generator.api.card_api.requests.get')
+@patch('requests.Session.get')
 def test_get_card_by_name(mock_get):
     # Setup mock response
     mock_response = MagicMock()
@@ -26,4 +28,749 @@ def test_get_card_by_name(mock_get):
     # Assertions
     assert card is not None
     assert card['name'] == 'Dark Magician'
-    mock_get.assert_called_once()
\ No newline at end of file
+    mock_get.assert_called_once()
+
+def _api_with_catalog(cards):
+    api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+    with patch.object(api, '_stream_catalog', return_value=iter(cards)):
+        api.get_all_cards()
+    return api
+
+def test_search_cards_matches_expected_fname_results():
+    import json
+    import os
+    from catalog_fixture import build_catalog, REAL_CARDS
+    
+    # Synthetic expectations written from the documented fname semantics
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'fname_expected_results.json')) as f:
+        expected = json.load(f)['responses']
+    
+    api = _api_with_catalog(build_catalog(len(REAL_CARDS)))
+    with patch('requests.Session.get') as mock_get:
+        for query, response in expected.items():
+            names = [card['name'] for card in api.search_cards(query)]
+            assert names == [card['name'] for card in response['data']], query
+        # Only the query no catalog card matches is sent to the API
+        assert [call.args[0].rsplit('?', 1)[1] for call in mock_get.call_args_list] == ['fname=Drak']
+
+def test_search_cards_uses_api_without_catalog():
+    api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+    with patch.object(api, '_make_request', return_value={'data': [{'name': 'Dark Magician'}]}) as mock_request:
+        assert api.search_cards('Magician') == [{'name': 'Dark Magician'}]
+        mock_request.assert_called_once_with('/cardinfo.php?fname=Magician')
+
+def test_get_cards_by_names_batches_requests():
+    api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+    api.MAX_QUERY_LENGTH = 50
+    names = ['Dark Magician', 'Pot of Greed', "Harpie's Feather Duster", 'Unknown Card']
+    
+    def fake_request(endpoint):
+        if 'Harpie' in endpoint:
+            return None  # Failed chunk
+        return {'data': [{'name': 'Dark Magician'}, {'name': 'Pot of Greed'}]}
+    
+    with patch.object(api, '_make_request', side_effect=fake_request) as mock_request, \
+            patch.object(api, 'get_card_by_name', side_effect=lambda name: {'name': name}) as mock_single:
+        results = api.get_cards_by_names(names + ['Dark Magician'])
+    
+    assert mock_request.call_args_list[0].args[0] == '/cardinfo.php?name=Dark%20Magician|Pot%20of%20Greed'
+    assert mock_request.call_count == 2
+    # The failed chunk is retried name by name
+    assert [call.args[0] for call in mock_single.call_args_list] == ["Harpie's Feather Duster", 'Unknown Card']
+    assert set(results) == set(names)
+
+def test_requests_reuse_pooled_connections():
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False, max_workers=2, read_timeout=5)
+        api.BASE_URL = server.url
+        
+        assert api.timeout == (YGOPRODeckAPI.CONNECT_TIMEOUT, 5)
+        assert api.session.get_adapter(server.url)._pool_maxsize == 2
+        
+        for name in ['Dark Magician', 'Pot of Greed', 'Mirror Force']:
+            assert api.get_card_by_name(name)['name'] == name
+        assert api.get_card_by_name('Nonexistent Card') is None
+        
+        assert server.requests == 4
+        assert server.connections == 1
+
+def test_async_client_shares_cache_with_blocking_client(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def lookups(api):
+        async with api:
+            single = await api.get_card_by_name_async('Dark Magician')
+            batch = await api.get_cards_by_names_async(['Pot of Greed', 'Mirror Force', 'Nonexistent Card'])
+            return single, batch
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        api = AsyncYGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        single, batch = asyncio.run(lookups(api))
+        
+        assert single['name'] == 'Dark Magician'
+        assert sorted(batch) == ['Mirror Force', 'Pot of Greed']
+        assert server.requests == 2
+        
+        # The blocking client is answered from the entries the async client cached
+        blocking = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        blocking.BASE_URL = server.url
+        assert blocking.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 2
+
+def test_async_client_takes_over_a_blocking_clients_state(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def lookups(api):
+        async with api:
+            return await asyncio.gather(
+                api.get_card_by_name_async('Dark Magician'),
+                api.search_cards_async('Magician')
+            )
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        blocking = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        blocking.BASE_URL = server.url
+        blocking.get_all_cards()
+        assert server.requests == 1
+        
+        api = AsyncYGOPRODeckAPI(
+            cache_dir=str(tmp_path),
+            use_cache=True,
+            response_cache=blocking.response_cache,
+            catalog=blocking.catalog
+        )
+        api.BASE_URL = server.url
+        assert api.response_cache is blocking.response_cache
+        single, matches = asyncio.run(lookups(api))
+        assert single['name'] == 'Dark Magician'
+        assert 'Dark Magician' in [card['name'] for card in matches]
+        
+        # The blocking lookups are still available next to the coroutines
+        assert api.get_card_by_name('Pot of Greed')['name'] == 'Pot of Greed'
+        assert server.requests == 1
+
+def test_rate_limited_requests_back_off_and_retry():
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api.BASE_URL = server.url
+        server.queue_response(429, {'Retry-After': '0.3'})
+        
+        start = time.monotonic()
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert time.monotonic() - start >= 0.3
+        
+        assert server.requests == 2
+        stats = api.rate_limiter.stats()
+        assert stats['throttled'] == 1
+        assert stats['rate'] < YGOPRODeckAPI.RATE_LIMIT
+        
+        # A server that keeps refusing is given up on after the retries
+        server.queue_response(429, {'Retry-After': '0'}, count=YGOPRODeckAPI.MAX_THROTTLE_RETRIES + 1)
+        assert api.get_card_by_name('Pot of Greed') is None
+
+def test_catalog_snapshot_replaces_json_parse(tmp_path):
+    import os
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(300)) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        assert len(api.get_all_cards()) == 300
+        assert os.path.exists(api.catalog_snapshot.path)
+        assert server.requests == 1
+    
+    # A new client loads the snapshot, not the JSON response
+    restarted = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+    with patch.object(restarted, '_get_from_cache') as mock_cache:
+        cards = restarted.get_all_cards()
+        mock_cache.assert_not_called()
+    assert [card['name'] for card in cards] == [card['name'] for card in api.catalog]
+    assert 'card_sets' not in dict(cards[0])
+    assert 'desc' in cards[0]
+    
+    # Heavy fields are read on demand
+    extras = restarted.get_card_extras(cards[0])
+    assert extras['card_sets'] == api.catalog[0]['card_sets']
+    
+    # Rewriting the cached response invalidates the snapshot
+    source_path = api._get_cache_path(api.CARD_INFO_ENDPOINT)
+    api._save_to_cache(api.CARD_INFO_ENDPOINT, {'data': build_catalog(120)})
+    assert not restarted.catalog_snapshot.is_fresh(source_path)
+    rebuilt = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+    assert len(rebuilt.get_all_cards()) == 120
+    assert restarted.catalog_snapshot.is_fresh(source_path)
+
+def test_catalog_streams_into_the_cache(tmp_path):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        api.STREAM_CHUNK_SIZE = 1000
+        with patch('requests.Response.json', side_effect=AssertionError('parsed whole')):
+            cards = api.get_all_cards()
+        
+        assert [card['name'] for card in cards] == [card['name'] for card in catalog]
+        assert api._get_from_cache(api.CARD_INFO_ENDPOINT) == {'data': catalog}
+        
+        # Without a cache the cards keep their heavy fields in memory
+        uncached = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        uncached.BASE_URL = server.url
+        assert uncached.get_all_cards()[5].to_dict() == catalog[5]
+        
+        # A malformed response is neither used nor cached
+        server.respond = lambda path: (200, ['not', 'a', 'catalog'])
+        malformed = YGOPRODeckAPI(cache_dir=str(tmp_path / 'malformed'), use_cache=True)
+        malformed.BASE_URL = server.url
+        assert malformed.get_all_cards() == []
+        assert not [name for _, _, names in os.walk(tmp_path / 'malformed') for name in names]
+
+def test_async_client_streams_catalog(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def load(api):
+        async with api:
+            return await api.get_all_cards_async()
+    
+    catalog = build_catalog(200)
+    with StubAPIServer(catalog) as server:
+        for cache_dir in (str(tmp_path), None):
+            api = AsyncYGOPRODeckAPI(cache_dir=cache_dir, use_cache=cache_dir is not None)
+            api.BASE_URL = server.url
+            cards = asyncio.run(load(api))
+            assert [card.to_dict() for card in cards] == catalog
+
+def test_cached_responses_are_revalidated_when_they_age(tmp_path):
+    from catalog_fixture import build_catalog
+    from yugioh_db_generator.api.response_cache import ResponseCache
+    from stub_server import StubAPIServer
+    
+    ttl = YGOPRODeckAPI.CACHE_TTLS[0][1]
+    with StubAPIServer(build_catalog(200)) as server:
+        api = YGOPRODeckAPI(
+            cache_dir=str(tmp_path), use_cache=True, stale_while_revalidate=100, retry_backoff=0.001
+        )
+        api.BASE_URL = server.url
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 1
+        
+        # Stale: answered from the cache while a refresh runs in the background
+        now = time.time()
+        api.response_cache.clock = lambda: now + ttl + 50
+        with patch.object(api, '_fetch', wraps=api._fetch) as mock_fetch:
+            assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+            api.wait_for_revalidations()
+            mock_fetch.assert_called_once()
+        assert server.requests == 2
+        assert api.response_cache.stats()['not_modified'] == 1
+        assert api.response_cache.state(api.CARD_INFO_ENDPOINT + '?name=Dark%20Magician') == ResponseCache.FRESH
+        
+        # Expired: revalidated before use, and served anyway if the API is down
+        api.response_cache.clock = lambda: now + 2 * ttl + 200
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 3
+        api.response_cache.clock = lambda: now + 3 * ttl + 400
+        server.queue_response(503, count=api.max_retries + 1)
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 6
+        assert api.response_cache.stats()['not_modified'] == 2
+
+def test_expired_catalog_is_refreshed_only_when_changed(tmp_path):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True, stale_while_revalidate=0)
+        api.BASE_URL = server.url
+        assert len(api.get_all_cards()) == 300
+        
+        # Unchanged upstream: a 304 keeps the dump, so the snapshot is still used
+        later = time.time() + YGOPRODeckAPI.DEFAULT_CACHE_TTL + 1
+        restarted = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True, stale_while_revalidate=0)
+        restarted.BASE_URL = server.url
+        restarted.response_cache.clock = lambda: later
+        with patch.object(restarted, '_stream_catalog') as mock_stream:
+            assert len(restarted.get_all_cards()) == 300
+            mock_stream.assert_not_called()
+        assert server.requests == 2
+        stats = restarted.response_cache.stats()
+        assert (stats['not_modified'], stats['refreshed']) == (1, 0)
+        
+        # Changed upstream: the new dump replaces the cached one
+        del catalog[200:]
+        restarted.response_cache.clock = lambda: later + YGOPRODeckAPI.DEFAULT_CACHE_TTL + 1
+        assert len(restarted.get_all_cards()) == 200
+        stats = restarted.response_cache.stats()
+        assert (stats['not_modified'], stats['refreshed']) == (1, 1)
+
+def test_async_client_refreshes_stale_and_expired_entries(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    from yugioh_db_generator.api.response_cache import ResponseCache
+    
+    async def lookup(api):
+        async with api:
+            return await api.get_card_by_name_async('Dark Magician')
+    
+    async def all_cards(api):
+        async with api:
+            return await api.get_all_cards_async()
+    
+    def client(stale_while_revalidate, clock=None):
+        api = AsyncYGOPRODeckAPI(
+            cache_dir=str(tmp_path), use_cache=True, stale_while_revalidate=stale_while_revalidate
+        )
+        api.BASE_URL = server.url
+        if clock is not None:
+            api.response_cache.clock = clock
+        return api
+    
+    ttl = YGOPRODeckAPI.CACHE_TTLS[0][1]
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        api = client(100)
+        assert asyncio.run(lookup(api))['name'] == 'Dark Magician'
+        assert server.requests == 1
+        
+        # Stale: refreshed on the blocking client's background threads
+        now = time.time()
+        api.response_cache.clock = lambda: now + ttl + 50
+        assert asyncio.run(lookup(api))['name'] == 'Dark Magician'
+        api.wait_for_revalidations()
+        assert server.requests == 2
+        assert api.response_cache.stats()['not_modified'] == 1
+        assert api.response_cache.state(api.CARD_INFO_ENDPOINT + '?name=Dark%20Magician') == ResponseCache.FRESH
+        
+        assert len(asyncio.run(all_cards(client(100)))) == 300
+        assert server.requests == 3
+        
+        # Stale catalog: served while refreshed in the background
+        later = time.time() + YGOPRODeckAPI.DEFAULT_CACHE_TTL + 50
+        stale = client(100, lambda: later)
+        assert len(asyncio.run(all_cards(stale))) == 300
+        stale.wait_for_revalidations()
+        assert server.requests == 4
+        assert stale.response_cache.stats()['not_modified'] == 1
+        
+        # Expired catalog: refreshed before use, off the event loop
+        del catalog[200:]
+        expired = client(0, lambda: later + 2 * YGOPRODeckAPI.DEFAULT_CACHE_TTL)
+        assert len(asyncio.run(all_cards(expired))) == 200
+        assert server.requests == 5
+        assert expired.response_cache.stats()['refreshed'] == 1
+
+def test_identical_concurrent_requests_are_sent_once():
+    import threading
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(200), latency=0.2) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api.BASE_URL = server.url
+        barrier = threading.Barrier(8)
+        results = []
+        
+        def lookup():
+            barrier.wait()
+            results.append(api.get_card_by_name('Dark Magician'))
+        
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert [card['name'] for card in results] == ['Dark Magician'] * 8
+        assert server.requests == 1
+        assert api.coalesced_requests() == 7
+        
+        # Once done, the call is not remembered
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 2
+
+def test_identical_concurrent_async_requests_are_sent_once():
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def lookups(api):
+        async with api:
+            return await asyncio.gather(
+                *(api.get_card_by_name_async('Dark Magician') for _ in range(5)),
+                *(api.search_cards_async('Magician') for _ in range(3))
+            )
+    
+    with StubAPIServer(build_catalog(200), latency=0.1) as server:
+        api = AsyncYGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api.BASE_URL = server.url
+        results = asyncio.run(lookups(api))
+        
+        assert [card['name'] for card in results[:5]] == ['Dark Magician'] * 5
+        assert results[5] == results[6] == results[7] and results[5]
+        assert server.requests == 2
+        assert api.coalesced_requests() == 6
+
+def test_lookups_are_served_from_a_warm_catalog(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    def cache_files():
+        return sorted(
+            name for _, _, names in os.walk(tmp_path / 'cache') for name in names
+            if name.endswith('.json')
+        )
+    
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        # Without a catalog, lookups go to the API
+        cold = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        cold.BASE_URL = server.url
+        assert cold.get_card_by_id(catalog[7]['id'])['name'] == catalog[7]['name']
+        assert server.requests == 1
+        
+        warm = YGOPRODeckAPI(cache_dir=str(tmp_path / 'cache'), use_cache=True)
+        warm.BASE_URL = server.url
+        warm.get_all_cards()
+        catalog_files = cache_files()
+        assert server.requests == 2
+        
+        # A new client finds the catalog on disk and needs no per-card requests
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path / 'cache'), use_cache=True)
+        api.BASE_URL = server.url
+        assert api.get_card_by_name('dark magician')['name'] == 'Dark Magician'
+        assert api.get_card_by_id(catalog[7]['id'])['name'] == catalog[7]['name']
+        assert sorted(api.get_cards_by_names(['Pot of Greed', 'Mirror Force'])) == [
+            'Mirror Force', 'Pot of Greed'
+        ]
+        assert server.requests == 2
+        
+        # Names the catalog lacks are asked of the API; nothing is cached for a miss
+        assert api.get_card_by_name('Dark Magicain') is None
+        assert sorted(api.get_cards_by_names(['Pot of Greed', 'Mirror Force', 'Unknown Card'])) == [
+            'Mirror Force', 'Pot of Greed'
+        ]
+        assert server.requests == 4
+        
+        async def lookups(client):
+            async with client:
+                return await asyncio.gather(
+                    client.get_card_by_name_async('Pot of Greed'),
+                    client.get_cards_by_names_async(['Mirror Force', 'Dark Magician'])
+                )
+        
+        async_api = AsyncYGOPRODeckAPI(cache_dir=str(tmp_path / 'cache'), use_cache=True)
+        async_api.BASE_URL = server.url
+        single, batch = asyncio.run(lookups(async_api))
+        assert single['name'] == 'Pot of Greed'
+        assert sorted(batch) == ['Dark Magician', 'Mirror Force']
+        
+        assert server.requests == 4
+        assert cache_files() == catalog_files
+
+def test_cards_missing_from_the_catalog_fall_through_to_the_api(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    catalog = build_catalog(100)
+    with StubAPIServer(catalog[:-1]) as server:
+        warm = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        warm.BASE_URL = server.url
+        warm.get_all_cards()
+        # Released after the catalog was fetched
+        server.cards = catalog
+        new_card, old_card = catalog[-1], catalog[0]
+        
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        assert api.get_card_by_name(new_card['name'])['id'] == new_card['id']
+        assert sorted(api.get_cards_by_names([old_card['name'], new_card['name']])) == sorted(
+            [old_card['name'], new_card['name']]
+        )
+        assert [card['name'] for card in api.search_cards(new_card['name'])] == [new_card['name']]
+        assert server.requests == 3  # the catalog, then the new card by name and by fname
+        
+        # Only the new card's response was cached, so a restart needs no request for it
+        async def lookup(client):
+            async with client:
+                return await client.get_card_by_name_async(new_card['name'])
+        
+        async_api = AsyncYGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        async_api.BASE_URL = server.url
+        assert asyncio.run(lookup(async_api))['id'] == new_card['id']
+        assert server.requests == 3
+
+def test_get_cards_by_ids_batches_and_caches_by_id(tmp_path):
+    import copy
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = copy.deepcopy(build_catalog(300))
+    alternate_art = dict(catalog[3]['card_images'][0], id=99999999)
+    catalog[3]['card_images'].append(alternate_art)
+    ids = [card['id'] for card in catalog[:60]]
+    
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        api.MAX_QUERY_LENGTH = 300
+        
+        cards = api.get_cards_by_ids(ids + [str(ids[0]), 99999999, 1, 'not an id'])
+        assert [cards[card_id]['name'] for card_id in ids] == [card['name'] for card in catalog[:60]]
+        assert cards[99999999]['name'] == catalog[3]['name']
+        assert 1 not in cards
+        # 62 distinct IDs, about 50 per request within the URL limit
+        assert server.requests == 2
+        assert all(',' in path for path in server.paths)
+        
+        # Cards are cached by ID, so any later combination is answered locally
+        restarted = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        restarted.BASE_URL = server.url
+        assert restarted.get_card_by_id(ids[10])['name'] == catalog[10]['name']
+        assert len(restarted.get_cards_by_ids(ids[20:50] + [99999999])) == 31
+        assert server.requests == 2
+
+def test_async_get_cards_by_ids_batches_requests():
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def lookups(api, ids):
+        async with api:
+            return await api.get_cards_by_ids_async(ids), await api.get_card_by_id_async(ids[0])
+    
+    catalog = build_catalog(300)
+    ids = [card['id'] for card in catalog[:75]]
+    with StubAPIServer(catalog) as server:
+        api = AsyncYGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api.BASE_URL = server.url
+        api.MAX_QUERY_LENGTH = 200
+        cards, single = asyncio.run(lookups(api, ids))
+        
+        assert [cards[card_id]['name'] for card_id in ids] == [card['name'] for card in catalog[:75]]
+        assert single['name'] == catalog[0]['name']
+        assert server.requests == 4
+
+def test_sync_catalog_downloads_only_changed_versions(tmp_path):
+    import copy
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api.BASE_URL = server.url
+        
+        report = api.sync_catalog()
+        assert report['status'] == 'updated'
+        assert report['database_version'] == '1.0' and report['previous_version'] is None
+        assert len(report['added']) == 300 and report['snapshot_rows_written'] == 300
+        assert server.requests == 2
+        
+        # Same database version: only the version is checked
+        report = api.sync_catalog()
+        assert report['status'] == 'unchanged'
+        assert report['added'] == report['changed'] == []
+        assert server.requests == 3
+        
+        updated = copy.deepcopy(catalog[2:]) + copy.deepcopy(build_catalog(305)[300:])
+        updated[0]['desc'] = 'Errata.'
+        updated[1]['name'] = 'Renamed Card'
+        updated[2]['banlist_info'] = {'ban_tcg': 'Limited'}
+        updated[3]['card_prices'][0]['tcgplayer_price'] = '99.99'
+        server.cards = updated
+        server.database_version = '2.0'
+        
+        api.get_card_by_name(catalog[0]['name'])  # builds the name index to update
+        report = api.sync_catalog()
+        assert report['status'] == 'updated'
+        assert report['previous_version'] == '1.0'
+        assert report['removed'] == [card['name'] for card in catalog[:2]]
+        assert report['added'] == [card['name'] for card in updated[-5:]]
+        assert sorted(report['changed']) == sorted(['Renamed Card', updated[0]['name'], updated[2]['name']])
+        assert report['renamed'] == {catalog[3]['name']: 'Renamed Card'}
+        assert report['banlist'] == {updated[2]['name']: ('Unlimited', 'Limited')}
+        # Only the heavy fields of the new card and the one with new prices were rewritten
+        assert report['snapshot_rows_written'] == 6
+        assert server.requests == 5
+        
+        # The name index was updated in place
+        assert api.get_card_by_name('Renamed Card')['id'] == catalog[3]['id']
+        assert api.get_card_by_name(catalog[3]['name']) is None
+        assert api.get_card_by_name(catalog[0]['name']) is None
+        assert api.get_card_by_name(updated[-1]['name'])['id'] == updated[-1]['id']
+        assert [card['name'] for card in api.search_cards('Renamed')] == ['Renamed Card']
+    
+    # A new client loads the synced snapshot, heavy fields included
+    restarted = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+    cards = restarted.get_all_cards()
+    assert [card['name'] for card in cards] == [card['name'] for card in updated]
+    assert [card.to_dict() for card in cards] == updated
+
+def test_transient_failures_are_retried_with_backoff():
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False, retry_backoff=0.01)
+        api.BASE_URL = server.url
+        
+        server.queue_response(503)
+        server.queue_response(None)  # dropped connection
+        assert api.get_card_by_name('Dark Magician')['name'] == 'Dark Magician'
+        assert server.requests == 3
+        
+        # Out of retries: the lookup fails and counts against the circuit
+        server.queue_response(502, count=api.max_retries + 1)
+        assert api.get_card_by_name('Pot of Greed') is None
+        assert server.requests == 6
+        assert api.circuit_breaker.stats()['failures'] == 1
+        
+        # Errors the API means are not retried
+        assert api.get_card_by_name('No Such Card') is None
+        assert server.requests == 7
+        assert api.circuit_breaker.stats()['failures'] == 0
+
+def test_timeouts_are_retried():
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    with StubAPIServer(build_catalog(200), latency=0.3) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False, read_timeout=0.1, retry_backoff=0.01)
+        api.BASE_URL = server.url
+        assert api.get_card_by_name('Dark Magician') is None
+        assert server.requests == api.max_retries + 1
+
+def test_circuit_breaker_switches_to_the_local_catalog(tmp_path):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.circuit_breaker import CircuitBreaker
+    
+    class FakeClock:
+        now = 100.0
+        
+        def __call__(self):
+            return self.now
+    
+    clock = FakeClock()
+    catalog = build_catalog(300)
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True, max_retries=0)
+        api.BASE_URL = server.url
+        assert len(api.get_all_cards()) == 300
+        
+        blocking = YGOPRODeckAPI(
+            cache_dir=None,
+            use_cache=False,
+            max_retries=0,
+            circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+        )
+        blocking.BASE_URL = server.url
+        server.queue_response(500, count=10)
+        for card in catalog[:3]:
+            assert blocking.get_card_by_name(card['name']) is None
+        assert blocking.is_local_only()
+        
+        # Open: lookups fail fast without a request
+        requests = server.requests
+        assert blocking.get_card_by_name(catalog[3]['name']) is None
+        assert blocking.get_cards_by_ids([catalog[4]['id']]) == {}
+        assert server.requests == requests
+        assert blocking.circuit_breaker.stats()['rejected'] == 2
+        
+        # A client sharing the breaker still answers from its catalog
+        local = YGOPRODeckAPI(
+            cache_dir=str(tmp_path), use_cache=True, circuit_breaker=blocking.circuit_breaker
+        )
+        local.BASE_URL = server.url
+        assert local.get_card_by_name(catalog[5]['name'])['id'] == catalog[5]['id']
+        assert [card['name'] for card in local.search_cards(catalog[6]['name'])][0] == catalog[6]['name']
+        assert server.requests == requests
+        
+        # After the reset timeout a trial request closes the circuit again
+        server.queued.clear()
+        clock.now += 30
+        assert blocking.get_card_by_name(catalog[3]['name'])['id'] == catalog[3]['id']
+        assert not blocking.is_local_only()
+        assert server.requests == requests + 1
+
+def test_async_client_retries_and_shares_the_circuit_breaker():
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def lookup(api, name):
+        async with api:
+            return await api.get_card_by_name_async(name)
+    
+    with StubAPIServer(build_catalog(200)) as server:
+        blocking = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api = AsyncYGOPRODeckAPI(
+            cache_dir=None, use_cache=False, retry_backoff=0.01, circuit_breaker=blocking.circuit_breaker
+        )
+        api.BASE_URL = server.url
+        
+        server.queue_response(504)
+        server.queue_response(None)
+        assert asyncio.run(lookup(api, 'Dark Magician'))['name'] == 'Dark Magician'
+        assert server.requests == 3
+        
+        server.queue_response(503, count=api.max_retries + 1)
+        assert asyncio.run(lookup(api, 'Pot of Greed')) is None
+        assert blocking.circuit_breaker.stats()['failures'] == 1
+
+def test_async_download_cut_off_mid_body_is_not_retried_into_the_cache(tmp_path):
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+    
+    async def all_cards(api):
+        async with api:
+            return await api.get_all_cards_async()
+    
+    with StubAPIServer(build_catalog(300)) as server:
+        api = AsyncYGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True, retry_backoff=0.01)
+        api.BASE_URL = server.url
+        
+        # Half the dump was written: retrying would append a second copy
+        server.queue_response(StubAPIServer.TRUNCATE)
+        assert asyncio.run(all_cards(api)) == []
+        assert server.requests == 1
+        assert not api.response_cache.exists(api.CARD_INFO_ENDPOINT)
+        
+        assert len(asyncio.run(all_cards(api))) == 300
+        assert server.requests == 2
+    
+    # The cached dump is intact
+    restarted = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+    assert len(list(restarted._stream_catalog())) == 300
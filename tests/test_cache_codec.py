@@ -0,0 +1,81 @@
+# tests/test_cache_codec.py
+import io
+import json
+import pytest
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.cache_codec import CacheCodec
+from yugioh_db_generator.api.response_cache import ResponseCache
+
+needs_zstd = pytest.mark.skipif(not CacheCodec.is_zstd_available(), reason='zstandard is not installed')
+
+def _card_bodies(count):
+    return [json.dumps({'data': [card]}).encode('utf-8') for card in build_catalog(count)]
+
+@pytest.mark.parametrize('compression', ['gzip', 'none', pytest.param('zstd', marks=needs_zstd)])
+def test_entries_round_trip_and_are_readable_by_any_codec(tmp_path, compression):
+    codec = CacheCodec(str(tmp_path), compression)
+    reader = CacheCodec(str(tmp_path), 'none')
+    body = _card_bodies(1)[0]
+    
+    data = codec.compress(body)
+    assert reader.decompress(data) == body
+    if compression != 'none':
+        assert len(data) < len(body)
+    
+    stream = io.BytesIO()
+    with codec.writer(stream) as out:
+        out.write(body)
+    stream.seek(0)
+    with reader.reader(stream) as f:
+        assert f.read() == body
+
+@needs_zstd
+def test_trained_dictionary_shrinks_card_entries(tmp_path):
+    bodies = _card_bodies(600)
+    codec = CacheCodec(str(tmp_path), 'zstd')
+    plain = sum(len(codec.compress(body)) for body in bodies[500:])
+    
+    assert codec.needs_dictionary
+    assert codec.train_dictionary(bodies[:500])
+    assert not codec.needs_dictionary
+    compressed = [codec.compress(body) for body in bodies[500:]]
+    assert sum(map(len, compressed)) < plain / 2
+    
+    # The dictionary is saved and found again by the ID in each frame
+    reloaded = CacheCodec(str(tmp_path), 'zstd')
+    assert not reloaded.needs_dictionary
+    assert [reloaded.decompress(data) for data in compressed] == bodies[500:]
+    
+    for path in tmp_path.iterdir():
+        path.unlink()
+    with pytest.raises(ValueError):
+        CacheCodec(str(tmp_path), 'zstd').decompress(compressed[0])
+
+def test_cache_reads_uncompressed_entries(tmp_path):
+    writer = ResponseCache(str(tmp_path), compression='none')
+    writer.write('/cardinfo.php?name=Pot%20of%20Greed', {'data': [{'name': 'Pot of Greed'}]})
+    
+    cache = ResponseCache(str(tmp_path), compression='gzip')
+    assert cache.read('/cardinfo.php?name=Pot%20of%20Greed') == {'data': [{'name': 'Pot of Greed'}]}
+    cache.write('/cardinfo.php?name=Pot%20of%20Greed', {'data': []})
+    with open(cache.path('/cardinfo.php?name=Pot%20of%20Greed'), 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+    assert writer.read('/cardinfo.php?name=Pot%20of%20Greed') == {'data': []}
+
+@needs_zstd
+def test_catalog_ingestion_trains_the_dictionary(tmp_path):
+    from unittest.mock import patch
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    
+    catalog = build_catalog(300)
+    api = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+    with patch.object(api, '_stream_catalog', return_value=iter(catalog)):
+        assert len(api.get_all_cards()) == 300
+    assert not api.response_cache.codec.needs_dictionary
+    
+    endpoint = '/cardinfo.php?name=Dark%20Magician'
+    api._save_to_cache(endpoint, {'data': [catalog[0]]})
+    with open(api._get_cache_path(endpoint), 'rb') as f:
+        data = f.read()
+    assert len(data) < len(json.dumps({'data': [catalog[0]]})) / 4
+    assert YGOPRODeckAPI(cache_dir=str(tmp_path))._get_from_cache(endpoint) == {'data': [catalog[0]]}
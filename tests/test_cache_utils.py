@@ -0,0 +1,141 @@
+# tests/test_cache_utils.py
+import threading
+import time
+import pytest
+from yugioh_db_generator.utils.cache_utils import AsyncSingleFlight, LRUCache, SingleFlight, freeze
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(capacity=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' becomes most recently used
+    cache.set('c', 3)           # evicts 'b'
+    
+    assert 'b' not in cache
+    assert cache.get('b', 'missing') == 'missing'
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert len(cache) == 2
+
+
+def test_lru_evicts_by_total_weight():
+    cache = LRUCache(capacity=10, max_weight=100)
+    cache.set('a', 'x', weight=40)
+    cache.set('b', 'y', weight=40)
+    cache.set('c', 'z', weight=40)  # evicts 'a'
+    assert 'a' not in cache and cache.stats()['weight'] == 80
+    
+    cache.set('b', 'y', weight=10)  # replacing an entry updates the total
+    assert cache.stats()['weight'] == 50
+    cache.set('huge', 'w', weight=101)  # never fits, and evicts nothing
+    assert 'huge' not in cache and len(cache) == 2
+
+def test_frozen_data_is_read_only_but_compares_and_serializes_as_json():
+    import json
+    data = {'data': [{'name': 'Dark Magician', 'card_sets': [{'set_code': 'LOB-005'}]}]}
+    frozen = freeze(data)
+    assert frozen == data
+    assert json.loads(json.dumps(frozen)) == data
+    
+    card = frozen['data'][0]
+    for mutate in (
+        lambda: card.__setitem__('atk', 0),
+        lambda: card.update(atk=0),
+        lambda: card['card_sets'].append({}),
+        lambda: card['card_sets'][0].pop('set_code'),
+        lambda: frozen['data'].sort(),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    
+    copy = dict(card)
+    copy['atk'] = 0
+    assert 'atk' not in card
+
+def test_ttl_expiry():
+    now = [100.0]
+    cache = LRUCache(capacity=10, ttl=5, clock=lambda: now[0])
+    cache.set('a', 1)
+    now[0] += 4
+    assert cache.get('a') == 1
+    now[0] += 2
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_negative_caching():
+    cache = LRUCache()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return None
+    
+    assert cache.get_or_compute('unknown', compute) is None
+    assert cache.get_or_compute('unknown', compute) is None
+    assert len(calls) == 1
+    assert cache.stats()['negative_hits'] == 1
+
+def test_negative_entries_expire_sooner():
+    now = [100.0]
+    cache = LRUCache(capacity=10, ttl=None, negative_ttl=5, clock=lambda: now[0])
+    cache.set('hit', 1)
+    cache.set('miss', None)
+    now[0] += 6
+    assert 'miss' not in cache
+    assert cache.get('hit') == 1
+
+def test_concurrent_lookups_are_coalesced():
+    cache = LRUCache()
+    calls = []
+    started = threading.Event()
+    
+    def slow_compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 'value'
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('key', slow_compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: (_ for _ in ()).throw(ValueError('boom')))
+    # The failed call is not remembered
+    assert flight.do('key', lambda: 42) == 42
+
+def test_async_single_flight_shares_results_and_exceptions():
+    import asyncio
+    flight = AsyncSingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+    
+    async def main():
+        assert await asyncio.gather(*(flight.do('key', fetch) for _ in range(4))) == [1] * 4
+        results = await asyncio.gather(*(flight.do('bad', fail) for _ in range(2)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert await flight.do('key', fetch) == 2
+    
+    asyncio.run(main())
+    assert flight.shared == 4
@@ -0,0 +1,39 @@
+# tests/test_card_record.py
+import pickle
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.card_record import CardRecord
+
+def test_record_reads_like_the_card_dict():
+    card = next(card for card in build_catalog(50) if 'Monster' in card['type'])
+    card['typeline'] = ['Spellcaster', 'Normal']
+    record = CardRecord(card)
+    
+    assert record['name'] == card['name']
+    assert record.get('atk') == card['atk']
+    assert record.get('linkval', 'missing') == card.get('linkval', 'missing')
+    assert record['typeline'] == ['Spellcaster', 'Normal']
+    assert 'card_sets' not in dict(record)
+    assert record.to_dict() == card
+    assert pickle.loads(pickle.dumps(record)).to_dict() == card
+
+def test_record_interns_enum_strings():
+    first, second = (CardRecord({'name': name, 'type': ''.join(['Effect ', 'Monster'])})
+                     for name in ('A', 'B'))
+    assert first['type'] is second['type']
+
+def test_heavy_fields_load_on_demand():
+    card = build_catalog(1)[0]
+    calls = []
+    
+    def load_extras(card_id):
+        calls.append(card_id)
+        return {'card_sets': card['card_sets']}
+    
+    record = CardRecord(card, load_extras)
+    assert calls == []
+    assert record['card_sets'] == card['card_sets']
+    assert record.extras() == {'card_sets': card['card_sets']}
+    assert calls == [card['id']]
+    
+    # A snapshot row rebuilds the same record
+    assert dict(CardRecord.from_row(record.to_row())) == dict(record)
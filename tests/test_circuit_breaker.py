@@ -0,0 +1,65 @@
+# tests/test_circuit_breaker.py
+from yugioh_db_generator.api.circuit_breaker import CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=FakeClock())
+    
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # an answer resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    stats = breaker.stats()
+    assert stats['state'] == CircuitBreaker.OPEN
+    assert stats['opened'] == 1
+    assert stats['rejected'] == 2
+
+def test_half_open_allows_one_trial_request():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    
+    clock.now += 9.9
+    assert not breaker.allow_request()
+    clock.now += 0.1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # the trial is still in flight
+    
+    # A failed trial opens the circuit for a new period
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 5
+    assert not breaker.allow_request()
+    
+    clock.now += 5
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+    assert breaker.stats()['opened'] == 2
+
+def test_failures_while_open_do_not_extend_the_period():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    
+    clock.now += 8
+    breaker.record_failure()  # a request sent before the circuit opened
+    clock.now += 2
+    assert breaker.allow_request()
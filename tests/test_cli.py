@@ -12,4 +12,110 @@ def test_parser_creation():
     # Test basic argument parsing
     args = parser.parse_args(['--output', 'test.md'])
     assert args.output == 'test.md'
-    assert args.format == 'markdown'  # Default value
\ No newline at end of file
+    assert args.format == 'markdown'  # Default value
+
+
+def test_sync_catalog_command(tmp_path, capsys):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    
+    argv = ['yugioh-db-generator', '--sync-catalog', '--cache-dir', str(tmp_path)]
+    with StubAPIServer(build_catalog(50)) as server, \
+            patch.object(YGOPRODeckAPI, 'BASE_URL', server.url), patch.object(sys, 'argv', argv):
+        assert main() == 0
+        assert main() == 0
+        assert server.requests == 3
+    
+    output = capsys.readouterr().out
+    assert 'Catalog Sync: updated' in output and 'Added: 50' in output
+    assert 'Catalog Sync: unchanged' in output
+
+
+def test_generate_uses_and_clears_the_cache_dir(tmp_path, monkeypatch):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    
+    monkeypatch.chdir(tmp_path)
+    catalog = build_catalog(50)
+    deck = tmp_path / 'deck.txt'
+    deck.write_text('\n'.join(card['name'] for card in catalog[:3]))
+    
+    def run(*options):
+        argv = [
+            'yugioh-db-generator', '--input', str(deck), '--output', str(tmp_path / 'db.md'),
+            '--cache-dir', str(tmp_path / 'cache'), '--no-aliases', '--threads', '1', *options
+        ]
+        with patch.object(sys, 'argv', argv):
+            return main()
+    
+    with StubAPIServer(catalog) as server, patch.object(YGOPRODeckAPI, 'BASE_URL', server.url):
+        assert run() == 0
+        assert server.requests == 1  # the catalog dump
+        
+        # Later runs load the cached catalog
+        assert run() == 0
+        assert server.requests == 1
+        
+        assert run('--clear-cache') == 0
+        assert server.requests == 2
+        assert run('--no-cache') == 0
+        assert server.requests == 3
+    
+    assert catalog[2]['name'] in (tmp_path / 'db.md').read_text()
+
+
+def test_synced_catalog_is_used_by_later_runs(tmp_path, monkeypatch):
+    import copy
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    
+    monkeypatch.chdir(tmp_path)
+    catalog = build_catalog(50)
+    new_card = copy.deepcopy(build_catalog(51)[50])
+    deck = tmp_path / 'deck.txt'
+    deck.write_text(f"{catalog[0]['name']}\n{new_card['name']}")
+    
+    def run(*options):
+        argv = ['yugioh-db-generator', '--cache-dir', str(tmp_path / 'cache'), *options]
+        with patch.object(sys, 'argv', argv):
+            return main()
+    
+    generate = ('--input', str(deck), '--output', str(tmp_path / 'db.md'), '--no-aliases', '--threads', '1')
+    with StubAPIServer(catalog) as server, patch.object(YGOPRODeckAPI, 'BASE_URL', server.url):
+        assert run('--sync-catalog') == 0
+        assert server.requests == 2  # the version and the catalog dump
+        
+        # Generation loads the synced catalog instead of downloading it again;
+        # only the card the catalog lacks is asked of the API
+        assert run(*generate) == 0
+        assert server.requests == 3
+        assert server.paths[-1].endswith(f"?name={new_card['name'].replace(' ', '%20')}")
+        
+        server.cards = catalog + [new_card]
+        server.database_version = '2.0'
+        assert run('--sync-catalog') == 0
+        assert server.requests == 5
+        
+        # The card added upstream is now resolved from the catalog
+        server.requests = 0
+        assert run(*generate) == 0
+        assert server.requests == 0
+        assert new_card['desc'] in (tmp_path / 'db.md').read_text()
+    
+    assert run('--sync-catalog', '--no-cache') == 1
+
+
+def test_aliases_are_kept_in_the_cache_dir_by_default(tmp_path):
+    from yugioh_db_generator.core.alias_store import AliasStore
+    
+    store = AliasStore(str(tmp_path / 'aliases.json'))
+    store.add('Snake-eye Oak', 'Snake-Eye Oak', 'v1')
+    store.save()
+    
+    argv = ['yugioh-db-generator', '--cache-dir', str(tmp_path), '--forget-alias', 'Snake-eye Oak']
+    with patch.object(sys, 'argv', argv):
+        assert main() == 0
+    assert len(AliasStore(str(tmp_path / 'aliases.json'))) == 0
@@ -0,0 +1,58 @@
+# tests/test_index.py
+import pytest
+import Levenshtein
+from yugioh_db_generator.index.bk_tree import BKTree
+
+def test_bk_tree_matches_linear_scan():
+    words = ['dark magician', 'dark magician girl', 'dark paladin', 'blueeyes white dragon',
+             'pot of greed', 'pot of desires', 'mirror force', 'magical cylinder']
+    tree = BKTree()
+    tree.build(words)
+    assert len(tree) == len(words)
+    
+    for query in ['drak magician', 'pot of greeed', 'mirorr force', 'dark']:
+        for max_distance in range(4):
+            expected = sorted(
+                (Levenshtein.distance(query, word), word) for word in words
+                if Levenshtein.distance(query, word) <= max_distance
+            )
+            assert tree.search(query, max_distance) == expected
+
+def test_bk_tree_limit_returns_closest():
+    tree = BKTree()
+    tree.build(['pot of greed', 'pot of greet', 'pot of desires'])
+    assert tree.search('pot of greed', 2, limit=1) == [(0, 'pot of greed')]
+    assert BKTree().search('anything', 3) == []
+
+def test_vector_scorer_ranks_closest_names():
+    pytest.importorskip('scipy')
+    from yugioh_db_generator.index.vector_scorer import NgramVectorScorer
+    
+    names = ['Dark Magician', 'Dark Magician Girl', 'Blue-Eyes White Dragon', 'Pot of Greed']
+    scorer = NgramVectorScorer()
+    scorer.build(names)
+    
+    assert len(scorer) == 4
+    assert scorer.top_k('Drak Magician', k=2)[0][0] == 0
+    assert scorer.top_k('Blueyes Whit Dragon', k=1)[0][0] == 2
+    assert scorer.top_k('zzzz', k=3) == []
+    
+    # A batch ranks exactly like the individual queries
+    queries = ['Drak Magician', 'Pot of Gred', 'Dark Magicain Girl']
+    batch = scorer.top_k_many(queries, k=3)
+    for query, ranked in zip(queries, batch):
+        single = scorer.top_k(query, k=3)
+        assert [position for position, _ in ranked] == [position for position, _ in single]
+        assert [score for _, score in ranked] == pytest.approx([score for _, score in single])
+
+def test_substring_index_matches_scan():
+    from catalog_fixture import build_catalog
+    from yugioh_db_generator.index.substring_index import SubstringIndex
+    
+    names = [card['name'] for card in build_catalog(800)]
+    index = SubstringIndex()
+    index.build(names)
+    
+    for query in ['Dragon', 'snake-eye', 'of the', 'ra', 'x', 'Lv5', 'zzz', "Harpie's", 'World Chalice"']:
+        expected = [i for i, name in enumerate(names) if query.lower() in name.lower()]
+        assert index.search(query) == expected, query
@@ -15,6 +15,7 @@ class MockAPIResponse:
     def __init__(self, status_code=200, json_data=None):
         self.status_code = status_code
         self.json_data = json_data or {}
+        self.headers = {}
         
     def json(self):
         return self.json_data
@@ -98,7 +99,7 @@ def cleanup():
                 pass
 
 
-@patch('yugioh_db_generator.api.card_api.requests.get')
+@patch('requests.Session.get')
 def test_end_to_end_markdown(mock_get, mock_api_data, sample_deck_list, cleanup):
     """Test the entire workflow with Markdown output."""
     # Mock API responses
@@ -164,7 +165,7 @@ def test_end_to_end_markdown(mock_get, mock_api_data, sample_deck_list, cleanup)
     assert len(corrections) == 0  # No corrections in this test case
 
 
-@patch('yugioh_db_generator.api.card_api.requests.get')
+@patch('requests.Session.get')
 def test_end_to_end_json(mock_get, mock_api_data, sample_deck_list, cleanup):
     """Test the entire workflow with JSON output."""
     # Set up the same mock API as before
@@ -206,7 +207,7 @@ def test_end_to_end_json(mock_get, mock_api_data, sample_deck_list, cleanup):
     assert "Misspelled Crad Name" in card_names
 
 
-@patch('yugioh_db_generator.api.card_api.requests.get')
+@patch('requests.Session.get')
 def test_end_to_end_csv(mock_get, mock_api_data, sample_deck_list, cleanup):
     """Test the entire workflow with CSV output."""
     # Set up the same mock API as before
@@ -253,7 +254,7 @@ def test_end_to_end_csv(mock_get, mock_api_data, sample_deck_list, cleanup):
     assert "Mirror Force" in card_names
 
 
-@patch('yugioh_db_generator.api.card_api.requests.get')
+@patch('requests.Session.get')
 def test_name_corrections_workflow(mock_get, mock_api_data, cleanup):
     """Test the name correction workflow."""
     # Mock API to correct "Drak Magician" to "Dark Magician"
@@ -302,3 +303,61 @@ def test_name_corrections_workflow(mock_get, mock_api_data, cleanup):
     with open(corrections_file, 'r', encoding='utf-8') as f:
         content = f.read()
         assert "Drak Magician -> Dark Magician" in content
+
+
+def test_generate_database_async_against_stub_server(tmp_path):
+    """The async pipeline resolves a deck through a stand-in API server."""
+    import asyncio
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    output_file = str(tmp_path / "async_db.json")
+    deck = ["Dark Magician", "Pot of Greed", "Magisitus Chorozo", "Dark Magician"]
+    
+    with StubAPIServer(build_catalog(500)) as server, \
+            patch.object(YGOPRODeckAPI, 'BASE_URL', server.url):
+        generator = CardDatabaseGenerator(
+            output_file=output_file,
+            output_format="json",
+            cache_dir=str(tmp_path / "cache")
+        )
+        asyncio.run(generator.generate_database_async(deck, concurrency=8))
+    
+    with open(output_file, 'r') as f:
+        cards = json.load(f)["cards"]
+    assert [card["matchedName"] for card in cards] == ["Dark Magician", "Pot of Greed", "Magistus Chorozo"]
+    assert generator.get_name_corrections() == {"Magisitus Chorozo": "Magistus Chorozo"}
+
+
+def test_ydk_file_resolves_ids_in_one_request(tmp_path):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = build_catalog(300)
+    main_deck = [card['id'] for card in catalog[:40]] + [catalog[0]['id']] * 2
+    extra_deck = [card['id'] for card in catalog[100:115]]
+    side_deck = [card['id'] for card in catalog[200:215]] + [123]
+    ydk_file = tmp_path / 'deck.ydk'
+    ydk_file.write_text(
+        "#created by test\n#main\n" + "\n".join(map(str, main_deck))
+        + "\n#extra\n" + "\n".join(map(str, extra_deck))
+        + "\n!side\n" + "\n".join(map(str, side_deck)) + "\n"
+    )
+    expected = [card['name'] for card in [catalog[0]] + catalog[:40] + catalog[100:115] + catalog[200:215]]
+    
+    with StubAPIServer(catalog) as server:
+        api = YGOPRODeckAPI(cache_dir=None, use_cache=False)
+        api.BASE_URL = server.url
+        deck_list = read_deck_list(str(ydk_file), api_client=api)
+        assert sorted(deck_list) == sorted(expected + [catalog[0]['name']])
+        assert deck_list[:3] == [catalog[0]['name'], catalog[1]['name'], catalog[2]['name']]
+        assert server.requests == 1
+        
+        # With the catalog loaded only the ID it lacks is requested
+        api.get_all_cards()
+        assert read_deck_list(str(ydk_file), api_client=api) == deck_list
+        assert server.requests == 3
+        assert server.paths[-1].endswith('cardinfo.php?id=123')
+    
+    # YDK files cannot be read without an API client
+    assert read_deck_list(str(ydk_file)) == []
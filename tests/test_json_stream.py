@@ -0,0 +1,29 @@
+# tests/test_json_stream.py
+import json
+import pytest
+from catalog_fixture import build_catalog
+from yugioh_db_generator.api.json_stream import JSONArrayStream, iter_json_array
+
+def _chunks(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize('size', [1, 13, 4096])
+def test_items_match_json_loads_at_any_chunk_size(size):
+    cards = build_catalog(40)
+    cards[3]['name'] = 'Ojama Yellow — « Mañana »'
+    document = {'meta': {'total': [1, 2]}, 'count': 12345, 'data': cards, 'tail': -1.5e3}
+    text = json.dumps(document, ensure_ascii=False, indent=1)
+    
+    assert list(iter_json_array(_chunks(text, size))) == cards
+
+def test_items_are_returned_as_soon_as_complete():
+    parser = JSONArrayStream()
+    assert parser.feed('{"data": [{"name": "Dark Magician"}, {"name": "Pot') == [{'name': 'Dark Magician'}]
+    assert parser.feed(' of Greed"}]}') == [{'name': 'Pot of Greed'}]
+    assert parser.close() == []
+
+@pytest.mark.parametrize('text', ['{"data": [1, 2', '{"data": [1 2]}', '[1, 2]', '{"data": []} trailing'])
+def test_malformed_input_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array([text]))
@@ -0,0 +1,68 @@
+# tests/test_rate_limiter.py
+import threading
+import time
+import pytest
+from yugioh_db_generator.api.rate_limiter import TokenBucket, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+def test_burst_then_steady_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+    
+    waits = [bucket._reserve() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == pytest.approx([0.1, 0.2])
+    
+    clock.now += 10  # refills to the burst size, no more
+    assert [bucket._reserve() for _ in range(4)] == pytest.approx([0, 0, 0, 0.1])
+    
+    stats = bucket.stats()
+    assert stats['acquired'] == 9
+    assert stats['waits'] == 3
+    assert stats['wait_time'] == pytest.approx(0.4)
+
+def test_throttle_pauses_and_recovers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=5, clock=clock)
+    
+    bucket.throttle(retry_after=2.0)
+    assert bucket.rate == 5
+    assert bucket._reserve() == pytest.approx(2.0)
+    assert bucket._reserve() == pytest.approx(2.2)  # queued behind it at the halved rate
+    
+    for _ in range(20):
+        bucket.record_success()
+    assert bucket.rate == 10
+    assert bucket.stats()['throttled'] == 1
+
+def test_threads_never_fire_together():
+    bucket = TokenBucket(rate=50, burst=1)
+    starts = []
+    lock = threading.Lock()
+    
+    def worker():
+        bucket.acquire()
+        with lock:
+            starts.append(time.monotonic())
+    
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    starts.sort()
+    assert starts[-1] - starts[0] >= 9 * 0.02 * 0.9
+    assert bucket.stats()['waits'] == 9
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0  # in the past
@@ -0,0 +1,150 @@
+# tests/test_response_cache.py
+import os
+import pytest
+from yugioh_db_generator.api.response_cache import ResponseCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000000.0
+    
+    def __call__(self):
+        return self.now
+
+def test_entries_age_from_fresh_to_stale_to_expired(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(
+        str(tmp_path),
+        ttls=(('/cardinfo.php?name=', 100),),
+        default_ttl=10,
+        stale_while_revalidate=50,
+        clock=clock
+    )
+    endpoint = '/cardinfo.php?name=Dark%20Magician'
+    assert cache.state(endpoint) is None
+    
+    cache.write(endpoint, {'data': [{'name': 'Dark Magician'}]}, {'ETag': '"abc"'})
+    assert cache.read(endpoint) == {'data': [{'name': 'Dark Magician'}]}
+    assert cache.state(endpoint) == ResponseCache.FRESH
+    assert cache.ttl('/cardinfo.php') == 10
+    
+    clock.now += 120
+    assert cache.state(endpoint) == ResponseCache.STALE
+    clock.now += 40
+    assert cache.state(endpoint) == ResponseCache.EXPIRED
+    assert cache.conditional_headers(endpoint) == {'If-None-Match': '"abc"'}
+    
+    # A 304 restarts the clock and keeps the validators it does not repeat
+    cache.record_fetch(endpoint, {}, not_modified=True)
+    assert cache.state(endpoint) == ResponseCache.FRESH
+    assert cache.conditional_headers(endpoint) == {'If-None-Match': '"abc"'}
+    
+    cache.write(endpoint, {'data': []}, {'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'})
+    assert cache.conditional_headers(endpoint) == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Sat, 17 Oct 2026 10:00:00 GMT'
+    }
+    stats = cache.stats()
+    assert (stats['not_modified'], stats['refreshed']) == (1, 1)
+    
+    cache.remove(endpoint)
+    assert cache.state(endpoint) is None
+    assert not [name for _, _, names in os.walk(tmp_path) for name in names]
+
+def test_entries_are_keyed_by_hashed_url_in_shards(tmp_path):
+    cache = ResponseCache(str(tmp_path), base_url='https://example.test/api')
+    # These collided under the flat layout
+    first, second = '/cardinfo.php?name=a_b', '/cardinfo.php?name_a=b'
+    cache.write(first, {'data': [1]})
+    cache.write(second, {'data': [2]})
+    assert cache.read(first) == {'data': [1]}
+    assert cache.read(second) == {'data': [2]}
+    
+    path = cache.path(first)
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), cache.key(first)[:2])
+    assert not [name for name in os.listdir(tmp_path) if os.path.isfile(tmp_path / name)]
+    
+    # Another host never shares entries
+    assert ResponseCache(str(tmp_path), base_url='https://mirror.test/api').read(first) is None
+    
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+def test_flat_layout_entries_are_migrated_and_aged_by_file_time(tmp_path):
+    clock = FakeClock()
+    legacy_path = tmp_path / '_cardinfo.php_name_Dark%20Magician.json'
+    legacy_path.write_text('{"data": [{"name": "Dark Magician"}]}')
+    os.utime(legacy_path, (clock.now - 5, clock.now - 5))
+    
+    cache = ResponseCache(str(tmp_path), default_ttl=10, clock=clock)
+    endpoint = '/cardinfo.php?name=Dark%20Magician'
+    assert cache.state(endpoint) == ResponseCache.FRESH
+    assert cache.read(endpoint) == {'data': [{'name': 'Dark Magician'}]}
+    assert not legacy_path.exists()
+    assert os.path.exists(cache.path(endpoint))
+    
+    clock.now += 10
+    assert cache.state(endpoint) == ResponseCache.EXPIRED
+    assert cache.conditional_headers(endpoint) == {}
+
+def test_only_flat_layout_entries_are_taken_for_legacy_files(tmp_path):
+    (tmp_path / 'catalog_version.json').write_text('{"database_version": "1.0"}')
+    (tmp_path / 'aliases.json').write_text('{}')
+    (tmp_path / '_cardinfo.php.json').write_text('{"data": []}')
+    
+    cache = ResponseCache(str(tmp_path))
+    assert cache._legacy_files == {'_cardinfo.php.json'}
+    assert cache.read('/cardinfo.php') == {'data': []}
+    assert cache._legacy_files == set()
+    
+    cache.clear()
+    assert sorted(os.listdir(tmp_path)) == ['aliases.json', 'catalog_version.json']
+
+def test_readers_never_see_partial_writes(tmp_path):
+    import threading
+    cache = ResponseCache(str(tmp_path))
+    endpoint = '/cardinfo.php'
+    payloads = [{'data': [{'id': i, 'desc': 'x' * 20000}] * 20} for i in range(4)]
+    cache.write(endpoint, payloads[0])
+    
+    def write(payload):
+        for _ in range(20):
+            cache.write(endpoint, payload)
+    
+    writers = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in writers:
+        thread.start()
+    while any(thread.is_alive() for thread in writers):
+        assert cache.read(endpoint) in payloads
+    for thread in writers:
+        thread.join()
+    assert not [name for name in os.listdir(os.path.dirname(cache.path(endpoint))) if name.endswith('.tmp')]
+
+def test_memory_tier_answers_repeated_reads(tmp_path):
+    from unittest.mock import patch
+    cache = ResponseCache(str(tmp_path), memory_bytes=3000)
+    other = ResponseCache(str(tmp_path))
+    endpoint = '/cardinfo.php?name=Dark%20Magician'
+    other.write(endpoint, {'data': [{'name': 'Dark Magician'}]})
+    
+    assert cache.read(endpoint) == {'data': [{'name': 'Dark Magician'}]}
+    with patch.object(cache.codec, 'decompress') as mock_decompress:
+        for _ in range(5):
+            data = cache.read(endpoint)
+            assert cache.state(endpoint) == ResponseCache.FRESH
+        mock_decompress.assert_not_called()
+    with pytest.raises(TypeError):
+        data['data'][0]['name'] = 'Blue-Eyes White Dragon'
+    stats = cache.stats()
+    assert stats['memory']['hits'] == 5 and stats['memory']['misses'] == 1
+    assert stats['disk'] == {'hits': 1, 'misses': 0}
+    
+    # Rewritten by another instance: the memory copy is dropped
+    other.write(endpoint, {'data': [{'name': 'Dark Magician', 'atk': 2500}]})
+    assert cache.read(endpoint)['data'][0]['atk'] == 2500
+    
+    # Bounded by the size of the bodies
+    for i in range(40):
+        cache.write(f'/cardinfo.php?name={i}', {'data': [{'name': str(i), 'desc': 'x' * 100}]})
+    stats = cache.stats()
+    assert stats['memory']['bytes'] <= 3000 and stats['memory']['evictions'] > 0
+    assert cache.read('/cardinfo.php?name=0')['data'][0]['name'] == '0'
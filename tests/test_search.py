@@ -1,6 +1,10 @@
 # tests/test_search.py
+import asyncio
+import random
 import pytest
 from unittest.mock import patch, MagicMock
+from catalog_fixture import build_catalog, make_typo
+from yugioh_db_generator.core.alias_store import AliasStore
 from yugioh_db_generator.core.search_engine import CardSearchEngine
 
 def test_search_engine_initialization():
@@ -20,4 +24,246 @@ def test_correction_recording():
     # Check if it was recorded correctly
     corrections = search_engine.get_name_corrections()
     assert 'Magisitus Chorozo' in corrections
-    assert corrections['Magisitus Chorozo'] == 'Magistus Chorozo'
\ No newline at end of file
+    assert corrections['Magisitus Chorozo'] == 'Magistus Chorozo'
+
+def _engine_with_catalog(catalog, **kwargs):
+    """Build an engine over a catalog of cards (or bare names) whose API lookups all miss."""
+    api_client = MagicMock()
+    api_client.get_all_cards.return_value = [
+        card if isinstance(card, dict) else {'name': card} for card in catalog
+    ]
+    api_client.get_card_by_name.return_value = None
+    api_client.get_cards_by_names.return_value = {}
+    api_client.search_cards.return_value = []
+    return CardSearchEngine(api_client, **kwargs)
+
+def test_token_index_scores_by_token_length():
+    search_engine = _engine_with_catalog(['Dark Magician', 'Dark Magician Girl', 'Pot of Greed'])
+    
+    scores = search_engine.token_index.score(['Dark', 'Magician'])
+    assert scores == {0: 12, 1: 12}
+    assert 2 not in scores
+
+def test_token_search_uses_index():
+    search_engine = _engine_with_catalog(
+        ['Dark Magician', 'Dark Magician Girl', 'Blue-Eyes White Dragon']
+    )
+    
+    card = search_engine._token_search('Blue Eyes Whte Dragon')
+    assert card['name'] == 'Blue-Eyes White Dragon'
+    
+    # Names sharing no token with the catalog are not scored at all
+    assert search_engine._token_search('Mirror Force') is None
+
+def test_exact_match_uses_local_catalog():
+    search_engine = _engine_with_catalog([
+        {'id': 46986414, 'name': 'Dark Magician'},
+        {'id': 89631139, 'name': 'Blue-Eyes White Dragon'},
+    ])
+    api_client = search_engine.api_client
+    
+    assert search_engine.search('Dark Magician')['id'] == 46986414
+    assert search_engine.search('blue-eyes white dragon')['name'] == 'Blue-Eyes White Dragon'
+    assert search_engine.name_index.get_by_id('89631139')['name'] == 'Blue-Eyes White Dragon'
+    api_client.get_card_by_name.assert_not_called()
+
+def test_local_fuzzy_search_reranks_index_candidates():
+    search_engine = _engine_with_catalog(
+        ['Snake-Eye Ash', 'Snake-Eye Oak', 'Snake-Eyes Poplar', 'Magistus Chorozo']
+    )
+    
+    assert search_engine._local_fuzzy_search('Snake-eye Oak')['name'] == 'Snake-Eye Oak'
+    assert search_engine._local_fuzzy_search('Snake-eye Poplar')['name'] == 'Snake-Eyes Poplar'
+    assert search_engine._local_fuzzy_search('Magisitus Chorozo')['name'] == 'Magistus Chorozo'
+    assert search_engine._local_fuzzy_search('Completely Different') is None
+
+def test_local_fuzzy_search_rejects_candidates_below_the_threshold():
+    strict = _engine_with_catalog(['Gaia'], similarity_threshold=0.95)
+    assert strict._local_fuzzy_search('Gaiq') is None
+    
+    lenient = _engine_with_catalog(['Gaia'], similarity_threshold=0.7)
+    assert lenient._local_fuzzy_search('Gaiq')['name'] == 'Gaia'
+
+def test_similarity_bound_prunes_without_changing_results():
+    catalog = build_catalog(1500)
+    pruned = _engine_with_catalog(catalog)
+    pruned.api_client.search_cards.side_effect = lambda query: [
+        card for card in catalog if query.lower() in card['name'].lower()
+    ]
+    unpruned = CardSearchEngine(pruned.api_client)
+    unpruned._similarity_upper_bound = lambda profile, name: float('inf')
+    
+    rng = random.Random(42)
+    corpus = [make_typo(card['name'], rng) for card in rng.sample(catalog, 40)]
+    for typo in corpus:
+        profile = pruned._similarity_profile(typo)
+        for card in rng.sample(catalog, 20):
+            assert pruned._similarity_upper_bound(profile, card['name']) >= \
+                pruned._calculate_similarity(typo, card['name'])
+        
+        for method in ('_token_search', '_fuzzy_api_search'):
+            expected = getattr(unpruned, method)(typo)
+            actual = getattr(pruned, method)(typo)
+            assert (actual or {}).get('name') == (expected or {}).get('name')
+
+def test_vector_search_ranks_whole_catalog():
+    pytest.importorskip('scipy')
+    search_engine = _engine_with_catalog(['Blazing Jester', 'Blazing Knight', 'Pot of Greed'])
+    
+    # No token is shared with the catalog, so only the vector stage can match
+    assert search_engine._token_search('Blazin gJester') is None
+    assert search_engine._vector_search('Blazin gJester')['name'] == 'Blazing Jester'
+    
+    disabled = _engine_with_catalog(['Blazing Jester'], use_vector_scorer=False)
+    assert disabled.vector_scorer is None
+    assert disabled._vector_search('Blazin gJester') is None
+
+def test_offline_first_makes_no_network_calls():
+    catalog = build_catalog(2000)
+    search_engine = _engine_with_catalog(catalog, offline_first=True)
+    api_client = search_engine.api_client
+    
+    rng = random.Random(60)
+    deck = [card['name'] for card in rng.sample(catalog, 40)]
+    deck += [make_typo(name, rng) for name in deck[:20]]
+    deck += ['Snake-eye Oak', 'Magisitus Chorozo', 'Rciela Sinister Soul']
+    
+    for card_name in deck:
+        assert search_engine.search(card_name) is not None, card_name
+    
+    assert search_engine.correction_map['Magisitus Chorozo'] == 'Magistus Chorozo'
+    assert search_engine.correction_map['Rciela Sinister Soul'] == \
+        'Rciela, Sinister Soul of the White Forest'
+    api_client.get_card_by_name.assert_not_called()
+    api_client.search_cards.assert_not_called()
+
+def test_offline_first_falls_back_to_api_on_catalog_miss():
+    search_engine = _engine_with_catalog(['Dark Magician'], offline_first=True)
+    api_client = search_engine.api_client
+    api_client.get_card_by_name.return_value = {'name': 'Brand New Card'}
+    
+    assert search_engine.search('Brand New Card')['name'] == 'Brand New Card'
+    api_client.get_card_by_name.assert_called_once_with('Brand New Card')
+
+def test_misses_are_cached():
+    search_engine = _engine_with_catalog(['Dark Magician'])
+    
+    assert search_engine.search('Nonexistent Card') is None
+    assert search_engine.search('Nonexistent Card') is None
+    
+    search_engine.api_client.get_card_by_name.assert_called_once()
+    stats = search_engine.get_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['negative_hits'] == 1
+
+def test_cached_misses_expire_after_an_outage():
+    search_engine = _engine_with_catalog(['Dark Magician'], negative_cache_ttl=30)
+    now = [100.0]
+    search_engine.card_cache.clock = lambda: now[0]
+    api_client = search_engine.api_client
+    
+    # The API is down: the lookup fails and the miss is cached briefly
+    assert search_engine.search('Brand New Card') is None
+    now[0] += 10
+    assert search_engine.search('Brand New Card') is None
+    assert api_client.get_card_by_name.call_count == 1
+    
+    # Once it expires, the recovered API is asked again
+    api_client.get_card_by_name.return_value = {'name': 'Brand New Card'}
+    now[0] += 30
+    assert search_engine.search('Brand New Card')['name'] == 'Brand New Card'
+    assert api_client.get_card_by_name.call_count == 2
+
+def test_search_many_resolves_each_name_once():
+    search_engine = _engine_with_catalog(['Dark Magician', 'Magistus Chorozo'])
+    search_engine.api_client.get_cards_by_names.return_value = {'Brand New Card': {'name': 'Brand New Card'}}
+    
+    results = search_engine.search_many(
+        ['Dark Magician', 'Brand New Card', ' Dark Magician ', 'Magisitus Chorozo', 'Dark Magician']
+    )
+    
+    assert [card['name'] for card in results] == [
+        'Dark Magician', 'Brand New Card', 'Dark Magician', 'Magistus Chorozo', 'Dark Magician'
+    ]
+    assert search_engine.correction_map == {'Magisitus Chorozo': 'Magistus Chorozo'}
+    # Catalog hits never reach the API and the rest go out as one batch
+    search_engine.api_client.get_cards_by_names.assert_called_once_with(
+        ['Brand New Card', 'Magisitus Chorozo']
+    )
+    search_engine.api_client.get_card_by_name.assert_not_called()
+    
+    # A second batch is answered from the search cache
+    assert search_engine.search_many(['Brand New Card'])[0]['name'] == 'Brand New Card'
+    search_engine.api_client.get_cards_by_names.assert_called_once()
+
+def test_search_many_reports_progress_as_names_resolve():
+    search_engine = _engine_with_catalog(['Dark Magician', 'Magistus Chorozo'])
+    search_engine.search('Dark Magician')
+    
+    reported = []
+    
+    def progress(name, card_data):
+        # Exact hits are reported before the API batch for the rest is sent
+        if not search_engine.api_client.get_cards_by_names.called:
+            reported.append(('before API', name))
+        reported.append((name, card_data and card_data['name']))
+    
+    search_engine.search_many(
+        ['Dark Magician', 'Magistus Chorozo', 'Magisitus Chorozo', 'No Such Card', 'Dark Magician'],
+        progress=progress
+    )
+    assert reported == [
+        ('before API', 'Dark Magician'), ('Dark Magician', 'Dark Magician'),  # from the search cache
+        ('before API', 'Magistus Chorozo'), ('Magistus Chorozo', 'Magistus Chorozo'),
+        ('Magisitus Chorozo', 'Magistus Chorozo'),
+        ('No Such Card', None)
+    ]
+
+def test_search_many_matches_search():
+    catalog = build_catalog(2000)
+    rng = random.Random(9)
+    deck = [card['name'] for card in rng.sample(catalog, 30)]
+    deck += [make_typo(name, rng) for name in deck[:15]] + ['Rciela Sinister Soul']
+    
+    single, batch = _engine_with_catalog(catalog), _engine_with_catalog(catalog)
+    expected = [single.search(name) for name in deck]
+    assert batch.search_many(deck, max_workers=4) == expected
+    assert batch.get_name_corrections() == single.get_name_corrections()
+
+def test_learned_aliases_skip_fuzzy_stages():
+    alias_store = AliasStore()
+    names = ['Dark Magician', 'Magistus Chorozo']
+    first = _engine_with_catalog(names, alias_store=alias_store)
+    assert first.search('Magisitus Chorozo')['name'] == 'Magistus Chorozo'
+    assert alias_store.get('magisitus chorozo') == 'Magistus Chorozo'
+    assert alias_store.items()['magisitus chorozo']['catalog_version'] == first.catalog_version
+    
+    second = _engine_with_catalog(names, alias_store=alias_store)
+    with patch.object(second, '_try_strategies') as mock_strategies:
+        assert second.search('Magisitus Chorozo')['name'] == 'Magistus Chorozo'
+        assert second.search_many(['magisitus  chorozo'])[0]['name'] == 'Magistus Chorozo'
+        mock_strategies.assert_not_called()
+    second.api_client.get_card_by_name.assert_not_called()
+    assert second.get_name_corrections()['Magisitus Chorozo'] == 'Magistus Chorozo'
+    
+    # An alias pointing at a card that left the catalog is forgotten
+    third = _engine_with_catalog(['Dark Magician'], alias_store=alias_store)
+    assert third.search('Magisitus Chorozo') is None
+    assert alias_store.get('Magisitus Chorozo') is None
+
+def test_search_many_async_matches_search_many():
+    catalog = build_catalog(2000)
+    rng = random.Random(12)
+    deck = [card['name'] for card in rng.sample(catalog, 20)]
+    deck += [make_typo(name, rng) for name in deck[:10]] + deck[:5]
+    
+    async def get_cards_by_names_async(names):
+        return {}
+    async_client = MagicMock()
+    async_client.get_cards_by_names_async.side_effect = get_cards_by_names_async
+    
+    expected = _engine_with_catalog(catalog).search_many(deck)
+    batch = _engine_with_catalog(catalog).search_many_async(deck, async_client, concurrency=4)
+    assert asyncio.run(batch) == expected
+    # Only the misspelled names need the API, in one batch
+    async_client.get_cards_by_names_async.assert_called_once()
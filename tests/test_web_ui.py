@@ -0,0 +1,35 @@
+# tests/test_web_ui.py
+import pytest
+
+pytest.importorskip('flask')
+
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+from yugioh_db_generator.core.search_engine import CardSearchEngine
+from yugioh_db_generator.web import web_ui
+
+def test_card_details_serves_cards_from_the_cached_catalog(tmp_path, monkeypatch):
+    from catalog_fixture import build_catalog
+    from stub_server import StubAPIServer
+    
+    catalog = build_catalog(50)
+    with StubAPIServer(catalog) as server:
+        warm = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        warm.BASE_URL = server.url
+        warm.get_all_cards()
+        
+        # A new client loads the catalog snapshot as compact records
+        api_client = YGOPRODeckAPI(cache_dir=str(tmp_path), use_cache=True)
+        api_client.BASE_URL = server.url
+        monkeypatch.setattr(web_ui, 'search_engine', CardSearchEngine(api_client))
+        client = web_ui.app.test_client()
+        
+        for card in catalog[:2]:
+            response = client.get(f"/api/card-details/{card['name']}")
+            assert response.status_code == 200
+            assert response.get_json()['card'] == card  # heavy fields included
+        
+        assert server.requests == 1
+        
+        # A name the catalog lacks is asked of the API
+        assert client.get('/api/card-details/No Such Card').status_code == 404
+        assert server.requests == 2
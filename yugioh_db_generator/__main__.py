@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Command-line entry point for the Yu-Gi-Oh! Card Database Generator."""
 
+import os
 import sys
+import logging
 from yugioh_db_generator.cli.parser import create_parser
+from yugioh_db_generator.core.alias_store import AliasStore
 from yugioh_db_generator.core.card_database import CardDatabaseGenerator
 from yugioh_db_generator.utils.logging_utils import setup_logging
 from yugioh_db_generator.utils.file_utils import read_deck_list
@@ -18,10 +21,31 @@ def main():
     args = parser.parse_args()
     
     try:
+        if args.clear_cache:
+            clear_cache(args)
+        
+        # Alias maintenance commands run instead of a generation
+        if args.list_aliases or args.forget_alias or args.prune_aliases:
+            return run_alias_commands(args)
+        
+        if args.sync_catalog:
+            return run_sync_command(args)
+        
+        # Initialize the generator; its API client also resolves YDK card IDs
+        generator = CardDatabaseGenerator(
+            output_file=args.output,
+            output_format=args.format,
+            max_workers=args.threads,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache,
+            offline_first=args.offline_first,
+            aliases_file=None if args.no_aliases else get_aliases_file(args)
+        )
+        
         # Read the deck list
         if args.input:
             logger.info(f"Reading deck list from: {args.input}")
-            deck_list = read_deck_list(args.input)
+            deck_list = read_deck_list(args.input, api_client=generator.api_client)
         else:
             logger.info("No input file provided. Using example deck list.")
             from yugioh_db_generator.utils.file_utils import get_default_deck_list
@@ -33,13 +57,6 @@ def main():
             
         logger.info(f"Processing {len(deck_list)} cards...")
         
-        # Initialize the generator
-        generator = CardDatabaseGenerator(
-            output_file=args.output,
-            output_format=args.format,
-            max_workers=args.threads
-        )
-        
         # Generate the database
         generator.generate_database(deck_list)
         
@@ -62,5 +79,64 @@ def main():
         return 1
 
 
+def get_aliases_file(args) -> str:
+    """Get the learned aliases file, kept in the cache directory unless given."""
+    return args.aliases_file or os.path.join(args.cache_dir, "aliases.json")
+
+
+def clear_cache(args):
+    """Remove the cached API responses and card catalog."""
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    
+    YGOPRODeckAPI(cache_dir=args.cache_dir).clear_cache()
+
+
+def run_alias_commands(args) -> int:
+    """Inspect or prune the learned name aliases."""
+    logger = logging.getLogger(__name__)
+    
+    if args.prune_aliases:
+        # Pruning checks every alias against the current card catalog
+        generator = CardDatabaseGenerator(
+            output_file=args.output,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache,
+            aliases_file=get_aliases_file(args),
+            similarity_threshold=args.similarity_threshold
+        )
+        generator.prune_aliases()
+        alias_store = generator.alias_store
+    else:
+        alias_store = AliasStore(get_aliases_file(args))
+    
+    for card_name in args.forget_alias or []:
+        if alias_store.remove(card_name):
+            logger.info(f"Forgot alias: {card_name}")
+        else:
+            logger.warning(f"No learned alias for: {card_name}")
+    alias_store.save()
+    
+    if args.list_aliases:
+        from yugioh_db_generator.cli.interface import show_aliases
+        show_aliases(alias_store.items())
+    
+    return 0
+
+
+def run_sync_command(args) -> int:
+    """Update the cached card catalog used by generation runs and report what changed."""
+    from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+    from yugioh_db_generator.cli.interface import show_sync_report
+    
+    if args.no_cache:
+        logging.getLogger(__name__).error("--sync-catalog updates the cache; it cannot be used with --no-cache")
+        return 1
+    
+    api_client = YGOPRODeckAPI(cache_dir=args.cache_dir)
+    report = api_client.sync_catalog()
+    show_sync_report(report)
+    return 1 if report["status"] == "failed" else 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
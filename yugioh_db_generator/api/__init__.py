@@ -2,3 +2,9 @@
 
 from yugioh_db_generator.api.card_api import YGOPRODeckAPI
 from yugioh_db_generator.api.banlist_api import BanlistAPI
+from yugioh_db_generator.api.http_session import create_session
+from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
+from yugioh_db_generator.api.rate_limiter import TokenBucket
+from yugioh_db_generator.api.circuit_breaker import CircuitBreaker
+from yugioh_db_generator.api.card_record import CardRecord
+from yugioh_db_generator.api.response_cache import ResponseCache
@@ -0,0 +1,423 @@
+"""asyncio client for the YGOPRODeck API."""
+
+import asyncio
+import os
+import tempfile
+from typing import Dict, Any, Optional, List, Callable, Awaitable, IO, Iterable, Mapping
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without the extra
+    aiohttp = None
+
+from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+from yugioh_db_generator.api.circuit_breaker import CircuitBreaker
+from yugioh_db_generator.api.json_stream import iter_json_array
+from yugioh_db_generator.api.rate_limiter import TokenBucket
+from yugioh_db_generator.api.response_cache import ResponseCache
+from yugioh_db_generator.index.name_index import CardNameIndex
+from yugioh_db_generator.utils.cache_utils import AsyncSingleFlight, freeze
+
+
+class AsyncYGOPRODeckAPI(YGOPRODeckAPI):
+    """Non-blocking variant of ``YGOPRODeckAPI``.
+    
+    The lookups have coroutine counterparts named with an ``_async``
+    suffix, e.g. ``get_card_by_name_async``; the inherited blocking methods
+    keep working. Everything else, including the disk cache layout and the
+    local ``fname`` emulation, is shared with the blocking client, so both
+    read and write the same cache entries. Loading the catalog from disk
+    runs off the event loop.
+    Requires aiohttp (``pip install yugioh-db-generator[async]``).
+    
+    Use it as an async context manager, or ``await close()`` when done.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str = None,
+        use_cache: bool = True,
+        max_concurrency: int = 64,
+        connect_timeout: float = YGOPRODeckAPI.CONNECT_TIMEOUT,
+        read_timeout: float = YGOPRODeckAPI.READ_TIMEOUT,
+        rate_limiter: Optional[TokenBucket] = None,
+        stale_while_revalidate: float = YGOPRODeckAPI.STALE_WHILE_REVALIDATE,
+        max_retries: int = YGOPRODeckAPI.MAX_RETRIES,
+        retry_backoff: float = YGOPRODeckAPI.RETRY_BACKOFF,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        response_cache: Optional[ResponseCache] = None,
+        catalog: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Initialize the async API client.
+        
+        Args:
+            cache_dir: Directory to store cached responses
+            use_cache: Whether to use cached responses
+            max_concurrency: Maximum number of requests in flight at once
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send data
+            rate_limiter: Token bucket to share with other clients of the
+                same host, e.g. a blocking client's ``rate_limiter``
+            stale_while_revalidate: Seconds past its TTL a cached response
+                is still served while it is refreshed in the background
+            max_retries: Retries of a request that timed out, could not
+                connect or was answered with a 5xx
+            retry_backoff: Seconds before the first retry
+            circuit_breaker: Circuit breaker to share with other clients of
+                the same host, e.g. a blocking client's ``circuit_breaker``
+            response_cache: Response cache to share with a blocking client of
+                the same ``cache_dir``, e.g. its ``response_cache``
+            catalog: Catalog already loaded by a blocking client, e.g. its
+                ``catalog``
+        """
+        if not self.is_available():
+            raise ImportError("AsyncYGOPRODeckAPI requires aiohttp")
+        super().__init__(
+            cache_dir=cache_dir,
+            use_cache=use_cache,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            rate_limiter=rate_limiter,
+            stale_while_revalidate=stale_while_revalidate,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            circuit_breaker=circuit_breaker,
+            response_cache=response_cache,
+            catalog=catalog
+        )
+        self.max_concurrency = max_concurrency
+        
+        # Created on first use, inside the running event loop
+        self.client_session = None
+        self._semaphore = None
+        
+        # Identical requests in flight on the event loop are sent once
+        self._async_request_flight = AsyncSingleFlight()
+    
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the optional aiohttp dependency is installed."""
+        return aiohttp is not None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Close the pooled connections."""
+        if self.client_session is not None:
+            await self.client_session.close()
+            self.client_session = None
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args) -> Any:
+        """Run disk or CPU-bound work of the blocking client off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def _get_client_session(self):
+        """Get the shared aiohttp session, creating it on first use."""
+        if self.client_session is None:
+            connect_timeout, read_timeout = self.timeout
+            self.client_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                headers=dict(self.session.headers)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.client_session
+    
+    async def _make_request(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Make a request to the API (see ``YGOPRODeckAPI._make_request``).
+        
+        Stale cached responses are refreshed on the blocking client's
+        background threads, so the refresh outlives the event loop if need be.
+        """
+        # Check cache first
+        state = self._cache_state(endpoint)
+        if state in (ResponseCache.FRESH, ResponseCache.STALE):
+            cached_data = self._get_from_cache(endpoint)
+            if cached_data:
+                self.logger.debug(f"Using cached data for: {endpoint}")
+                if state == ResponseCache.STALE:
+                    self._revalidate_in_background(endpoint, self._fetch)
+                return cached_data
+        
+        return await self._async_request_flight.do(endpoint, lambda: self._fetch_async(endpoint))
+    
+    def coalesced_requests(self) -> int:
+        """Get the number of requests saved by sharing another caller's identical request."""
+        return super().coalesced_requests() + self._async_request_flight.shared
+    
+    async def _fetch_async(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Request an endpoint, revalidating the cached response if there is one."""
+        cached = self.response_cache is not None and self.response_cache.exists(endpoint)
+        headers = self.response_cache.conditional_headers(endpoint) if cached else None
+        
+        async def read(response):
+            if response.status == 304:
+                return response.status, response.headers.copy(), None
+            return response.status, response.headers.copy(), await response.json(content_type=None)
+        
+        result = await self._send_request_async(f"{self.BASE_URL}{endpoint}", read, headers)
+        if result is None:
+            if cached:
+                self.logger.warning(f"Using expired cached data for: {endpoint}")
+                return self._get_from_cache(endpoint)
+            return None
+        
+        status, response_headers, data = result
+        data = freeze(data)
+        if status == 304:
+            self.logger.debug(f"Cached data still current for: {endpoint}")
+            self.response_cache.record_fetch(endpoint, response_headers, not_modified=True)
+            return self._get_from_cache(endpoint)
+        
+        # Cache the response
+        self._save_to_cache(endpoint, data, response_headers)
+        
+        return data
+    
+    async def _send_request_async(
+        self,
+        url: str,
+        read: Callable[[Any], Awaitable[Any]],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Send a rate-limited GET request, retrying after HTTP 429 and transient failures.
+        
+        Retries and the circuit breaker work as in ``YGOPRODeckAPI._send_request``,
+        which is inherited unchanged for the background refreshes that run
+        on the blocking client's threads. A failure once ``read`` has started
+        consuming the body is not retried.
+        
+        Args:
+            url: URL to request
+            read: Coroutine function reading the successful response
+            headers: Extra request headers, e.g. conditional ones
+        
+        Returns:
+            What ``read`` returned, or None if the request failed
+        """
+        if not self._allow_request(url):
+            return None
+        
+        client_session = self._get_client_session()
+        
+        async with self._semaphore:
+            throttled = retries = 0
+            while True:
+                # Respect rate limiting
+                await self.rate_limiter.acquire_async()
+                
+                reading = False
+                try:
+                    self.logger.debug(f"Making API request to: {url}")
+                    async with client_session.get(url, headers=headers) as response:
+                        if response.status == 429 and throttled < self.MAX_THROTTLE_RETRIES:
+                            throttled += 1
+                            self._throttle(response.headers.get("Retry-After"))
+                            continue
+                        if response.status in self.RETRY_STATUSES:
+                            error = f"HTTP {response.status} for url: {url}"
+                        else:
+                            self.circuit_breaker.record_success()
+                            response.raise_for_status()
+                            reading = True
+                            result = await read(response)
+                            self.rate_limiter.record_success()
+                            return result
+                except (aiohttp.ClientResponseError, ValueError) as e:
+                    # Answered, but not with a usable response
+                    self.logger.warning(f"API request failed: {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if reading:
+                        # ``read`` may have consumed part of the body (e.g. into a
+                        # download), so like the blocking client, do not retry
+                        self.logger.warning(f"API request failed while reading the response: {e}")
+                        return None
+                    error = e
+                
+                delay = self._retry_delay(retries, error)
+                if delay is None:
+                    return None
+                retries += 1
+                await asyncio.sleep(delay)
+    
+    async def _get_name_index_async(self) -> Optional[CardNameIndex]:
+        """Get the catalog's name index (see ``YGOPRODeckAPI._get_name_index``)."""
+        if self.name_index is not None or (self.catalog is None and self.response_cache is None):
+            return self.name_index
+        # Loading the cached catalog and indexing it would block the loop
+        return await self._run_blocking(self._get_name_index)
+    
+    async def get_card_by_name_async(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Get card information by exact name (see ``YGOPRODeckAPI.get_card_by_name``)."""
+        try:
+            name_index = await self._get_name_index_async()
+            if name_index is not None:
+                card = name_index.get_by_name(card_name)
+                if card is not None:
+                    return card
+            
+            endpoint = f"{self.CARD_INFO_ENDPOINT}?name={self._encode_name(card_name)}"
+            
+            data = await self._make_request(endpoint)
+            if data and "data" in data and len(data["data"]) > 0:
+                return data["data"][0]
+            
+            return None
+        except Exception as e:
+            self.logger.warning(f"Error getting card by name: {e}")
+            return None
+    
+    async def get_card_by_id_async(self, card_id: int) -> Optional[Dict[str, Any]]:
+        """Get card information by card ID (see ``YGOPRODeckAPI.get_cards_by_ids``)."""
+        try:
+            return (await self.get_cards_by_ids_async([card_id])).get(int(card_id))
+        except Exception as e:
+            self.logger.warning(f"Error getting card by ID: {e}")
+            return None
+    
+    async def get_cards_by_ids_async(self, card_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Get several cards by card ID; the batched requests run concurrently.
+        
+        Returns:
+            Dictionary mapping each found ID to its card data
+        """
+        results, missing = await self._run_blocking(self._match_ids, list(card_ids))
+        chunks = self._chunk_ids(missing)
+        responses = await asyncio.gather(*(self._fetch_cards_async(chunk) for chunk in chunks))
+        for chunk, cards in zip(chunks, responses):
+            results.update(self._merge_id_results(chunk, cards))
+        return results
+    
+    async def _fetch_cards_async(self, chunk: List[int]) -> Optional[List[Dict[str, Any]]]:
+        """Request a batched ID lookup (see ``YGOPRODeckAPI._fetch_cards``)."""
+        endpoint = f"{self.CARD_INFO_ENDPOINT}?id=" + ",".join(str(card_id) for card_id in chunk)
+        
+        async def read(response):
+            return await response.json(content_type=None)
+        
+        data = await self._async_request_flight.do(
+            endpoint, lambda: self._send_request_async(f"{self.BASE_URL}{endpoint}", read)
+        )
+        return freeze(data.get("data")) if isinstance(data, dict) else None
+    
+    async def get_cards_by_names_async(self, card_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several cards by exact name; the batched requests run concurrently.
+        
+        Returns:
+            Dictionary mapping each found input name to its card data
+        """
+        results = {}
+        name_index = await self._get_name_index_async()
+        if name_index is not None:
+            results = self._match_catalog(name_index, card_names)
+            card_names = [name for name in card_names if name not in results]
+        
+        chunks = self._chunk_names(list(dict.fromkeys(card_names)))
+        for chunk_results in await asyncio.gather(*(self._get_chunk(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return results
+    
+    async def _get_chunk(self, chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up one chunk of names, retrying name by name if the batch fails."""
+        data = None
+        if len(chunk) > 1:
+            endpoint = f"{self.CARD_INFO_ENDPOINT}?name=" + "|".join(
+                self._encode_name(name) for name in chunk
+            )
+            data = await self._make_request(endpoint)
+        
+        if data and "data" in data:
+            found = {card['name'].lower(): card for card in data["data"]}
+            return {name: found[name.lower()] for name in chunk if name.lower() in found}
+        
+        cards = await asyncio.gather(*(self.get_card_by_name_async(name) for name in chunk))
+        return {name: card for name, card in zip(chunk, cards) if card}
+    
+    async def search_cards_async(self, query: str) -> List[Dict[str, Any]]:
+        """Search for cards using a partial name (locally when the catalog is available)."""
+        try:
+            if self.substring_index is not None or (self.catalog is None and self.response_cache is None):
+                local_results = self._search_catalog(query)
+            else:
+                local_results = await self._run_blocking(self._search_catalog, query)
+            if local_results:
+                return local_results
+            
+            endpoint = self.SEARCH_ENDPOINT.format(query=quote(query))
+            data = await self._make_request(endpoint)
+            if data and "data" in data:
+                return list(data["data"])
+            
+            return []
+        except Exception as e:
+            self.logger.warning(f"Error searching cards: {e}")
+            return []
+    
+    async def get_all_cards_async(self) -> List[Dict[str, Any]]:
+        """Get all cards in the database (see ``YGOPRODeckAPI.get_all_cards``)."""
+        state = self._cache_state(self.CARD_INFO_ENDPOINT)
+        if state == ResponseCache.STALE:
+            self._revalidate_in_background(self.CARD_INFO_ENDPOINT, self._refresh_catalog_cache)
+        elif state == ResponseCache.EXPIRED:
+            # Streams the dump to disk; run it off the event loop
+            await self._run_blocking(self._refresh_catalog_cache, self.CARD_INFO_ENDPOINT)
+    
+        try:
+            cards = await self._run_blocking(self._load_catalog_snapshot)
+            if cards is None:
+                cards = await self._fetch_catalog()
+            if cards:
+                return await self._run_blocking(self._set_catalog, cards)
+            
+            return []
+        except Exception as e:
+            self.logger.warning(f"Error getting all cards: {e}")
+            return []
+    
+    async def _fetch_catalog(self) -> List[Dict[str, Any]]:
+        """Ingest the full catalog, downloading it to disk first if it is not cached.
+        
+        The download is written chunk by chunk and then streamed through
+        the same ingestion as in the blocking client, so the whole dump is
+        never held in memory.
+        """
+        cache_path = self._get_cache_path(self.CARD_INFO_ENDPOINT)
+        if not (self.use_cache and cache_path and os.path.exists(cache_path)):
+            with self._open_cache_file(self.CARD_INFO_ENDPOINT) as cache_file:
+                if cache_file is None:
+                    # Not caching: ingest from a scratch file instead
+                    with tempfile.TemporaryFile() as scratch:
+                        await self._download(self.CARD_INFO_ENDPOINT, scratch)
+                        scratch.seek(0)
+                        return await self._run_blocking(
+                            self._ingest_catalog, iter_json_array(self._read_chunks(scratch))
+                        )
+                headers = await self._download(self.CARD_INFO_ENDPOINT, cache_file)
+            self.response_cache.record_fetch(self.CARD_INFO_ENDPOINT, headers)
+        
+        return await self._run_blocking(self._ingest_catalog, self._stream_catalog())
+    
+    async def _download(self, endpoint: str, f: IO[bytes]) -> Mapping[str, str]:
+        """Write the response body of ``endpoint`` to ``f`` as it arrives.
+        
+        Returns:
+            The response headers
+        
+        Raises:
+            OSError: If the request failed
+        """
+        async def write(response):
+            async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                f.write(chunk)
+            return response.headers.copy()
+        
+        headers = await self._send_request_async(f"{self.BASE_URL}{endpoint}", write)
+        if headers is None:
+            raise OSError(f"Could not download {endpoint}")
+        return headers
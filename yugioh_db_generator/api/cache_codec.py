@@ -0,0 +1,223 @@
+"""Transparent compression of cached API responses."""
+
+import os
+import gzip
+import logging
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without the extra
+    zstandard = None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZSTD_MAX_HEADER = 18  # bytes of a zstd frame header, which records the dictionary ID
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Raised when reading a corrupt (or truncated) entry
+DECODE_ERRORS = (ValueError, OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+class CacheCodec:
+    """Compresses cache entries with zstd, or gzip when zstandard is missing.
+    
+    Reading never depends on the configured compression: the format of an
+    entry is recognized by its magic bytes, so uncompressed entries from
+    older caches and entries written with another codec stay readable.
+    
+    Per-card responses are a few kilobytes of JSON sharing most of their
+    keys and vocabulary, which compress poorly on their own. With zstd,
+    a dictionary trained on card payloads (``train_dictionary``) is used
+    for entries up to ``DICTIONARY_MAX_ENTRY`` bytes. Dictionaries are
+    saved as ``<dict id>.zdict`` in ``dictionary_dir`` and looked up by the
+    ID recorded in each frame, so retraining never breaks older entries.
+    """
+    
+    ZSTD_LEVEL = 3
+    GZIP_LEVEL = 6
+    DICTIONARY_SIZE = 64 * 1024  # bytes
+    DICTIONARY_MAX_ENTRY = 64 * 1024  # larger entries (the catalog dump) do not gain from it
+    DICTIONARY_SUFFIX = ".zdict"
+    
+    def __init__(self, dictionary_dir: str, compression: str = "auto"):
+        """Initialize the codec.
+        
+        Args:
+            dictionary_dir: Directory holding the trained zstd dictionaries
+            compression: "zstd", "gzip", "none", or "auto" for zstd when
+                zstandard is installed and gzip otherwise
+        
+        Raises:
+            ValueError: If ``compression`` is unknown
+            ImportError: If zstd is requested without zstandard
+        """
+        if compression == "auto":
+            compression = "zstd" if self.is_zstd_available() else "gzip"
+        if compression not in ("zstd", "gzip", "none"):
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if compression == "zstd" and not self.is_zstd_available():
+            raise ImportError("zstd cache compression requires zstandard")
+        
+        self.logger = logging.getLogger(__name__)
+        self.compression = compression
+        self.dictionary_dir = dictionary_dir
+        self._dictionaries = {}  # dict ID -> ZstdCompressionDict
+        self._dictionary = None  # used to compress small entries
+        self._local = threading.local()  # zstd contexts are not thread-safe
+        self._lock = threading.Lock()
+        
+        if self.compression == "zstd":
+            self._dictionary = self._load_latest_dictionary()
+    
+    @staticmethod
+    def is_zstd_available() -> bool:
+        """Check whether the optional zstandard dependency is installed."""
+        return zstandard is not None
+    
+    @property
+    def needs_dictionary(self) -> bool:
+        """Whether small entries would benefit from ``train_dictionary``."""
+        return self.compression == "zstd" and self._dictionary is None
+    
+    def compress(self, body: bytes) -> bytes:
+        """Compress an entry written in one piece."""
+        if self.compression == "zstd":
+            dictionary = self._dictionary if len(body) <= self.DICTIONARY_MAX_ENTRY else None
+            return self._compressor(dictionary).compress(body)
+        if self.compression == "gzip":
+            return gzip.compress(body, self.GZIP_LEVEL, mtime=0)
+        return body
+    
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress an entry, whatever codec it was written with."""
+        if data.startswith(_ZSTD_MAGIC):
+            dict_id = self._zstd().get_frame_parameters(data).dict_id
+            return self._decompressor(dict_id).decompressobj().decompress(data)
+        if data.startswith(_GZIP_MAGIC):
+            return gzip.decompress(data)
+        return data
+    
+    @contextmanager
+    def writer(self, f: IO[bytes]) -> Iterator[IO[bytes]]:
+        """Wrap ``f`` so what is written to it is compressed (for large, streamed entries)."""
+        if self.compression == "zstd":
+            with self._compressor(None).stream_writer(f, closefd=False) as out:
+                yield out
+        elif self.compression == "gzip":
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=self.GZIP_LEVEL, mtime=0) as out:
+                yield out
+        else:
+            yield f
+    
+    @contextmanager
+    def reader(self, f: IO[bytes]) -> Iterator[IO[bytes]]:
+        """Wrap ``f`` so it reads decompressed, whatever codec the entry was written with."""
+        header = f.read(_ZSTD_MAX_HEADER)
+        f.seek(0)
+        if header.startswith(_ZSTD_MAGIC):
+            dict_id = self._zstd().get_frame_parameters(header).dict_id
+            with self._decompressor(dict_id).stream_reader(f, closefd=False) as stream:
+                yield stream
+        elif header.startswith(_GZIP_MAGIC):
+            with gzip.GzipFile(fileobj=f, mode="rb") as stream:
+                yield stream
+        else:
+            yield f
+    
+    def train_dictionary(self, samples: Sequence[bytes]) -> bool:
+        """Train and save a dictionary for small entries from example bodies.
+        
+        Returns:
+            Whether a dictionary is now in use (never with gzip)
+        """
+        if self.compression != "zstd":
+            return False
+        
+        try:
+            dictionary = zstandard.train_dictionary(self.DICTIONARY_SIZE, list(samples), level=self.ZSTD_LEVEL)
+            os.makedirs(self.dictionary_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.dictionary_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(dictionary.as_bytes())
+                os.replace(temp_path, self._dictionary_path(dictionary.dict_id()))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except (zstandard.ZstdError, OSError) as e:
+            self.logger.warning(f"Error training cache dictionary: {e}")
+            return False
+        
+        with self._lock:
+            self._dictionaries[dictionary.dict_id()] = dictionary
+            self._dictionary = dictionary
+        self.logger.info(f"Trained cache dictionary {dictionary.dict_id()} on {len(samples)} samples")
+        return True
+    
+    def _zstd(self):
+        if zstandard is None:
+            raise ValueError("Cache entry is zstd-compressed but zstandard is not installed")
+        return zstandard
+    
+    def _dictionary_path(self, dict_id: int) -> str:
+        return os.path.join(self.dictionary_dir, f"{dict_id}{self.DICTIONARY_SUFFIX}")
+    
+    def _load_latest_dictionary(self):
+        """Load the most recently trained dictionary, if any."""
+        try:
+            paths = [
+                entry.path for entry in os.scandir(self.dictionary_dir)
+                if entry.name.endswith(self.DICTIONARY_SUFFIX)
+            ]
+        except OSError:
+            return None
+        if not paths:
+            return None
+        
+        latest = max(paths, key=os.path.getmtime)
+        try:
+            return self._get_dictionary(int(os.path.basename(latest)[:-len(self.DICTIONARY_SUFFIX)]))
+        except ValueError as e:
+            self.logger.warning(f"Error loading cache dictionary {latest}: {e}")
+            return None
+    
+    def _get_dictionary(self, dict_id: int):
+        """Get a saved dictionary by ID.
+        
+        Raises:
+            ValueError: If it cannot be read
+        """
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+        if dictionary is not None:
+            return dictionary
+        
+        try:
+            with open(self._dictionary_path(dict_id), "rb") as f:
+                dictionary = zstandard.ZstdCompressionDict(f.read())
+        except OSError as e:
+            raise ValueError(f"Missing cache dictionary {dict_id}: {e}")
+        with self._lock:
+            self._dictionaries[dict_id] = dictionary
+        return dictionary
+    
+    def _compressor(self, dictionary: Optional["zstandard.ZstdCompressionDict"]):
+        """Get this thread's compression context for ``dictionary`` (or none)."""
+        contexts = self._local.__dict__.setdefault("compressors", {})
+        dict_id = dictionary.dict_id() if dictionary is not None else 0
+        if dict_id not in contexts:
+            contexts[dict_id] = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL, dict_data=dictionary)
+        return contexts[dict_id]
+    
+    def _decompressor(self, dict_id: int):
+        """Get this thread's decompression context for frames using ``dict_id``."""
+        zstd = self._zstd()
+        contexts = self._local.__dict__.setdefault("decompressors", {})
+        if dict_id not in contexts:
+            dictionary = self._get_dictionary(dict_id) if dict_id else None
+            contexts[dict_id] = zstd.ZstdDecompressor(dict_data=dictionary)
+        return contexts[dict_id]
@@ -3,11 +3,27 @@
 import os
 import json
 import time
+import random
 import logging
+import threading
 import requests
-from typing import Dict, Any, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Any, Optional, List, Iterable, Iterator, IO, Callable
 from urllib.parse import quote
 
+from yugioh_db_generator.api.cache_codec import DECODE_ERRORS
+from yugioh_db_generator.api.card_record import CardRecord
+from yugioh_db_generator.api.catalog_snapshot import CatalogSnapshot, CatalogSnapshotWriter
+from yugioh_db_generator.api.circuit_breaker import CircuitBreaker
+from yugioh_db_generator.api.http_session import create_session
+from yugioh_db_generator.api.json_stream import JSONArrayStream, iter_json_array
+from yugioh_db_generator.api.rate_limiter import TokenBucket, parse_retry_after
+from yugioh_db_generator.api.response_cache import ResponseCache
+from yugioh_db_generator.index.name_index import CardNameIndex
+from yugioh_db_generator.index.substring_index import SubstringIndex
+from yugioh_db_generator.utils.cache_utils import SingleFlight, freeze
+
 
 class YGOPRODeckAPI:
     """Client for interacting with the YGOPRODeck API."""
@@ -15,108 +31,346 @@ class YGOPRODeckAPI:
     BASE_URL = "https://db.ygoprodeck.com/api/v7"
     CARD_INFO_ENDPOINT = "/cardinfo.php"
     SEARCH_ENDPOINT = "/cardinfo.php?fname={query}"
-    RATE_LIMIT_DELAY = 0.1  # seconds between API calls
+    DB_VERSION_ENDPOINT = "/checkDBVer.php"
+    RATE_LIMIT = 10.0  # sustained requests per second
+    RATE_LIMIT_BURST = 4  # requests allowed back to back after an idle period
+    MAX_THROTTLE_RETRIES = 2  # retries of a request answered with HTTP 429
+    MAX_RETRIES = 2  # retries of a request that timed out, could not connect or got a 5xx
+    RETRY_BACKOFF = 0.5  # seconds before the first retry, doubled for each later one
+    RETRY_BACKOFF_MAX = 8.0  # cap on the backoff before a retry
+    RETRY_STATUSES = (500, 502, 503, 504)
+    CIRCUIT_FAILURE_THRESHOLD = 5  # failed requests in a row that make the client local-only
+    CIRCUIT_RESET_TIMEOUT = 30.0  # seconds before the API is tried again
+    CATALOG_SNAPSHOT_FILE = "catalog.sqlite3"
+    CATALOG_VERSION_FILE = "catalog_version.json"  # database version of the last synced catalog
+    MAX_QUERY_LENGTH = 1800  # keep batched request URLs well under common limits
+    CONNECT_TIMEOUT = 3.05  # seconds to establish a connection
+    READ_TIMEOUT = 10  # seconds to wait for response data
+    STREAM_CHUNK_SIZE = 1 << 16  # bytes read at a time when streaming the catalog
+    # Seconds a cached response stays fresh, by endpoint prefix (first match wins)
+    CACHE_TTLS = (
+        ("/cardinfo.php?name=", 7 * 86400),  # card text rarely changes once printed
+        ("/cardinfo.php?fname=", 86400),  # searches can match newly released cards
+    )
+    DEFAULT_CACHE_TTL = 86400  # includes the full catalog dump
+    DICTIONARY_SAMPLES = 2000  # catalog cards the cache compression dictionary is trained on
+    DICTIONARY_MIN_SAMPLES = 100  # too few cards to train on (e.g. a partial catalog)
+    STALE_WHILE_REVALIDATE = 7 * 86400  # past its TTL, an entry is served while refreshed in the background
     
-    def __init__(self, cache_dir: str = None, use_cache: bool = True):
+    def __init__(
+        self,
+        cache_dir: str = None,
+        use_cache: bool = True,
+        max_workers: int = 4,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        stale_while_revalidate: float = STALE_WHILE_REVALIDATE,
+        max_retries: int = MAX_RETRIES,
+        retry_backoff: float = RETRY_BACKOFF,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        response_cache: Optional[ResponseCache] = None,
+        catalog: Optional[List[Dict[str, Any]]] = None
+    ):
         """Initialize the API client.
         
         Args:
             cache_dir: Directory to store cached responses
             use_cache: Whether to use cached responses
+            max_workers: Number of threads sharing the client; sizes the
+                connection pool
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send data
+            session: HTTP session to share with other clients (a pooled
+                keep-alive session is created if omitted)
+            rate_limiter: Token bucket to share with other clients of the
+                same host (one allowing RATE_LIMIT requests per second is
+                created if omitted)
+            stale_while_revalidate: Seconds past its TTL a cached response
+                is still served while it is refreshed in the background
+                (0 to revalidate before use as soon as the TTL has passed)
+            max_retries: Retries of a request that timed out, could not
+                connect or was answered with a 5xx
+            retry_backoff: Seconds before the first retry; each retry waits
+                a random time up to twice as long as the previous one could
+            circuit_breaker: Circuit breaker to share with other clients of
+                the same host (one opening after CIRCUIT_FAILURE_THRESHOLD
+                failed requests is created if omitted)
+            response_cache: Response cache to share with another client of
+                the same ``cache_dir``, e.g. its ``response_cache``, so
+                revalidations are counted together (one is created if omitted)
+            catalog: Catalog already loaded by another client, e.g. its
+                ``catalog``, so lookups are answered locally right away
         """
         self.logger = logging.getLogger(__name__)
         self.use_cache = use_cache
         self.cache_dir = cache_dir
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = session or create_session(pool_size=max_workers)
         
-        if self.use_cache and self.cache_dir:
-            os.makedirs(self.cache_dir, exist_ok=True)
+        # Responses on disk, with their age and validators
+        self.response_cache = response_cache
+        if self.response_cache is None and self.use_cache and self.cache_dir:
+            self.response_cache = ResponseCache(
+                self.cache_dir,
+                base_url=self.BASE_URL,
+                ttls=self.CACHE_TTLS,
+                default_ttl=self.DEFAULT_CACHE_TTL,
+                stale_while_revalidate=stale_while_revalidate
+            )
+        
+        # Background refreshes of stale responses, by endpoint
+        self._revalidator = None
+        self._revalidating: Dict[str, Future] = {}
+        self._revalidation_lock = threading.Lock()
             
-        self.last_request_time = 0
-    
-    def _respect_rate_limit(self):
-        """Delay requests to respect API rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        # Identical requests in flight on several threads are sent once
+        self._request_flight = SingleFlight()
+            
+        self.rate_limiter = rate_limiter or TokenBucket(rate=self.RATE_LIMIT, burst=self.RATE_LIMIT_BURST)
+        
+        # Transient failures are retried; while the API keeps failing, the
+        # circuit breaker stops requests and only the local catalog answers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=self.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=self.CIRCUIT_RESET_TIMEOUT
+        )
         
-        if time_since_last < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - time_since_last)
+        # Full catalog, once fetched, and the indexes used to answer name, ID
+        # and fname lookups locally
+        self.catalog = None
+        self.name_index = None
+        self.substring_index = None
+        self._catalog_lock = threading.Lock()
         
-        self.last_request_time = time.time()
+        # Compact copy of the cached catalog that loads without parsing the full dump
+        self.catalog_snapshot = None
+        if self.use_cache and self.cache_dir:
+            self.catalog_snapshot = CatalogSnapshot(os.path.join(self.cache_dir, self.CATALOG_SNAPSHOT_FILE))
+        if catalog is not None:
+            self._set_catalog(catalog)
     
     def _get_cache_path(self, endpoint: str) -> str:
         """Get the cache file path for an endpoint."""
-        if not self.cache_dir:
+        if self.response_cache is None:
             return None
-            
-        # Create a safe filename from the endpoint
-        safe_name = endpoint.replace("/", "_").replace("?", "_").replace("=", "_")
-        return os.path.join(self.cache_dir, f"{safe_name}.json")
+        return self.response_cache.path(endpoint)
     
     def _get_from_cache(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Get response from cache if available."""
-        if not self.use_cache:
-            return None
-            
-        cache_path = self._get_cache_path(endpoint)
-        if not cache_path or not os.path.exists(cache_path):
-            return None
-            
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.warning(f"Error reading from cache: {e}")
+        """Get a cached response, whatever its age."""
+        if self.response_cache is None:
             return None
-    
-    def _save_to_cache(self, endpoint: str, data: Dict[str, Any]):
-        """Save response to cache."""
-        if not self.use_cache or not self.cache_dir:
-            return
+        return self.response_cache.read(endpoint)
             
-        cache_path = self._get_cache_path(endpoint)
-        if not cache_path:
+    def _save_to_cache(self, endpoint: str, data: Dict[str, Any], headers=None):
+        """Save a response and its validators to the cache."""
+        if self.response_cache is None:
             return
-            
-        try:
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(data, f)
-        except Exception as e:
-            self.logger.warning(f"Error saving to cache: {e}")
+        self.response_cache.write(endpoint, data, headers)
+    
+    def _cache_state(self, endpoint: str) -> Optional[str]:
+        """Get the freshness of the cached response (see ``ResponseCache.state``)."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.state(endpoint)
     
     def _make_request(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Make a request to the API."""
+        """Make a request to the API.
+        
+        Fresh cached responses are used as they are. A stale one is used
+        too, and refreshed in the background; an expired one is
+        revalidated with a conditional request first. Threads requesting
+        an endpoint that another thread is already fetching wait for and
+        share its response.
+        """
         # Check cache first
-        cached_data = self._get_from_cache(endpoint)
-        if cached_data:
-            self.logger.debug(f"Using cached data for: {endpoint}")
-            return cached_data
+        state = self._cache_state(endpoint)
+        if state in (ResponseCache.FRESH, ResponseCache.STALE):
+            cached_data = self._get_from_cache(endpoint)
+            if cached_data:
+                self.logger.debug(f"Using cached data for: {endpoint}")
+                if state == ResponseCache.STALE:
+                    self._revalidate_in_background(endpoint, self._fetch)
+                return cached_data
+        
+        return self._request_flight.do(endpoint, lambda: self._fetch(endpoint))
+    
+    def coalesced_requests(self) -> int:
+        """Get the number of requests saved by sharing another caller's identical request."""
+        return self._request_flight.shared
+    
+    def _fetch(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Request an endpoint, revalidating the cached response if there is one.
+        
+        Returns:
+            The new or confirmed response; the cached one if the API
+            cannot be reached; None if there is neither
+        """
+        cached = self.response_cache is not None and self.response_cache.exists(endpoint)
+        headers = self.response_cache.conditional_headers(endpoint) if cached else None
         
-        # Respect rate limiting
-        self._respect_rate_limit()
+        response = self._send_request(f"{self.BASE_URL}{endpoint}", headers=headers)
+        if response is None:
+            if cached:
+                self.logger.warning(f"Using expired cached data for: {endpoint}")
+                return self._get_from_cache(endpoint)
+            return None
         
-        # Make the request
-        url = f"{self.BASE_URL}{endpoint}"
+        if response.status_code == 304:
+            self.logger.debug(f"Cached data still current for: {endpoint}")
+            self.response_cache.record_fetch(endpoint, response.headers, not_modified=True)
+            return self._get_from_cache(endpoint)
         
         try:
-            self.logger.debug(f"Making API request to: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = freeze(response.json())
+        except ValueError as e:
+            self.logger.warning(f"API request failed: {e}")
+            return None
+        
+        # Cache the response
+        self._save_to_cache(endpoint, data, response.headers)
+        
+        return data
+    
+    def _revalidate_in_background(self, endpoint: str, refresh: Callable[[str], Any]):
+        """Run ``refresh(endpoint)`` on a background thread unless it is already running."""
+        with self._revalidation_lock:
+            if endpoint in self._revalidating:
+                return
+            if self._revalidator is None:
+                self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+            self.logger.debug(f"Refreshing stale cached data for: {endpoint}")
+            future = self._revalidator.submit(refresh, endpoint)
+            self._revalidating[endpoint] = future
+        future.add_done_callback(lambda future: self._finish_revalidation(endpoint, future))
+    
+    def _finish_revalidation(self, endpoint: str, future: Future):
+        with self._revalidation_lock:
+            self._revalidating.pop(endpoint, None)
+        if future.exception() is not None:
+            self.logger.warning(f"Error refreshing cached data for {endpoint}: {future.exception()}")
+    
+    def wait_for_revalidations(self, timeout: Optional[float] = None):
+        """Wait for the background refreshes of stale cache entries to finish."""
+        with self._revalidation_lock:
+            futures = list(self._revalidating.values())
+        wait(futures, timeout=timeout)
+    
+    def _send_request(
+        self,
+        url: str,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[requests.Response]:
+        """Send a rate-limited GET request, retrying after HTTP 429 and transient failures.
+        
+        Timeouts, connection errors and 5xx answers are retried up to
+        ``max_retries`` times after a jittered exponential backoff. No
+        request is sent while the circuit breaker is open.
+        
+        Args:
+            url: URL to request
+            stream: Leave the body to be read incrementally
+            headers: Extra request headers, e.g. conditional ones
+        
+        Returns:
+            The successful response, or None if the request failed
+        """
+        if not self._allow_request(url):
+            return None
+        
+        throttled = retries = 0
+        while True:
+            # Respect rate limiting
+            self.rate_limiter.acquire()
             
-            # Cache the response
-            self._save_to_cache(endpoint, data)
+            try:
+                self.logger.debug(f"Making API request to: {url}")
+                response = self.session.get(url, timeout=self.timeout, stream=stream, headers=headers)
+            except requests.exceptions.RequestException as e:
+                error = e
+            else:
+                if response.status_code == 429 and throttled < self.MAX_THROTTLE_RETRIES:
+                    response.close()
+                    throttled += 1
+                    self._throttle(response.headers.get("Retry-After"))
+                    continue
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.circuit_breaker.record_success()
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError as e:
+                        self.logger.warning(f"API request failed: {e}")
+                        return None
+                    self.rate_limiter.record_success()
+                    return response
+                response.close()
+                error = f"HTTP {response.status_code} for url: {url}"
             
-            return data
-        except requests.exceptions.RequestException as e:
-            self.logger.warning(f"API request failed: {e}")
+            delay = self._retry_delay(retries, error)
+            if delay is None:
+                return None
+            retries += 1
+            time.sleep(delay)
+    
+    def _allow_request(self, url: str) -> bool:
+        """Check with the circuit breaker whether a request may be sent."""
+        if self.circuit_breaker.allow_request():
+            return True
+        self.logger.debug(f"API unavailable; not requesting: {url}")
+        return False
+    
+    def _retry_delay(self, retries: int, error: Any) -> Optional[float]:
+        """Get the backoff before retrying a failed request, or None when out of retries.
+        
+        The delay is drawn uniformly up to ``retry_backoff * 2 ** retries``
+        (capped at RETRY_BACKOFF_MAX), so clients failing together do not
+        retry together. A request that is out of retries counts as a
+        failure for the circuit breaker.
+        """
+        if retries >= self.max_retries:
+            self.logger.warning(f"API request failed: {error}")
+            self.circuit_breaker.record_failure()
             return None
+        
+        delay = random.uniform(0, min(self.RETRY_BACKOFF_MAX, self.retry_backoff * 2 ** retries))
+        self.logger.info(f"API request failed ({error}); retrying in {delay:.2f}s")
+        return delay
+    
+    def is_local_only(self) -> bool:
+        """Whether requests are suspended because the API keeps failing.
+        
+        Lookups are then answered from the local catalog only.
+        """
+        return self.circuit_breaker.state == CircuitBreaker.OPEN
+    
+    def _throttle(self, retry_after_header: Optional[str]):
+        """Slow every request down after the API answered HTTP 429."""
+        retry_after = parse_retry_after(retry_after_header)
+        self.logger.warning(f"Rate limited by the API (Retry-After: {retry_after_header}); backing off")
+        self.rate_limiter.throttle(retry_after)
     
     def get_card_by_name(self, card_name: str) -> Optional[Dict[str, Any]]:
-        """Get card information by exact name."""
+        """Get card information by exact name.
+        
+        When the catalog is loaded or cached on disk the card is looked up
+        in it first, so no per-card response is requested or cached for the
+        cards it holds. Names it lacks (e.g. cards released since it was
+        fetched) are requested from the API, and only those responses are
+        cached.
+        """
         try:
+            name_index = self._get_name_index()
+            if name_index is not None:
+                card = name_index.get_by_name(card_name)
+                if card is not None:
+                    return card
+            
             # Handle special characters
-            encoded_name = quote(card_name.replace("'", "%27").replace('"', '%22'))
-            endpoint = f"{self.CARD_INFO_ENDPOINT}?name={encoded_name}"
+            endpoint = f"{self.CARD_INFO_ENDPOINT}?name={self._encode_name(card_name)}"
             
             data = self._make_request(endpoint)
             if data and "data" in data and len(data["data"]) > 0:
@@ -127,42 +381,622 @@ class YGOPRODeckAPI:
             self.logger.warning(f"Error getting card by name: {e}")
             return None
     
+    def get_card_by_id(self, card_id: int) -> Optional[Dict[str, Any]]:
+        """Get card information by card ID (see ``get_cards_by_ids``)."""
+        try:
+            return self.get_cards_by_ids([card_id]).get(int(card_id))
+        except Exception as e:
+            self.logger.warning(f"Error getting card by ID: {e}")
+            return None
+    
+    def get_cards_by_names(self, card_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several cards by exact name using as few requests as possible.
+        
+        With a catalog the names are looked up in it first and only the ones
+        it lacks are requested. As the API accepts ``|``-separated names,
+        names are packed into chunks that keep the request URL short. A chunk
+        that fails is retried name by name.
+        
+        Args:
+            card_names: Exact card names to look up
+            
+        Returns:
+            Dictionary mapping each found input name to its card data
+        """
+        results = {}
+        name_index = self._get_name_index()
+        if name_index is not None:
+            results = self._match_catalog(name_index, card_names)
+            card_names = [name for name in card_names if name not in results]
+        
+        for chunk in self._chunk_names(list(dict.fromkeys(card_names))):
+            endpoint = f"{self.CARD_INFO_ENDPOINT}?name=" + "|".join(
+                self._encode_name(name) for name in chunk
+            )
+            data = self._make_request(endpoint) if len(chunk) > 1 else None
+            
+            if data and "data" in data:
+                found = {card['name'].lower(): card for card in data["data"]}
+                for name in chunk:
+                    if name.lower() in found:
+                        results[name] = found[name.lower()]
+            else:
+                for name in chunk:
+                    card_data = self.get_card_by_name(name)
+                    if card_data:
+                        results[name] = card_data
+        
+        return results
+    
+    def _match_catalog(self, name_index: CardNameIndex, card_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look names up in the catalog index, keeping the ones found."""
+        results = {}
+        for name in card_names:
+            card = name_index.get_by_name(name)
+            if card is not None:
+                results[name] = card
+        return results
+    
+    def get_cards_by_ids(self, card_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Get several cards by card ID using as few requests as possible.
+        
+        IDs are looked up in the catalog first, then in the cached per-ID
+        responses. The rest are sent as comma-separated ``id`` lists packed
+        into chunks that keep the request URL short, and the cards found are
+        cached one per ID, so a later lookup of any of them needs no request.
+        Alternate artwork IDs, which the catalog does not index, resolve to
+        their card through the API.
+        
+        Args:
+            card_ids: Card IDs (or numeric strings) to look up
+        
+        Returns:
+            Dictionary mapping each found ID to its card data
+        """
+        results, missing = self._match_ids(card_ids)
+        for chunk in self._chunk_ids(missing):
+            endpoint = f"{self.CARD_INFO_ENDPOINT}?id=" + ",".join(str(card_id) for card_id in chunk)
+            results.update(self._merge_id_results(chunk, self._request_flight.do(
+                endpoint, lambda: self._fetch_cards(endpoint)
+            )))
+        return results
+    
+    def _match_ids(self, card_ids: Iterable[int]):
+        """Resolve IDs from the catalog and the per-ID cache entries.
+        
+        Returns:
+            The cards found by ID, and the distinct valid IDs still missing
+        """
+        name_index = self._get_name_index()
+        results, missing = {}, []
+        for card_id in dict.fromkeys(card_ids):
+            try:
+                card_id = int(card_id)
+            except (TypeError, ValueError):
+                self.logger.warning(f"Ignoring invalid card ID: {card_id!r}")
+                continue
+            
+            card = name_index.get_by_id(card_id) if name_index is not None else None
+            if card is None:
+                card = self._get_cached_card(card_id)
+            if card is not None:
+                results[card_id] = card
+            else:
+                missing.append(card_id)
+        return results, list(dict.fromkeys(missing))
+    
+    def _get_cached_card(self, card_id: int) -> Optional[Dict[str, Any]]:
+        """Get a card cached by ``get_cards_by_ids`` if it is fresh (or stale)."""
+        endpoint = f"{self.CARD_INFO_ENDPOINT}?id={card_id}"
+        if self._cache_state(endpoint) not in (ResponseCache.FRESH, ResponseCache.STALE):
+            return None
+        data = self._get_from_cache(endpoint)
+        if data and "data" in data and len(data["data"]) > 0:
+            return data["data"][0]
+        return None
+    
+    def _fetch_cards(self, endpoint: str) -> Optional[List[Dict[str, Any]]]:
+        """Request a batched lookup whose cards are cached by ID rather than as one response."""
+        response = self._send_request(f"{self.BASE_URL}{endpoint}")
+        if response is None:
+            return None
+        
+        try:
+            data = freeze(response.json())
+        except ValueError as e:
+            self.logger.warning(f"API request failed: {e}")
+            return None
+        return data.get("data") if isinstance(data, dict) else None
+    
+    def _merge_id_results(
+        self,
+        chunk: List[int],
+        cards: Optional[List[Dict[str, Any]]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Match the cards returned for a chunk of IDs and cache each one under its requested ID."""
+        found = {}
+        for card in cards or ():
+            for image in card.get("card_images") or ():
+                found.setdefault(image.get("id"), card)
+            found[card.get("id")] = card
+        
+        results = {}
+        for card_id in chunk:
+            card = found.get(card_id)
+            if card is None:
+                self.logger.warning(f"No card found for ID: {card_id}")
+                continue
+            results[card_id] = card
+            self._save_to_cache(f"{self.CARD_INFO_ENDPOINT}?id={card_id}", {"data": [card]})
+        return results
+    
+    def _chunk_names(self, card_names: List[str]) -> List[List[str]]:
+        """Split names into chunks whose encoded query fits MAX_QUERY_LENGTH."""
+        return self._chunk_query(card_names, self._encode_name)
+    
+    def _chunk_ids(self, card_ids: List[int]) -> List[List[int]]:
+        """Split IDs into chunks whose query fits MAX_QUERY_LENGTH."""
+        return self._chunk_query(card_ids, str)
+    
+    def _chunk_query(self, values: List[Any], encode: Callable[[Any], str]) -> List[List[Any]]:
+        """Split query values into chunks whose joined encoding fits MAX_QUERY_LENGTH."""
+        chunks, chunk, length = [], [], 0
+        for value in values:
+            encoded_length = len(encode(value)) + 1
+            if chunk and length + encoded_length > self.MAX_QUERY_LENGTH:
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(value)
+            length += encoded_length
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    def _encode_name(self, card_name: str) -> str:
+        """URL-encode a card name for the ``name`` parameter."""
+        return quote(card_name.replace("'", "%27").replace('"', '%22'))
+    
     def search_cards(self, query: str) -> List[Dict[str, Any]]:
-        """Search for cards using a partial name."""
+        """Search for cards using a partial name.
+        
+        When a catalog snapshot is available the search is answered locally
+        with the same semantics as the API's ``fname`` parameter; the API is
+        queried without one, or when no catalog card matches.
+        """
         try:
+            local_results = self._search_catalog(query)
+            if local_results:
+                return local_results
+            
             encoded_query = quote(query)
             endpoint = self.SEARCH_ENDPOINT.format(query=encoded_query)
             
             data = self._make_request(endpoint)
             if data and "data" in data:
-                return data["data"]
+                return list(data["data"])
                 
             return []
         except Exception as e:
             self.logger.warning(f"Error searching cards: {e}")
             return []
     
+    def _search_catalog(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Emulate the ``fname`` search against the local catalog.
+        
+        Returns the cards whose name contains the query (case-insensitive),
+        sorted by name like the API, or None when no catalog is available.
+        """
+        catalog = self._get_catalog_snapshot()
+        if not catalog:
+            return None
+        
+        with self._catalog_lock:
+            if self.substring_index is None:
+                index = SubstringIndex()
+                index.build(card['name'] for card in catalog)
+                self.substring_index = index
+        
+        results = [catalog[position] for position in self.substring_index.search(query)]
+        results.sort(key=lambda card: card['name'])
+        return results
+    
+    def _get_name_index(self) -> Optional[CardNameIndex]:
+        """Get the name and ID index over the catalog, or None when no catalog is available.
+        
+        Like ``_search_catalog``, this uses a catalog that is loaded or
+        cached on disk, but never fetches one.
+        """
+        catalog = self._get_catalog_snapshot()
+        if not catalog:
+            return None
+        
+        with self._catalog_lock:
+            if self.name_index is None:
+                index = CardNameIndex()
+                index.build(catalog)
+                self.name_index = index
+            return self.name_index
+    
+    def _get_catalog_snapshot(self) -> Optional[List[Dict[str, Any]]]:
+        """Get the full catalog if it is loaded or cached on disk, without fetching it."""
+        if self.catalog is not None:
+            return self.catalog
+        
+        if self.use_cache:
+            cache_path = self._get_cache_path(self.CARD_INFO_ENDPOINT)
+            if cache_path and os.path.exists(cache_path):
+                return self._load_catalog()
+        
+        return None
+    
     def get_all_cards(self) -> List[Dict[str, Any]]:
-        """Get all cards in the database."""
+        """Get all cards in the database.
+        
+        When the catalog snapshot matches the cached response it is loaded
+        instead of the full JSON dump. Otherwise the dump is parsed as it
+        is read, card by card, and the snapshot is rebuilt alongside; the
+        cards then carry their core fields only (see ``get_card_extras``).
+        
+        A stale cached dump is used while it is refreshed in the background;
+        an expired one is revalidated first, and kept if the API cannot be
+        reached.
+        """
+        state = self._cache_state(self.CARD_INFO_ENDPOINT)
+        if state == ResponseCache.STALE:
+            self._revalidate_in_background(self.CARD_INFO_ENDPOINT, self._refresh_catalog_cache)
+        elif state == ResponseCache.EXPIRED:
+            self._refresh_catalog_cache(self.CARD_INFO_ENDPOINT)
+        
+        return self._load_catalog()
+    
+    def _load_catalog(self) -> List[Dict[str, Any]]:
+        """Load the catalog from the snapshot, the cached dump or the API, whatever their age."""
         try:
-            data = self._make_request(self.CARD_INFO_ENDPOINT)
-            if data and "data" in data:
-                return data["data"]
+            cards = self._load_catalog_snapshot()
+            if cards is None:
+                cards = self._ingest_catalog(self._stream_catalog())
+            if cards:
+                return self._set_catalog(cards)
                 
             return []
         except Exception as e:
             self.logger.warning(f"Error getting all cards: {e}")
             return []
     
+    def _refresh_catalog_cache(self, endpoint: str) -> Optional[bool]:
+        """Revalidate the cached catalog dump, downloading it again if it changed.
+        
+        The new dump only replaces the cached one once it is complete. The
+        snapshot is rebuilt from it on the next load; a 304 leaves the dump
+        untouched, so the snapshot stays current.
+        
+        Returns:
+            Whether a new dump was downloaded, or None if the API could
+            not be reached (the cached copy is kept)
+        """
+        response = self._send_request(
+            f"{self.BASE_URL}{endpoint}",
+            stream=True,
+            headers=self.response_cache.conditional_headers(endpoint)
+        )
+        if response is None:
+            self.logger.warning(f"Could not refresh {endpoint}; using the cached copy")
+            return None
+        
+        with response:
+            if response.status_code == 304:
+                self.logger.debug(f"Cached data still current for: {endpoint}")
+                self.response_cache.record_fetch(endpoint, response.headers, not_modified=True)
+                return False
+            
+            try:
+                with self.response_cache.writer(endpoint) as f:
+                    for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+            except (OSError, requests.exceptions.RequestException) as e:
+                self.logger.warning(f"Error refreshing {endpoint}: {e}")
+                return None
+        self.response_cache.record_fetch(endpoint, response.headers)
+        self.logger.info(f"Refreshed cached data for: {endpoint}")
+        return True
+    
+    def get_database_version(self) -> Optional[str]:
+        """Get the version of the API's card database, which changes whenever cards do.
+        
+        Returns:
+            The version, or None if it could not be checked
+        """
+        response = self._send_request(f"{self.BASE_URL}{self.DB_VERSION_ENDPOINT}")
+        if response is None:
+            return None
+        
+        try:
+            data = response.json()
+            entry = data[0] if isinstance(data, list) else data
+            return str(entry["database_version"])
+        except (ValueError, LookupError, TypeError) as e:
+            self.logger.warning(f"Unexpected database version response: {e}")
+            return None
+    
+    def sync_catalog(self) -> Dict[str, Any]:
+        """Bring the cached catalog up to date, downloading it only when the API's changed.
+        
+        The database version is checked first; when it matches the one of
+        the last sync, the cached dump is kept and marked fresh. Otherwise
+        the dump is revalidated (and downloaded if it changed), diffed
+        against the previous catalog by card ID, and the snapshot and the
+        name index are updated for the added, removed and changed cards only.
+        
+        Returns:
+            Report with the ``status`` ("unchanged", "updated" or
+            "failed"), the ``database_version`` and ``previous_version``,
+            the names of the ``added``, ``removed`` and ``changed`` cards,
+            the ``renamed`` cards (old name -> new name), the ``banlist``
+            changes (name -> (old status, new status)), the number of
+            ``snapshot_rows_written`` and the ``seconds`` the sync took
+        
+        Raises:
+            ValueError: If caching is disabled
+        """
+        if self.response_cache is None or self.catalog_snapshot is None:
+            raise ValueError("Syncing the catalog requires a cache directory")
+        
+        start = time.perf_counter()
+        endpoint = self.CARD_INFO_ENDPOINT
+        version = self.get_database_version()
+        previous_version = self._read_catalog_version()
+        report = {
+            "status": "unchanged",
+            "database_version": version,
+            "previous_version": previous_version,
+            "added": [],
+            "removed": [],
+            "changed": [],
+            "renamed": {},
+            "banlist": {},
+            "snapshot_rows_written": 0
+        }
+        
+        if version is not None and version == previous_version and self.response_cache.exists(endpoint):
+            self.logger.info(f"Card catalog is up to date (database version {version})")
+            self.response_cache.record_fetch(endpoint, not_modified=True)
+        else:
+            old_cards = self._get_catalog_snapshot() or []
+            downloaded = self._refresh_catalog_cache(endpoint)
+            if downloaded is None:
+                report["status"] = "failed"
+            else:
+                if downloaded:
+                    report.update(self._update_catalog(old_cards))
+                    report["status"] = "updated"
+                if version is not None:
+                    self._write_catalog_version(version)
+        
+        report["seconds"] = time.perf_counter() - start
+        self.logger.info(
+            f"Catalog sync {report['status']} in {report['seconds']:.2f}s: {len(report['added'])} added, "
+            f"{len(report['removed'])} removed, {len(report['changed'])} changed"
+        )
+        return report
+    
+    def _update_catalog(self, old_cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Load the refreshed dump, updating the snapshot and indexes for the cards that changed.
+        
+        Returns:
+            The changes, as reported by ``sync_catalog``
+        """
+        writer = self.catalog_snapshot.writer(update=True)
+        records = self._ingest_catalog(self._stream_catalog(), writer)
+        
+        old_by_id = {card['id']: card for card in old_cards if card.get('id') is not None}
+        new_by_id = {card['id']: card for card in records if card.get('id') is not None}
+        added = [card for card_id, card in new_by_id.items() if card_id not in old_by_id]
+        removed = [card for card_id, card in old_by_id.items() if card_id not in new_by_id]
+        changed = [
+            (old_by_id[card_id], card) for card_id, card in new_by_id.items()
+            if card_id in old_by_id and dict(old_by_id[card_id]) != dict(card)
+        ]
+        
+        with self._catalog_lock:
+            self.catalog = records
+            # Positions shift with every addition, so this one is rebuilt on next use
+            self.substring_index = None
+            if self.name_index is not None:
+                for card in removed + [old for old, _ in changed]:
+                    self.name_index.remove(card)
+                for card in added + [new for _, new in changed]:
+                    self.name_index.add(card)
+        
+        def ban_status(card):
+            return (card.get('banlist_info') or {}).get('ban_tcg', 'Unlimited')
+        
+        return {
+            "added": [card['name'] for card in added],
+            "removed": [card['name'] for card in removed],
+            "changed": [new['name'] for _, new in changed],
+            "renamed": {old['name']: new['name'] for old, new in changed if old['name'] != new['name']},
+            "banlist": {
+                new['name']: (ban_status(old), ban_status(new)) for old, new in changed
+                if ban_status(old) != ban_status(new)
+            },
+            "snapshot_rows_written": writer.rows_written if writer is not None else len(records)
+        }
+    
+    def _read_catalog_version(self) -> Optional[str]:
+        """Get the database version recorded by the last catalog sync."""
+        try:
+            with open(os.path.join(self.cache_dir, self.CATALOG_VERSION_FILE), "r", encoding="utf-8") as f:
+                return json.load(f).get("database_version")
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _write_catalog_version(self, version: str):
+        """Record the database version the cached catalog was synced to."""
+        try:
+            with open(os.path.join(self.cache_dir, self.CATALOG_VERSION_FILE), "w", encoding="utf-8") as f:
+                json.dump({"database_version": version}, f)
+        except OSError as e:
+            self.logger.warning(f"Error saving catalog version: {e}")
+    
+    def _load_catalog_snapshot(self) -> Optional[List[Dict[str, Any]]]:
+        """Load the catalog from the snapshot if it is up to date with the cached response."""
+        if self.catalog_snapshot is None:
+            return None
+        
+        source_path = self._get_cache_path(self.CARD_INFO_ENDPOINT)
+        if not self.catalog_snapshot.is_fresh(source_path):
+            return None
+        
+        cards = self.catalog_snapshot.load()
+        if cards is not None:
+            self.logger.debug(f"Loaded {len(cards)} cards from the catalog snapshot")
+        return cards
+    
+    def _stream_catalog(self) -> Iterator[Dict[str, Any]]:
+        """Yield the cards of the full catalog one at a time.
+        
+        The cached response is read in chunks; without one, the response is
+        parsed as it downloads and written to the cache as it goes, so the
+        whole dump is never held in memory.
+        
+        Raises:
+            ValueError: If the response is not valid JSON
+            OSError: If the cached response cannot be decompressed
+        """
+        cache_path = self._get_cache_path(self.CARD_INFO_ENDPOINT)
+        if self.use_cache and cache_path and os.path.exists(cache_path):
+            self.logger.debug(f"Using cached data for: {self.CARD_INFO_ENDPOINT}")
+            try:
+                with self.response_cache.reader(self.CARD_INFO_ENDPOINT) as f:
+                    yield from iter_json_array(self._read_chunks(f))
+            except DECODE_ERRORS:
+                # Drop the corrupt entry so the next load fetches it again
+                self.logger.warning(f"Discarding unreadable cached catalog: {cache_path}")
+                os.remove(cache_path)
+                raise
+            return
+        
+        response = self._send_request(f"{self.BASE_URL}{self.CARD_INFO_ENDPOINT}", stream=True)
+        if response is None:
+            return
+        
+        parser = JSONArrayStream()
+        with response, self._open_cache_file(self.CARD_INFO_ENDPOINT) as cache_file:
+            for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                if cache_file:
+                    cache_file.write(chunk)
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        if self.response_cache is not None:
+            self.response_cache.record_fetch(self.CARD_INFO_ENDPOINT, response.headers)
+    
+    def _read_chunks(self, f: IO[bytes]) -> Iterator[bytes]:
+        """Read a file in ``STREAM_CHUNK_SIZE`` chunks."""
+        return iter(lambda: f.read(self.STREAM_CHUNK_SIZE), b"")
+    
+    @contextmanager
+    def _open_cache_file(self, endpoint: str) -> Iterator[Optional[IO[bytes]]]:
+        """Open a temporary file that replaces the endpoint's cache entry on success.
+        
+        Yields None when caching is disabled or the file cannot be created;
+        if the block raises, the partial file is removed.
+        """
+        if self.response_cache is None:
+            yield None
+            return
+        
+        with ExitStack() as stack:
+            try:
+                f = stack.enter_context(self.response_cache.writer(endpoint))
+            except OSError as e:
+                self.logger.warning(f"Error saving to cache: {e}")
+                f = None
+            yield f
+    
+    def _ingest_catalog(
+        self,
+        cards: Iterable[Dict[str, Any]],
+        writer: Optional[CatalogSnapshotWriter] = None
+    ) -> List[CardRecord]:
+        """Project streamed cards into records, writing the snapshot as they pass.
+        
+        Args:
+            cards: Cards of the full catalog
+            writer: Snapshot writer to use instead of a new one, e.g. an
+                updating one
+        
+        Returns:
+            The records, which read their heavy fields from the snapshot
+            when it could be written and keep them in memory otherwise
+        """
+        if self.response_cache is not None and self.response_cache.codec.needs_dictionary:
+            cards = self._sample_for_dictionary(cards)
+        
+        if writer is None and self.catalog_snapshot is not None:
+            writer = self.catalog_snapshot.writer()
+        if writer is None:
+            return [CardRecord.from_card(card) for card in cards]
+        
+        with writer:
+            records = [writer.add(card) for card in cards]
+            if records:
+                # Without a cached response to stamp it with, the snapshot
+                # serves these records but is rebuilt on the next load
+                writer.commit(self._get_cache_path(self.CARD_INFO_ENDPOINT))
+        return records
+    
+    def _sample_for_dictionary(self, cards: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass cards through, training the cache's compression dictionary on the first ones.
+        
+        The samples are shaped like ``cardinfo.php?name=`` responses, the
+        small entries the dictionary is for.
+        """
+        samples = []
+        for card in cards:
+            if len(samples) < self.DICTIONARY_SAMPLES:
+                samples.append(json.dumps({"data": [card]}).encode("utf-8"))
+            yield card
+        if len(samples) >= self.DICTIONARY_MIN_SAMPLES:
+            self.response_cache.codec.train_dictionary(samples)
+    
+    def get_card_extras(self, card: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the heavy fields (sets, images, prices) of a card.
+        
+        Catalog cards are ``CardRecord``s that load these on demand; for
+        plain dictionaries without them they are read from the snapshot.
+        """
+        if isinstance(card, CardRecord):
+            return card.extras()
+        
+        extras = {key: card[key] for key in CardRecord.HEAVY_FIELDS if key in card}
+        if extras or self.catalog_snapshot is None or "id" not in card:
+            return extras
+        return self.catalog_snapshot.get_extras(card["id"])
+    
+    def _set_catalog(self, cards: List[Dict[str, Any]]) -> List[CardRecord]:
+        """Store a freshly loaded catalog, invalidating the indexes built on the old one.
+        
+        Cards that are not ``CardRecord``s yet are projected into them.
+        """
+        records = [CardRecord.from_card(card) for card in cards]
+        
+        with self._catalog_lock:
+            self.catalog = records
+            self.name_index = None
+            self.substring_index = None
+        return records
+    
     def clear_cache(self):
         """Clear the API cache."""
         if not self.cache_dir or not os.path.exists(self.cache_dir):
             return
             
         try:
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith(".json"):
-                    os.remove(os.path.join(self.cache_dir, filename))
+            (self.response_cache or ResponseCache(self.cache_dir)).clear()
+            for file_name in (self.CATALOG_SNAPSHOT_FILE, self.CATALOG_VERSION_FILE):
+                path = os.path.join(self.cache_dir, file_name)
+                if os.path.exists(path):
+                    os.remove(path)
             self.logger.info("API cache cleared")
         except Exception as e:
             self.logger.warning(f"Error clearing cache: {e}")
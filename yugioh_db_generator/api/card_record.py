@@ -0,0 +1,146 @@
+"""Compact in-memory representation of catalog cards."""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Marks an absent field in a record's value tuple. Never a JSON value, and
+# marshal (used by the catalog snapshot) can store it.
+_MISSING = Ellipsis
+
+
+class CardRecord(Mapping):
+    """Read-only, compact projection of a ``cardinfo.php`` card.
+    
+    A card parsed from the API is a dict of about twenty keys, most of the
+    memory going to sets, images and prices that only a few views need.
+    A record keeps the fields the search engine, formatters and analyzers
+    read as one tuple in a ``__slots__`` object, interns the small
+    vocabulary of ``type``, ``race`` and ``attribute`` strings, and leaves
+    the heavy fields to a loader that is only called when one of them is
+    accessed.
+    
+    Records are ``Mapping``s, so code written against card dicts keeps
+    working (``card['name']``, ``card.get('atk')``, ``dict(card)``).
+    Iteration covers the projected fields only; ``to_dict`` also includes
+    the heavy ones.
+    """
+    
+    CORE_FIELDS = (
+        "id", "name", "type", "frameType", "desc", "atk", "def", "level",
+        "race", "attribute", "archetype", "scale", "linkval", "linkmarkers",
+        "banlist_info"
+    )
+    INTERNED_FIELDS = ("type", "frameType", "race", "attribute", "archetype")
+    HEAVY_FIELDS = ("card_sets", "card_images", "card_prices", "ygoprodeck_url")
+    
+    __slots__ = ("_values", "_other", "_extras", "_load_extras")
+    
+    def __init__(
+        self,
+        card: Dict[str, Any],
+        load_extras: Optional[Callable[[int], Dict[str, Any]]] = None
+    ):
+        """Project a card dictionary.
+        
+        Args:
+            card: Card data as returned by the API
+            load_extras: Called with the card ID to fetch the heavy fields
+                on demand; when given, the heavy fields in ``card`` are
+                dropped, otherwise they are kept as they are
+        """
+        values = [card.get(key, _MISSING) for key in self.CORE_FIELDS]
+        for position in _INTERNED_POSITIONS:
+            if type(values[position]) is str:
+                values[position] = sys.intern(values[position])
+        
+        other = {key: value for key, value in card.items() if key not in _PROJECTED_FIELDS}
+        extras = None
+        if load_extras is None:
+            extras = {key: card[key] for key in self.HEAVY_FIELDS if key in card}
+        
+        self._values = tuple(values)
+        self._other = other or None
+        self._extras = extras
+        self._load_extras = load_extras
+    
+    @classmethod
+    def from_card(
+        cls,
+        card: Dict[str, Any],
+        load_extras: Optional[Callable[[int], Dict[str, Any]]] = None
+    ) -> "CardRecord":
+        """Project ``card``, returning it unchanged if it is already a record."""
+        if isinstance(card, cls):
+            return card
+        return cls(card, load_extras)
+    
+    @classmethod
+    def from_row(
+        cls,
+        row: Tuple[tuple, Optional[Dict[str, Any]]],
+        load_extras: Optional[Callable[[int], Dict[str, Any]]] = None
+    ) -> "CardRecord":
+        """Rebuild a record from ``to_row`` output without re-projecting it."""
+        record = cls.__new__(cls)
+        record._values, record._other = row
+        record._extras = None
+        record._load_extras = load_extras
+        return record
+    
+    def to_row(self) -> Tuple[tuple, Optional[Dict[str, Any]]]:
+        """Get the projected fields as plain data, for storing in the snapshot."""
+        return self._values, self._other
+    
+    def __getitem__(self, key: str) -> Any:
+        position = _POSITIONS.get(key)
+        if position is not None:
+            value = self._values[position]
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if key in _HEAVY_FIELDS:
+            return self.extras()[key]
+        if self._other is not None:
+            return self._other[key]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(self.CORE_FIELDS, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._other is not None:
+            yield from self._other
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"CardRecord({dict(self)!r})"
+    
+    def __reduce__(self):
+        return (CardRecord, (self.to_dict(),))
+    
+    def extras(self) -> Dict[str, Any]:
+        """Get the heavy fields (sets, images, prices), loading them on first use."""
+        if self._extras is None:
+            extras = {}
+            card_id = self.get("id")
+            if self._load_extras is not None and card_id is not None:
+                extras = self._load_extras(card_id)
+            self._extras = extras
+            self._load_extras = None
+        return self._extras
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the full card as a plain dictionary, heavy fields included."""
+        card = dict(self)
+        card.update(self.extras())
+        return card
+
+
+# Lookup tables for the per-key access paths
+_POSITIONS = {key: position for position, key in enumerate(CardRecord.CORE_FIELDS)}
+_INTERNED_POSITIONS = tuple(_POSITIONS[key] for key in CardRecord.INTERNED_FIELDS)
+_HEAVY_FIELDS = frozenset(CardRecord.HEAVY_FIELDS)
+_PROJECTED_FIELDS = frozenset(CardRecord.CORE_FIELDS + CardRecord.HEAVY_FIELDS)
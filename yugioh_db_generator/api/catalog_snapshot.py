@@ -0,0 +1,278 @@
+"""Compact SQLite snapshot of the card catalog for fast startup."""
+
+import os
+import sys
+import hashlib
+import logging
+import marshal
+import shutil
+import sqlite3
+import tempfile
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+from yugioh_db_generator.api.card_record import CardRecord
+
+
+class CatalogSnapshot:
+    """SQLite copy of the cached ``cardinfo.php`` response.
+    
+    Loading the full JSON dump means parsing tens of MB of images, sets
+    and prices on every run. The snapshot stores every card already
+    projected into a ``CardRecord`` (everything the search engine and
+    formatters use) as a single ``marshal`` blob that loads in one call,
+    and keeps the heavy fields in a per-card table that is only read on
+    demand. It records the size and modification time of the JSON file it
+    was built from, and is rebuilt when that file changes or the Python
+    version (and so the marshal format) or the record layout differs.
+    
+    Each heavy-field row carries a digest, so a snapshot of an updated
+    catalog can be written from the previous one, rewriting only the rows
+    of the cards that were added or changed (see ``writer``).
+    """
+    
+    FORMAT_VERSION = 4
+    PYTHON_VERSION = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    HEAVY_FIELDS = CardRecord.HEAVY_FIELDS
+    
+    def __init__(self, path: str):
+        """Initialize the snapshot.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+    
+    def _source_stamp(self, source_path: str) -> Optional[str]:
+        """Identify the current version of the source JSON file."""
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def _connect(self, path: str) -> sqlite3.Connection:
+        return sqlite3.connect(path, check_same_thread=False)
+    
+    def _read_meta(self, connection: sqlite3.Connection) -> Dict[str, str]:
+        return dict(connection.execute("SELECT key, value FROM meta"))
+    
+    def is_fresh(self, source_path: str) -> bool:
+        """Check whether the snapshot was built from the current source file."""
+        stamp = self._source_stamp(source_path)
+        if stamp is None or not os.path.exists(self.path):
+            return False
+        
+        try:
+            connection = self._connect(self.path)
+            try:
+                meta = self._read_meta(connection)
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return False
+        
+        return self._is_compatible(meta) and meta.get("source_stamp") == stamp
+    
+    def _is_compatible(self, meta: Dict[str, str]) -> bool:
+        """Check whether a snapshot was written in the current layout."""
+        return (
+            meta.get("format_version") == str(self.FORMAT_VERSION)
+            and meta.get("python_version") == self.PYTHON_VERSION
+            and meta.get("record_fields") == ",".join(CardRecord.CORE_FIELDS)
+        )
+    
+    def writer(self, update: bool = False) -> Optional["CatalogSnapshotWriter"]:
+        """Start writing a new snapshot, one card at a time.
+        
+        Args:
+            update: Start from the current snapshot, if it has the current
+                layout, and only rewrite the heavy fields of the cards whose
+                content changed
+        
+        Returns:
+            The writer, or None if the snapshot file cannot be created
+        """
+        try:
+            return CatalogSnapshotWriter(self, update=update)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Error building catalog snapshot: {e}")
+            return None
+    
+    def build(self, cards: Iterable[Dict[str, Any]], source_path: str) -> Optional[List[CardRecord]]:
+        """Write a new snapshot of ``cards``, stamped with the source file version.
+        
+        Returns:
+            The cards as records reading their heavy fields from the new
+            snapshot, or None if it could not be written
+        """
+        writer = self.writer()
+        if writer is None:
+            return None
+        
+        try:
+            with writer:
+                records = [writer.add(card) for card in cards]
+                writer.commit(source_path)
+            return records
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Error building catalog snapshot: {e}")
+            return None
+    
+    def load(self) -> Optional[List[CardRecord]]:
+        """Load every card, in catalog order.
+        
+        Returns:
+            List of records that read their heavy fields from the snapshot
+            on demand, or None if the snapshot cannot be read
+        """
+        try:
+            connection = self._connect(self.path)
+            try:
+                (data,) = connection.execute("SELECT data FROM core").fetchone()
+            finally:
+                connection.close()
+            load_extras = self.get_extras  # one bound method shared by every record
+            return [CardRecord.from_row(row, load_extras) for row in marshal.loads(data)]
+        except (sqlite3.Error, TypeError, ValueError, EOFError) as e:
+            self.logger.warning(f"Error reading catalog snapshot: {e}")
+            return None
+    
+    def get_extras(self, card_id: int) -> Dict[str, Any]:
+        """Load the heavy fields (sets, images, prices) of one card."""
+        try:
+            connection = self._connect(self.path)
+            try:
+                row = connection.execute("SELECT data FROM card_extras WHERE id = ?", (card_id,)).fetchone()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading catalog snapshot: {e}")
+            return {}
+        
+        return marshal.loads(row[0]) if row else {}
+
+
+class CatalogSnapshotWriter:
+    """Builds a snapshot from cards streamed in one at a time.
+    
+    Heavy fields go to the database as each card is added, so only the
+    compact records are kept in memory. The database is written to a
+    temporary file and moved into place by ``commit``; readers never see
+    a partial snapshot, and leaving the ``with`` block without committing
+    discards it.
+    
+    An updating writer starts from a copy of the current snapshot: rows
+    whose digest is unchanged are kept, and those of cards that are no
+    longer added are deleted on commit. ``rows_written`` counts the rows
+    actually written.
+    """
+    
+    def __init__(self, snapshot: CatalogSnapshot, update: bool = False):
+        """Create the temporary database.
+        
+        Raises:
+            OSError, sqlite3.Error: If the file cannot be created
+        """
+        self.snapshot = snapshot
+        directory = os.path.dirname(os.path.abspath(snapshot.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        
+        self.connection = None
+        self.digests: Dict[int, bytes] = {}  # of the previous snapshot's rows, by card ID
+        try:
+            updating = update and self._copy_previous()
+            self.connection = snapshot._connect(self.temp_path)
+            if updating:
+                self.connection.executescript("DELETE FROM meta; DELETE FROM core;")
+                self.digests = dict(self.connection.execute("SELECT id, digest FROM card_extras"))
+            else:
+                self.connection.executescript("""
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                    CREATE TABLE core (data BLOB);
+                    CREATE TABLE card_extras (id INTEGER PRIMARY KEY, data BLOB, digest BLOB);
+                """)
+        except (OSError, sqlite3.Error):
+            self._discard()
+            raise
+        self.rows = []
+        self.seen_ids: Set[int] = set()
+        self.rows_written = 0
+        # One bound method shared by every record
+        self.load_extras = snapshot.get_extras
+    
+    def _copy_previous(self) -> bool:
+        """Copy the current snapshot to the temporary file if it has the current layout."""
+        if not os.path.exists(self.snapshot.path):
+            return False
+        
+        try:
+            connection = self.snapshot._connect(self.snapshot.path)
+            try:
+                meta = self.snapshot._read_meta(connection)
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return False
+        if not self.snapshot._is_compatible(meta):
+            return False
+        
+        shutil.copyfile(self.snapshot.path, self.temp_path)
+        return True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._discard()
+    
+    def add(self, card: Dict[str, Any]) -> CardRecord:
+        """Add a card, returning its record."""
+        record = CardRecord.from_card(card, self.load_extras)
+        self.rows.append(record.to_row())
+        if "id" in card:
+            extras = marshal.dumps({key: card[key] for key in CardRecord.HEAVY_FIELDS if key in card})
+            digest = hashlib.sha1(extras).digest()
+            self.seen_ids.add(card["id"])
+            if self.digests.get(card["id"]) != digest:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO card_extras VALUES (?, ?, ?)",
+                    (card["id"], extras, digest)
+                )
+                self.rows_written += 1
+        return record
+    
+    def commit(self, source_path: str):
+        """Finish the snapshot and move it into place.
+        
+        Args:
+            source_path: JSON file the cards were read from; it must be
+                complete, as its current version is recorded
+        """
+        self.connection.executemany(
+            "DELETE FROM card_extras WHERE id = ?",
+            [(card_id,) for card_id in self.digests if card_id not in self.seen_ids]
+        )
+        self.connection.execute("INSERT INTO core VALUES (?)", (marshal.dumps(self.rows),))
+        self.connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format_version", str(CatalogSnapshot.FORMAT_VERSION)),
+            ("python_version", CatalogSnapshot.PYTHON_VERSION),
+            ("record_fields", ",".join(CardRecord.CORE_FIELDS)),
+            ("source_stamp", self.snapshot._source_stamp(source_path) or ""),
+            ("card_count", str(len(self.rows)))
+        ])
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+        os.replace(self.temp_path, self.snapshot.path)
+        self.snapshot.logger.info(f"Built catalog snapshot with {len(self.rows)} cards: {self.snapshot.path}")
+    
+    def _discard(self):
+        """Close the database and remove the temporary file, unless committed."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
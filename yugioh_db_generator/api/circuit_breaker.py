@@ -0,0 +1,116 @@
+"""Circuit breaker that stops the API clients from calling an unhealthy API."""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Union
+
+
+class CircuitBreaker:
+    """Thread- and asyncio-safe circuit breaker shared by the API clients.
+    
+    Every request that still fails after its retries (a timeout, a refused
+    connection or a 5xx answer) counts as a failure, and any answer from
+    the API resets the count. After ``failure_threshold`` failures in a row
+    the circuit opens: requests are refused at once, so callers answer from
+    the local catalog instead of each waiting out its own timeouts. Once
+    ``reset_timeout`` seconds have passed, a single trial request is let
+    through (half-open); an answer closes the circuit, another failure
+    opens it for a new period.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize a closed circuit.
+        
+        Args:
+            failure_threshold: Consecutive failed requests that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+            clock: Monotonic time source, replaceable for testing
+        """
+        self.logger = logging.getLogger(__name__)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        
+        self.opened = 0
+        self.rejected = 0
+    
+    @property
+    def state(self) -> str:
+        """Get the current state: CLOSED, OPEN, or HALF_OPEN once a trial request may go."""
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now, reserving the trial request when half-open."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            
+            if self._state == self.OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            
+            # Half-open: one trial request at a time
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        """Record an answer from the API, closing the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                self.logger.info("API is answering again; resuming requests")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        """Record a request that failed after its retries, opening the circuit past the threshold."""
+        with self._lock:
+            self._failures += 1
+            # Requests sent before the circuit opened do not extend the period
+            if self._state == self.OPEN:
+                return
+            
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._trial_in_flight = False
+                self.opened += 1
+                self.logger.warning(
+                    f"API unavailable after {self._failures} failed requests; "
+                    f"using the local catalog only for {self.reset_timeout:g}s"
+                )
+    
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """Get the breaker statistics."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected
+            }
@@ -0,0 +1,29 @@
+"""Pooled HTTP sessions shared by the API clients."""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_size: int = 4) -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool.
+    
+    Connections are kept open and reused across requests, so a run pays
+    the TCP and TLS handshakes once per pooled connection instead of once
+    per request. The session can be shared by several threads and clients.
+    
+    Args:
+        pool_size: Maximum number of connections kept open per host; match
+            it to the number of threads making requests
+    
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Connection": "keep-alive",
+        "User-Agent": "yugioh-db-generator"
+    })
+    return session
@@ -0,0 +1,165 @@
+"""Incremental parsing of large JSON API responses."""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List, Union
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_END = _WHITESPACE + ",]}"
+
+
+class JSONArrayStream:
+    """Push parser yielding the items of one array in a top-level JSON object.
+    
+    ``cardinfo.php`` answers with ``{"data": [card, card, ...]}``. Instead
+    of building the whole object, chunks of the response are fed in as
+    they arrive and each item of the ``key`` array is returned as soon as
+    it is complete, so only one card and one chunk are held at a time.
+    Other top-level values are parsed and discarded.
+    
+    Works with bytes (decoded as UTF-8) or text chunks, and the same
+    instance serves blocking and asyncio readers.
+    """
+    
+    # Consumed input is dropped from the buffer once this much has built up
+    COMPACT_THRESHOLD = 1 << 16
+    
+    def __init__(self, key: str = "data"):
+        """Initialize the parser.
+        
+        Args:
+            key: Name of the top-level array whose items are returned
+        """
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._current_key = None
+    
+    def feed(self, chunk: Union[bytes, str]) -> List[Any]:
+        """Add a chunk of the response.
+        
+        Returns:
+            Array items completed by this chunk
+        
+        Raises:
+            ValueError: If the input is not the expected JSON
+        """
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk)
+        self._buffer += chunk
+        items = self._parse(final=False)
+        
+        if self._pos > self.COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return items
+    
+    def close(self) -> List[Any]:
+        """Signal the end of the response.
+        
+        Returns:
+            Array items completed by the remaining input
+        
+        Raises:
+            ValueError: If the response ended before the object was complete
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON response")
+        if self._buffer[self._pos:].strip(_WHITESPACE):
+            raise ValueError("Extra data after JSON response")
+        return items
+    
+    def _skip_whitespace(self) -> bool:
+        """Move past whitespace, returning whether a character is available."""
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+    
+    def _expect(self, characters: str) -> str:
+        """Consume one of ``characters`` (after whitespace)."""
+        character = self._buffer[self._pos]
+        if character not in characters:
+            raise ValueError(f"Unexpected {character!r} at offset {self._pos} of the JSON response buffer")
+        self._pos += 1
+        return character
+    
+    def _decode_value(self, final: bool):
+        """Decode the next complete value, or return ``(None, False)`` if more input is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, False
+        # A number is only complete once a delimiter follows it ("-1." may become "-1.5")
+        if not final and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if end == len(self._buffer) or self._buffer[end] not in _NUMBER_END:
+                return None, False
+        self._pos = end
+        return value, True
+    
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        while self._state != "done" and self._skip_whitespace():
+            state = self._state
+            if state == "start":
+                self._expect("{")
+                self._state = "key"
+            elif state == "key":
+                if self._buffer[self._pos] == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                key, complete = self._decode_value(final)
+                if not complete:
+                    break
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object key in the JSON response")
+                self._current_key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif state == "value":
+                if self._current_key == self.key and self._buffer[self._pos] == "[":
+                    self._pos += 1
+                    self._state = "first_item"
+                    continue
+                _, complete = self._decode_value(final)
+                if not complete:
+                    break
+                self._state = "after_value"
+            elif state == "after_value":
+                self._state = "key" if self._expect(",}") == "," else "done"
+            elif state in ("first_item", "item"):
+                if state == "first_item" and self._buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "after_value"
+                    continue
+                item, complete = self._decode_value(final)
+                if not complete:
+                    break
+                items.append(item)
+                self._state = "after_item"
+            elif state == "after_item":
+                self._state = "item" if self._expect(",]") == "," else "after_value"
+        return items
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], key: str = "data") -> Iterator[Any]:
+    """Yield the items of the top-level ``key`` array from an iterable of chunks.
+    
+    Raises:
+        ValueError: If the input is not the expected JSON
+    """
+    parser = JSONArrayStream(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,146 @@
+"""Token-bucket rate limiting shared by the API clients."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Thread- and asyncio-safe token-bucket rate limiter.
+    
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Each
+    request takes one token; when none is left the caller is told exactly
+    how long to wait, and the token is reserved for it, so concurrent
+    callers queue up instead of firing together. The same instance can be
+    shared by blocking threads (``acquire``) and asyncio tasks
+    (``acquire_async``).
+    
+    When the server answers HTTP 429, ``throttle`` pauses every caller for
+    the Retry-After period and halves the rate; each later successful
+    request raises it back towards the configured rate.
+    """
+    
+    RECOVERY_STEP = 0.05  # fraction of the configured rate regained per success
+    
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 1,
+        min_rate: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize a full bucket.
+        
+        Args:
+            rate: Sustained requests per second
+            burst: Requests that may be made back to back after an idle period
+            min_rate: Lowest rate the limiter backs off to after throttling
+            clock: Monotonic time source, replaceable for testing
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()  # refill resumes from here; in the future while paused
+        self._lock = threading.Lock()
+        
+        self.acquired = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.throttled = 0
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how many seconds the caller must wait for it."""
+        with self._lock:
+            now = self.clock()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            
+            # Tokens may go negative: each waiting caller owns one future token
+            self._tokens -= 1
+            wait = max(self._updated - now, 0.0) + max(-self._tokens / self.rate, 0.0)
+            
+            self.acquired += 1
+            if wait > 0:
+                self.waits += 1
+                self.wait_time += wait
+            return wait
+    
+    def acquire(self) -> float:
+        """Block until a request may be made.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self) -> float:
+        """Wait, without blocking the event loop, until a request may be made.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def throttle(self, retry_after: Optional[float] = None):
+        """Back off after the server answered HTTP 429 (Too Many Requests).
+        
+        Args:
+            retry_after: Seconds the server asked clients to wait (defaults
+                to the time one token takes at the reduced rate)
+        """
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            # Nothing refills during the pause; one request may go when it ends
+            self._updated = max(self._updated, self.clock() + pause)
+            self._tokens = min(self._tokens, 1.0)
+    
+    def record_success(self):
+        """Let the rate recover towards its configured value after throttling."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_STEP)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get the limiter statistics."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "wait_time": round(self.wait_time, 3),
+                "throttled": self.throttled
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds."""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
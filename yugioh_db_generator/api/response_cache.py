@@ -0,0 +1,417 @@
+"""On-disk cache of API responses with expiry and revalidation metadata."""
+
+import os
+import json
+import hashlib
+import logging
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, Iterator, Mapping, Optional, Sequence, Tuple
+
+from yugioh_db_generator.api.cache_codec import CacheCodec
+from yugioh_db_generator.utils.cache_utils import LRUCache, freeze
+
+
+class ResponseCache:
+    """Disk cache of API responses keyed by request URL.
+    
+    Entries are named after the SHA-256 of the full URL and fanned out into
+    subdirectories by the first two hex digits of the hash, so no directory
+    holds more than a few dozen files even after thousands of lookups.
+    Each response body is stored as the JSON the API sent, next to a small
+    ``.meta.json`` file holding when it was fetched (or last confirmed
+    unchanged) and the ``ETag`` / ``Last-Modified`` validators of the
+    response. An entry is *fresh* for the TTL of its endpoint, then *stale*
+    for ``stale_while_revalidate`` more seconds (usable while a refresh
+    runs in the background), then *expired* (to be revalidated before use).
+    Entries written before metadata existed are aged by their file time.
+    
+    Bodies are compressed (see ``CacheCodec``); entries written without
+    compression stay readable. Writes go to a temporary file that is moved
+    into place, so readers never see a partial entry.
+    
+    Recently read or written responses are also kept in memory, parsed,
+    with their metadata, so repeated lookups cost a ``stat`` of the body
+    (to notice other processes rewriting it) instead of reading,
+    decompressing and parsing it again. The memory tier is an LRU bounded by entry count and
+    by the total size of the response bodies. Bodies are returned as
+    read-only ``FrozenDict``s and ``FrozenList``s (see ``freeze``), since
+    every caller shares them.
+    
+    Caches written with the earlier flat layout (one file per endpoint,
+    named by replacing ``/``, ``?`` and ``=`` with ``_``) are migrated
+    entry by entry: the first lookup of an endpoint moves its old file into
+    the new layout. Since every endpoint starts with ``/``, only root files
+    starting with ``_`` are taken for such entries; other files kept next to
+    the cache (such as the catalog version) are left alone.
+    """
+    
+    FRESH = "fresh"
+    STALE = "stale"
+    EXPIRED = "expired"
+    
+    META_SUFFIX = ".meta.json"
+    SHARD_DIGITS = 2  # hex digits of the key naming an entry's subdirectory
+    DICTIONARY_DIR = "dictionaries"  # trained compression dictionaries, kept by ``clear``
+    MEMORY_ENTRIES = 2048  # responses kept in memory
+    MEMORY_BYTES = 8 << 20  # total JSON size of the responses kept in memory
+    
+    def __init__(
+        self,
+        cache_dir: str,
+        base_url: str = "",
+        ttls: Sequence[Tuple[str, float]] = (),
+        default_ttl: float = 86400,
+        stale_while_revalidate: float = 0,
+        clock: Callable[[], float] = time.time,
+        compression: str = "auto",
+        memory_entries: int = MEMORY_ENTRIES,
+        memory_bytes: int = MEMORY_BYTES
+    ):
+        """Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the cached responses
+            base_url: Prefix of the endpoints, hashed with them to form the
+                keys (responses of different hosts never mix)
+            ttls: (endpoint prefix, seconds) pairs; the first matching
+                prefix gives an endpoint's TTL
+            default_ttl: TTL of endpoints matching no prefix
+            stale_while_revalidate: Seconds past its TTL an entry may
+                still be served while it is refreshed in the background
+            clock: Wall-clock time source, replaceable for testing
+            compression: Codec of new entries: "zstd", "gzip", "none", or
+                "auto" for zstd when zstandard is installed and gzip otherwise
+            memory_entries: Maximum number of responses kept in memory
+                (0 disables the memory tier)
+            memory_bytes: Maximum total JSON size of the responses kept
+                in memory
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.ttls = tuple(ttls)
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.clock = clock
+        self._lock = threading.Lock()
+        
+        self.not_modified = 0  # Revalidations answered 304
+        self.refreshed = 0  # Entries replaced by a newer response
+        self.memory_hits = 0  # Reads answered from memory
+        self.memory_misses = 0
+        self.disk_hits = 0  # Reads answered from disk (memory tier missed)
+        self.disk_misses = 0  # Reads of uncached endpoints
+        
+        # Endpoint -> (frozen body, metadata, JSON size, body file stamp)
+        self.memory = None
+        if memory_entries > 0:
+            self.memory = LRUCache(capacity=memory_entries, max_weight=memory_bytes)
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.codec = CacheCodec(os.path.join(self.cache_dir, self.DICTIONARY_DIR), compression)
+    
+        # Files of the flat layout not migrated yet
+        self._legacy_files = {
+            entry.name for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and self._is_flat_entry(entry.name)
+        }
+    
+    def key(self, endpoint: str) -> str:
+        """Get the cache key of an endpoint: the SHA-256 of its full URL."""
+        return hashlib.sha256(f"{self.base_url}{endpoint}".encode("utf-8")).hexdigest()
+    
+    def path(self, endpoint: str) -> str:
+        """Get the file path of an endpoint's response body.
+        
+        An entry of the flat layout is moved to this path on first use.
+        """
+        key = self.key(endpoint)
+        path = os.path.join(self.cache_dir, key[:self.SHARD_DIGITS], f"{key}.json")
+        if self._legacy_files:
+            self._migrate(endpoint, path)
+        return path
+    
+    @staticmethod
+    def _is_flat_entry(name: str) -> bool:
+        """Check whether a file in the cache root is an entry of the flat layout."""
+        return name.startswith("_") and name.endswith(".json")
+    
+    def _meta_path(self, endpoint: str) -> str:
+        return self.path(endpoint)[:-len(".json")] + self.META_SUFFIX
+    
+    def _migrate(self, endpoint: str, path: str):
+        """Move an endpoint's entry from the flat layout to ``path``, if there is one."""
+        safe_name = endpoint.replace("/", "_").replace("?", "_").replace("=", "_")
+        names = (f"{safe_name}.json", f"{safe_name}{self.META_SUFFIX}")
+        # Checked again under the lock; most lookups have nothing to migrate
+        if names[0] not in self._legacy_files:
+            return
+        with self._lock:
+            if names[0] not in self._legacy_files:
+                return
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                for name, target in zip(names, (path, path[:-len(".json")] + self.META_SUFFIX)):
+                    if name in self._legacy_files:
+                        os.replace(os.path.join(self.cache_dir, name), target)
+                        self._legacy_files.discard(name)
+            except OSError as e:
+                self.logger.warning(f"Error migrating cache entry {names[0]}: {e}")
+                self._legacy_files.difference_update(names)
+                return
+        self.logger.debug(f"Migrated cache entry for: {endpoint}")
+    
+    def ttl(self, endpoint: str) -> float:
+        """Get the number of seconds a response for ``endpoint`` stays fresh."""
+        for prefix, ttl in self.ttls:
+            if endpoint.startswith(prefix):
+                return ttl
+        return self.default_ttl
+    
+    def exists(self, endpoint: str) -> bool:
+        """Check whether a response for ``endpoint`` is cached, whatever its age."""
+        return os.path.exists(self.path(endpoint))
+    
+    def read(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Read a cached response body, whatever its age.
+        
+        Returns:
+            The body, read-only, or None if it is not cached
+        """
+        if self.memory is not None:
+            entry = self._remembered(endpoint)
+            with self._lock:
+                if entry is not None:
+                    self.memory_hits += 1
+                    return entry[0]
+                self.memory_misses += 1
+        
+        cache_path = self.path(endpoint)
+        if not os.path.exists(cache_path):
+            with self._lock:
+                self.disk_misses += 1
+            return None
+        
+        try:
+            with open(cache_path, "rb") as f:
+                body = self.codec.decompress(f.read())
+            data = freeze(json.loads(body))
+        except Exception as e:
+            self.logger.warning(f"Error reading from cache: {e}")
+            return None
+    
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(endpoint, data, self.metadata(endpoint), len(body))
+        return data
+    
+    def write(self, endpoint: str, data: Dict[str, Any], headers: Optional[Mapping[str, str]] = None):
+        """Store a response body and its validators."""
+        try:
+            body = json.dumps(data).encode("utf-8")
+            with self._open_temp(endpoint) as f:
+                f.write(self.codec.compress(body))
+            meta = self.record_fetch(endpoint, headers)
+            self._remember(endpoint, freeze(data), meta, len(body))
+        except Exception as e:
+            self.logger.warning(f"Error saving to cache: {e}")
+    
+    def _stamp(self, endpoint: str) -> Optional[str]:
+        """Identify the current version of an endpoint's body file."""
+        try:
+            stat = os.stat(self.path(endpoint))
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def _remembered(self, endpoint: str) -> Optional[Tuple[Any, Dict[str, Any], int, str]]:
+        """Get the memory tier's entry for an endpoint if the body file has not changed since."""
+        if self.memory is None:
+            return None
+        entry = self.memory.peek(endpoint)
+        if entry is not None and entry[3] != self._stamp(endpoint):
+            self.memory.discard(endpoint)
+            return None
+        return entry
+    
+    def _remember(self, endpoint: str, data: Any, meta: Optional[Dict[str, Any]], size: int):
+        """Keep a body and its metadata in the memory tier."""
+        if self.memory is not None and meta is not None:
+            self.memory.set(endpoint, (data, meta, size, self._stamp(endpoint)), weight=size)
+    
+    @contextmanager
+    def writer(self, endpoint: str) -> Iterator[IO[bytes]]:
+        """Open a stream that compresses into a file replacing the endpoint's body on success.
+        
+        For bodies too large to hold in memory. If the block raises, the
+        partial file is removed and the cached body is left as it was.
+        Call ``record_fetch`` once it is in place.
+        """
+        if self.memory is not None:
+            self.memory.discard(endpoint)
+        with self._open_temp(endpoint) as f, self.codec.writer(f) as stream:
+            yield stream
+    
+    @contextmanager
+    def reader(self, endpoint: str) -> Iterator[IO[bytes]]:
+        """Open a cached body for streaming, decompressed.
+        
+        Raises:
+            OSError: If the endpoint is not cached
+        """
+        with open(self.path(endpoint), "rb") as f, self.codec.reader(f) as stream:
+            yield stream
+    
+    @contextmanager
+    def _open_temp(self, endpoint: str) -> Iterator[IO[bytes]]:
+        """Open a temporary file that replaces the endpoint's body on success."""
+        path = self.path(endpoint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _read_meta(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(endpoint), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def metadata(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Get an entry's fetch time and validators, or None if it is not cached."""
+        entry = self._remembered(endpoint)
+        if entry is not None:
+            return entry[1]
+        
+        meta = self._read_meta(endpoint)
+        if meta is not None:
+            return meta
+        
+        # Entries written before metadata was kept are aged by their file time
+        try:
+            return {"fetched_at": os.path.getmtime(self.path(endpoint))}
+        except OSError:
+            return None
+    
+    def record_fetch(
+        self,
+        endpoint: str,
+        headers: Optional[Mapping[str, str]] = None,
+        not_modified: bool = False
+    ) -> Dict[str, Any]:
+        """Mark an entry as fetched, or confirmed unchanged, now.
+        
+        Args:
+            endpoint: Endpoint whose body is cached
+            headers: Response headers; their ETag and Last-Modified
+                replace the stored validators (kept if absent, as a 304
+                need not repeat them)
+            not_modified: The server answered 304 to a revalidation
+        
+        Returns:
+            The entry's new metadata
+        """
+        meta = self._read_meta(endpoint)
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+            elif meta is not None:
+                self.refreshed += 1
+        
+        meta = meta or {}
+        meta["url"] = f"{self.base_url}{endpoint}"
+        meta["fetched_at"] = self.clock()
+        headers = headers or {}
+        for header, key in (("ETag", "etag"), ("Last-Modified", "last_modified")):
+            if headers.get(header):
+                meta[key] = headers[header]
+        
+        meta_path = self._meta_path(endpoint)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(meta_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(temp_path, meta_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        entry = self._remembered(endpoint)
+        if entry is not None:
+            self._remember(endpoint, entry[0], meta, entry[2])
+        return meta
+    
+    def state(self, endpoint: str) -> Optional[str]:
+        """Get the freshness of a cached entry (FRESH, STALE or EXPIRED), or None if absent."""
+        if not self.exists(endpoint):
+            return None
+        meta = self.metadata(endpoint)
+        if meta is None:
+            return None
+        
+        age = self.clock() - meta.get("fetched_at", 0)
+        ttl = self.ttl(endpoint)
+        if age < ttl:
+            return self.FRESH
+        if age < ttl + self.stale_while_revalidate:
+            return self.STALE
+        return self.EXPIRED
+    
+    def conditional_headers(self, endpoint: str) -> Dict[str, str]:
+        """Get the request headers that revalidate the cached entry."""
+        meta = self.metadata(endpoint) if self.exists(endpoint) else None
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+    
+    def remove(self, endpoint: str):
+        """Drop an entry."""
+        if self.memory is not None:
+            self.memory.discard(endpoint)
+        for path in (self.path(endpoint), self._meta_path(endpoint)):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def clear(self):
+        """Drop every entry, including those of the flat layout and unfinished writes."""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and len(entry.name) == self.SHARD_DIGITS:
+                shutil.rmtree(entry.path)
+            elif entry.is_file() and (entry.name.endswith(".tmp") or self._is_flat_entry(entry.name)):
+                os.remove(entry.path)
+        with self._lock:
+            self._legacy_files.clear()
+        if self.memory is not None:
+            self.memory.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit/miss statistics of each tier and the revalidation counts."""
+        memory = self.memory.stats() if self.memory is not None else {}
+        with self._lock:
+            return {
+                "memory": {
+                    "hits": self.memory_hits,
+                    "misses": self.memory_misses,
+                    "entries": memory.get("size", 0),
+                    "bytes": memory.get("weight", 0),
+                    "evictions": memory.get("evictions", 0)
+                },
+                "disk": {"hits": self.disk_hits, "misses": self.disk_misses},
+                "not_modified": self.not_modified,
+                "refreshed": self.refreshed
+            }
@@ -7,5 +7,6 @@ from yugioh_db_generator.cli.interface import (
     create_progress_bar,
     update_progress,
     show_results_summary,
+    show_aliases,
     confirm_action
 )
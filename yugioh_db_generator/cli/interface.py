@@ -4,7 +4,7 @@ import os
 import sys
 import time
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import tqdm
 
 from yugioh_db_generator import __version__
@@ -88,6 +88,45 @@ def show_results_summary(
     print(f"{'-'*60}\n")
 
 
+def show_aliases(aliases: Dict[str, Dict[str, Any]]):
+    """Show the learned name aliases.
+    
+    Args:
+        aliases: Mapping of normalized input names to alias entries
+    """
+    print(f"\n{'-'*60}")
+    print(f"  Learned Name Aliases ({len(aliases)})")
+    print(f"{'-'*60}")
+    for alias, entry in sorted(aliases.items()):
+        print(f"  {alias} -> {entry['name']}  [catalog {entry['catalog_version']}]")
+    print(f"{'-'*60}\n")
+
+
+def show_sync_report(report: Dict[str, Any]):
+    """Show the outcome of a catalog sync.
+    
+    Args:
+        report: Report returned by ``YGOPRODeckAPI.sync_catalog``
+    """
+    print(f"\n{'-'*60}")
+    print(f"  Catalog Sync: {report['status']} in {report['seconds']:.2f}s")
+    print(f"{'-'*60}")
+    print(f"  Database version: {report['previous_version'] or 'unknown'} -> {report['database_version'] or 'unknown'}")
+    for label in ("added", "removed", "changed"):
+        names = report[label]
+        print(f"  {label.capitalize()}: {len(names)}")
+        for name in sorted(names)[:20]:
+            print(f"    {name}")
+        if len(names) > 20:
+            print(f"    ... and {len(names) - 20} more")
+    for old_name, new_name in sorted(report['renamed'].items()):
+        print(f"  Renamed: {old_name} -> {new_name}")
+    for name, (old_status, new_status) in sorted(report['banlist'].items()):
+        print(f"  Banlist: {name}: {old_status} -> {new_status}")
+    print(f"  Snapshot rows rewritten: {report['snapshot_rows_written']}")
+    print(f"{'-'*60}\n")
+
+
 def confirm_action(prompt: str, default: bool = False) -> bool:
     """Ask for user confirmation before performing an action.
     
@@ -15,7 +15,7 @@ def create_parser():
     # Input/output options
     parser.add_argument(
         '--input', '-i',
-        help='Path to the input file containing card names (one per line)'
+        help='Path to the input file containing card names (one per line) or a YDK file'
     )
     
     parser.add_argument(
@@ -63,6 +63,49 @@ def create_parser():
         help='Clear the cache before running'
     )
     
+    parser.add_argument(
+        '--sync-catalog',
+        action='store_true',
+        help='Update the cached card catalog if the API database version changed, report the changes and exit'
+    )
+    
+    parser.add_argument(
+        '--offline-first',
+        action='store_true',
+        help='Resolve cards from the local catalog and only query the API on a catalog miss'
+    )
+    
+    # Learned alias options
+    parser.add_argument(
+        '--aliases-file',
+        help='File storing name corrections learned in earlier runs (aliases.json in --cache-dir if not given)'
+    )
+    
+    parser.add_argument(
+        '--no-aliases',
+        action='store_true',
+        help='Neither use nor learn name aliases'
+    )
+    
+    parser.add_argument(
+        '--list-aliases',
+        action='store_true',
+        help='List the learned name aliases and exit'
+    )
+    
+    parser.add_argument(
+        '--forget-alias',
+        action='append',
+        metavar='NAME',
+        help='Remove the learned alias of a card name and exit (can be used multiple times)'
+    )
+    
+    parser.add_argument(
+        '--prune-aliases',
+        action='store_true',
+        help='Remove learned aliases that no longer match a card in the catalog and exit'
+    )
+    
     # Advanced options
     parser.add_argument(
         '--similarity-threshold',
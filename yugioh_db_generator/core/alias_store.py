@@ -0,0 +1,142 @@
+"""Persistent store of learned card name aliases."""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+from yugioh_db_generator.utils.string_utils import normalize_card_name
+
+
+class AliasStore:
+    """Maps misspelled input names to the canonical names they resolved to.
+    
+    Keys are normalized input names, so spelling variants that only differ
+    in case, punctuation or spacing share one alias. Every alias is stamped
+    with the version of the card catalog it was learned against, which
+    lets stale aliases be found and pruned when the catalog changes.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the store, loading any aliases saved at ``path``.
+        
+        Args:
+            path: JSON file the aliases are persisted to (None keeps them in memory)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.aliases: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        
+        if path:
+            self.load()
+    
+    def load(self):
+        """Load the aliases from the store file, if it exists."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("format_version") != self.FORMAT_VERSION:
+                self.logger.warning(f"Ignoring alias store with unknown format: {self.path}")
+                return
+            with self._lock:
+                self.aliases = data.get("aliases", {})
+                self.dirty = False
+            self.logger.info(f"Loaded {len(self.aliases)} learned aliases from {self.path}")
+        except Exception as e:
+            self.logger.warning(f"Error loading alias store {self.path}: {e}")
+    
+    def save(self):
+        """Write the aliases to the store file if they changed."""
+        if not self.path or not self.dirty:
+            return
+        
+        with self._lock:
+            data = {"format_version": self.FORMAT_VERSION, "aliases": dict(self.aliases)}
+            self.dirty = False
+        
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a torn store
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            self.dirty = True
+            self.logger.warning(f"Error saving alias store {self.path}: {e}")
+    
+    def get(self, card_name: str) -> Optional[str]:
+        """Get the canonical name learned for an input name."""
+        with self._lock:
+            entry = self.aliases.get(normalize_card_name(card_name))
+        return entry["name"] if entry else None
+    
+    def add(self, card_name: str, canonical_name: str, catalog_version: Optional[str] = None):
+        """Learn that an input name resolves to a canonical card name.
+        
+        Args:
+            card_name: Name as it was entered
+            canonical_name: Catalog name it resolved to
+            catalog_version: Version of the catalog the match was made against
+        """
+        key = normalize_card_name(card_name)
+        if not key:
+            return
+        
+        entry = {"name": canonical_name, "catalog_version": catalog_version}
+        with self._lock:
+            if self.aliases.get(key) != entry:
+                self.aliases[key] = entry
+                self.dirty = True
+    
+    def remove(self, card_name: str) -> bool:
+        """Forget the alias of an input name.
+        
+        Returns:
+            True if an alias was removed
+        """
+        with self._lock:
+            removed = self.aliases.pop(normalize_card_name(card_name), None) is not None
+            self.dirty = self.dirty or removed
+        return removed
+    
+    def prune(self, card_names: Iterable[str], catalog_version: Optional[str] = None) -> int:
+        """Drop aliases whose canonical name is no longer in the catalog.
+        
+        The surviving aliases are re-stamped with ``catalog_version``.
+        
+        Args:
+            card_names: Every name in the current catalog
+            catalog_version: Version of the current catalog
+        
+        Returns:
+            Number of aliases removed
+        """
+        valid_names = set(card_names)
+        with self._lock:
+            stale = [key for key, entry in self.aliases.items() if entry["name"] not in valid_names]
+            for key in stale:
+                del self.aliases[key]
+            for entry in self.aliases.values():
+                if entry["catalog_version"] != catalog_version:
+                    entry["catalog_version"] = catalog_version
+                    self.dirty = True
+            self.dirty = self.dirty or bool(stale)
+        return len(stale)
+    
+    def items(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of every alias (normalized input name -> entry)."""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self.aliases.items()}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.aliases)
@@ -2,11 +2,12 @@
 
 import os
 import logging
-import time
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
 from yugioh_db_generator.api.card_api import YGOPRODeckAPI
+from yugioh_db_generator.core.alias_store import AliasStore
 from yugioh_db_generator.core.search_engine import CardSearchEngine
 from yugioh_db_generator.core.formatter import CardFormatter
 
@@ -22,7 +23,10 @@ class CardDatabaseGenerator:
         cache_dir: str = None,
         use_cache: bool = True,
         similarity_threshold: float = 0.7, 
-        rulings_db_path: str = "konami_rulings.json"
+        rulings_db_path: str = "konami_rulings.json",
+        offline_first: bool = False,
+        aliases_file: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None
     ):
         """Initialize the database generator.
         
@@ -33,20 +37,32 @@ class CardDatabaseGenerator:
             cache_dir: Directory to store cached API responses
             use_cache: Whether to use cached responses
             similarity_threshold: Minimum similarity score for fuzzy matching
+            offline_first: Resolve cards from the cached catalog and only
+                call the API for names the catalog cannot match
+            aliases_file: JSON file of name corrections learned across runs
+                (None to disable learned aliases)
+            progress_callback: Called with each distinct card name and its
+                card data (None if not found) as soon as the name is resolved
         """
         self.logger = logging.getLogger(__name__)
         
         self.output_file = output_file
         self.output_format = output_format
         self.max_workers = max_workers
+        self.progress_callback = progress_callback
         
         # Initialize API client
-        self.api_client = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=use_cache)
+        self.api_client = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=use_cache, max_workers=max_workers)
+        
+        # Load the aliases learned in earlier runs
+        self.alias_store = AliasStore(aliases_file) if aliases_file else None
         
         # Initialize search engine
         self.search_engine = CardSearchEngine(
             api_client=self.api_client,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            offline_first=offline_first,
+            alias_store=self.alias_store
         )
         
         # Initialize formatter
@@ -65,8 +81,12 @@ class CardDatabaseGenerator:
         """
         self.logger.info(f"Generating database for {len(deck_list)} cards")
         
-        # Clean up card names
-        deck_list = [name.strip() for name in deck_list if name.strip()]
+        # Clean up card names; repeated copies of a card are processed once
+        deck_list = list(dict.fromkeys(name.strip() for name in deck_list if name.strip()))
+        
+        # Resolve every distinct name in one batch so the per-card work below
+        # is answered from the search cache
+        self.search_engine.search_many(deck_list, max_workers=self.max_workers, progress=self.progress_callback)
         
         # Process cards (parallel or sequential)
         if self.max_workers > 1:
@@ -74,6 +94,61 @@ class CardDatabaseGenerator:
         else:
             self._sequential_process(deck_list)
         
+        self._finish()
+    
+    async def generate_database_async(self, deck_list: List[str], concurrency: int = 64) -> None:
+        """Generate a card database from a deck list on an asyncio event loop.
+        
+        Card lookups go through an ``AsyncYGOPRODeckAPI`` sharing this
+        generator's response cache, with at most ``concurrency`` lookups in
+        flight, so hundreds of names are resolved without a thread each.
+        
+        Args:
+            deck_list: List of card names to process
+            concurrency: Maximum number of concurrent lookups
+        """
+        self.logger.info(f"Generating database for {len(deck_list)} cards (async)")
+        
+        deck_list = list(dict.fromkeys(name.strip() for name in deck_list if name.strip()))
+        
+        async with AsyncYGOPRODeckAPI(
+            cache_dir=self.api_client.cache_dir,
+            use_cache=self.api_client.use_cache,
+            max_concurrency=concurrency,
+            rate_limiter=self.api_client.rate_limiter,
+            circuit_breaker=self.api_client.circuit_breaker,
+            # Count revalidations with the blocking client's and reuse the
+            # catalog the search engine already loaded
+            response_cache=self.api_client.response_cache,
+            catalog=self.api_client.catalog
+        ) as api_client:
+            await self.search_engine.search_many_async(
+                deck_list, api_client, concurrency=concurrency, progress=self.progress_callback
+            )
+        self.logger.info(f"Coalesced async API requests: {api_client.coalesced_requests()}")
+        
+        # Every name is now answered from the search cache; only formatting is left
+        for i, card_name in enumerate(deck_list):
+            try:
+                self._process_card(card_name, i+1, len(deck_list))
+            except Exception as e:
+                self.logger.error(f"Error processing card '{card_name}': {e}")
+        
+        self._finish()
+    
+    def _finish(self) -> None:
+        """Persist what the run learned and write the database."""
+        self.logger.info(f"Search cache statistics: {self.search_engine.get_cache_stats()}")
+        self.logger.info(f"Rate limiter statistics: {self.api_client.rate_limiter.stats()}")
+        self.logger.info(f"Circuit breaker statistics: {self.api_client.circuit_breaker.stats()}")
+        self.logger.info(f"Coalesced API requests: {self.api_client.coalesced_requests()}")
+        if self.api_client.response_cache is not None:
+            self.logger.info(f"Response cache statistics: {self.api_client.response_cache.stats()}")
+        
+        # Persist the corrections learned in this run
+        if self.alias_store is not None:
+            self.alias_store.save()
+        
         # Format and save the database
         self._save_database()
         
@@ -104,8 +179,6 @@ class CardDatabaseGenerator:
         for i, card_name in enumerate(deck_list):
             try:
                 self._process_card(card_name, i+1, len(deck_list))
-                # Small delay to avoid hammering the API
-                time.sleep(0.05)
             except Exception as e:
                 self.logger.error(f"Error processing card '{card_name}': {e}")
     
@@ -154,6 +227,26 @@ class CardDatabaseGenerator:
         with open(self.output_file, 'w', encoding='utf-8') as f:
             f.write(content)
     
+    def prune_aliases(self) -> int:
+        """Drop learned aliases that no longer match a card in the catalog.
+        
+        Returns:
+            Number of aliases removed
+        """
+        if self.alias_store is None:
+            return 0
+        if not self.search_engine.all_card_names:
+            self.logger.warning("Card catalog unavailable; not pruning aliases")
+            return 0
+        
+        removed = self.alias_store.prune(
+            self.search_engine.all_card_names,
+            self.search_engine.catalog_version
+        )
+        self.alias_store.save()
+        self.logger.info(f"Pruned {removed} stale aliases, {len(self.alias_store)} remain")
+        return removed
+    
     def get_name_corrections(self) -> Dict[str, str]:
         """Get the mapping of original card names to corrected ones.
         
@@ -1,27 +1,72 @@
 """Advanced search engine for finding Yu-Gi-Oh! cards with fuzzy matching."""
 
 import re
+import asyncio
+import bisect
 import difflib
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import Levenshtein
 
+from yugioh_db_generator.core.alias_store import AliasStore
+from yugioh_db_generator.index.bk_tree import BKTree
+from yugioh_db_generator.index.name_index import CardNameIndex
+from yugioh_db_generator.index.substring_index import SubstringIndex
+from yugioh_db_generator.index.token_index import TokenIndex
+from yugioh_db_generator.index.vector_scorer import NgramVectorScorer
+from yugioh_db_generator.utils.cache_utils import LRUCache
+from yugioh_db_generator.utils.string_utils import normalize_card_name
+
 
 class CardSearchEngine:
     """Advanced search engine for Yu-Gi-Oh! cards."""
     
-    def __init__(self, api_client, similarity_threshold: float = 0.7):
+    FUZZY_TOP_K = 5  # candidates taken from the fuzzy index per spelling
+    MAX_EDIT_DISTANCE = 3  # upper bound on the fuzzy index edit budget
+    NEGATIVE_CACHE_TTL = 60.0  # seconds a miss is cached; it may stem from an API outage
+    
+    def __init__(
+        self, 
+        api_client, 
+        similarity_threshold: float = 0.7, 
+        use_vector_scorer: bool = True,
+        offline_first: bool = False,
+        cache_size: int = 4096,
+        cache_ttl: Optional[float] = None,
+        alias_store: Optional[AliasStore] = None,
+        negative_cache_ttl: Optional[float] = NEGATIVE_CACHE_TTL
+    ):
         """Initialize the search engine.
         
         Args:
             api_client: API client for fetching card data
             similarity_threshold: Minimum similarity score (0-1) for fuzzy matches
+            use_vector_scorer: Whether to rank the whole catalog with the
+                vectorized n-gram scorer when the other stages miss
+                (requires numpy and scipy)
+            offline_first: Resolve names entirely from the loaded catalog and
+                only call the API when the catalog has no match
+            cache_size: Maximum number of search results (hits and misses) to cache
+            cache_ttl: Seconds a cached search result stays valid (None for no expiry)
+            alias_store: Store of corrections learned in earlier runs; it is
+                consulted before any fuzzy stage and learns new corrections
+            negative_cache_ttl: Seconds a cached miss stays valid, kept short
+                since a failed API lookup is indistinguishable from an unknown
+                name (None to keep misses as long as hits)
         """
         self.logger = logging.getLogger(__name__)
         self.api_client = api_client
         self.similarity_threshold = similarity_threshold
-        self.card_cache = {}
+        self.use_vector_scorer = use_vector_scorer
+        self.offline_first = offline_first
+        self.card_cache = LRUCache(capacity=cache_size, ttl=cache_ttl, negative_ttl=negative_cache_ttl)
         self.correction_map = {}  # Maps original names to corrected ones
+        self._correction_lock = threading.Lock()
+        self.alias_store = alias_store
         
         # Initialize the local card database
         self._load_card_database()
@@ -30,11 +75,55 @@ class CardSearchEngine:
         """Load the full card database for local searching."""
         self.all_cards = self.api_client.get_all_cards()
         self.all_card_names = [card['name'] for card in self.all_cards] if self.all_cards else []
+        self.catalog_version = self._catalog_fingerprint(self.all_cards or [])
+        
+        # Build the name/ID hash indexes so resolved names map to cards in O(1)
+        self.name_index = CardNameIndex()
+        self.name_index.build(self.all_cards or [])
+        
+        # Sorted lowercase names for prefix lookups by bisection
+        self.sorted_lower_names = sorted(
+            (name.lower(), position) for position, name in enumerate(self.all_card_names)
+        )
+        
+        # Trigram index for local partial-name (substring) searches
+        self.substring_index = SubstringIndex()
+        self.substring_index.build(self.all_card_names)
+        
+        # Build the token index once so token search only visits cards sharing a token
+        self.token_index = TokenIndex()
+        self.token_index.build(self.all_card_names)
+        
+        # Build the fuzzy (BK-tree) index over normalized names; several
+        # catalog names can share one normalized form
+        self.normalized_positions = defaultdict(list)
+        for position, name in enumerate(self.all_card_names):
+            self.normalized_positions[normalize_card_name(name)].append(position)
+        self.fuzzy_index = BKTree()
+        self.fuzzy_index.build(self.normalized_positions)
+        
+        # Optionally encode every name into a sparse n-gram matrix for whole-catalog ranking
+        self.vector_scorer = None
+        if self.use_vector_scorer and self.all_card_names:
+            if NgramVectorScorer.is_available():
+                self.vector_scorer = NgramVectorScorer()
+                self.vector_scorer.build(self.all_card_names)
+            else:
+                self.logger.debug("numpy/scipy not installed; vectorized scoring disabled")
+        
         self.logger.info(f"Loaded {len(self.all_cards)} cards into search engine")
     
+    def _catalog_fingerprint(self, cards: List[Dict[str, Any]]) -> str:
+        """Get a short hash identifying the contents of the card catalog."""
+        digest = hashlib.sha1()
+        for card in cards:
+            digest.update(f"{card.get('id')}:{card['name']}\n".encode('utf-8'))
+        return digest.hexdigest()[:16]
+    
     def get_name_corrections(self) -> Dict[str, str]:
         """Get the mapping of original card names to corrected ones."""
-        return self.correction_map
+        with self._correction_lock:
+            return dict(self.correction_map)
     
     def search(self, card_name: str) -> Optional[Dict[str, Any]]:
         """Search for a card using multiple methods.
@@ -45,49 +134,299 @@ class CardSearchEngine:
         Returns:
             Card data if found, None otherwise
         """
-        # Check the cache first
-        if card_name in self.card_cache:
-            return self.card_cache[card_name]
+        # Check the cache first; concurrent searches for one name run once
+        # and misses are cached too
+        return self.card_cache.get_or_compute(card_name, lambda: self._resolve(card_name))
+    
+    def search_many(
+        self,
+        card_names: List[str],
+        max_workers: int = 1,
+        progress: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Search for a batch of cards, resolving each distinct name once.
         
-        # Try exact match
-        card_data = self._exact_match(card_name)
-        if card_data:
-            self.card_cache[card_name] = card_data
-            return card_data
+        Names are stripped and deduplicated. Exact hits are resolved in one
+        pass over the catalog index, the correction strategies only run on
+        what remains, and exact API lookups are batched into as few
+        requests as possible.
         
-        # Try fuzzy API search
-        card_data = self._fuzzy_api_search(card_name)
-        if card_data:
-            self.card_cache[card_name] = card_data
-            self._record_correction(card_name, card_data['name'])
-            return card_data
+        Args:
+            card_names: Names of the cards to search for
+            max_workers: Number of threads used for the correction strategies
+            progress: Called with each distinct name and its card data (or
+                None) as soon as the name is resolved
+            
+        Returns:
+            Card data (or None) for each input name, in input order
+        """
+        names, resolved, pending, settle = self._start_batch(card_names, progress)
+        
+        offline = self.offline_first and bool(self.all_card_names)
+        
+        # Exact hits and learned aliases in one pass over the catalog index,
+        # then one batch for the API
+        for name in pending:
+            resolved[name] = self.name_index.get_by_name(name)
+        remaining = settle(pending)
+        for name in remaining:
+            resolved[name] = self._alias_match(name)
+        remaining = settle(remaining)
+        if remaining and not offline:
+            resolved.update(self._api_exact_matches(remaining))
+            remaining = settle(remaining)
         
-        # Try local fuzzy match
-        card_data = self._local_fuzzy_search(card_name)
+        # Correction strategies on what remains; the vector stage runs as one batch
+        strategies = [
+            strategy for strategy in self._correction_strategies(offline)
+            if strategy != self._vector_search
+        ]
+        if max_workers > 1 and len(remaining) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                matches = list(executor.map(lambda name: self._try_strategies(name, strategies), remaining))
+        else:
+            matches = [self._try_strategies(name, strategies) for name in remaining]
+        resolved.update(zip(remaining, matches))
+        remaining = settle(remaining)
+        
+        for name, card_data in self._vector_search_many(remaining).items():
+            resolved[name] = card_data
+            self._record_correction(name, card_data['name'])
+        remaining = settle(remaining)
+        
+        # In offline-first mode the API is only used for catalog misses
+        if remaining and offline:
+            self.logger.info(f"{len(remaining)} catalog misses, falling back to the API")
+            resolved.update(self._api_exact_matches(remaining))
+            remaining = settle(remaining)
+            for name in remaining:
+                resolved[name] = self._try_strategies(name, [self._fuzzy_api_search])
+        
+        return self._finish_batch(names, resolved, pending, progress)
+    
+    def _start_batch(
+        self,
+        card_names: List[str],
+        progress: Optional[Callable]
+    ) -> Tuple[List[str], Dict[str, Any], List[str], Callable[[List[str]], List[str]]]:
+        """Set up a batch search: strip the names and answer what the search cache can.
+        
+        Returns:
+            The stripped names, the distinct names mapped to their cached
+            results, the distinct names still to resolve, and a ``settle``
+            function that reports the given names that are now resolved to
+            ``progress`` and returns the others
+        """
+        names = [name.strip() for name in card_names]
+        missing = object()
+        resolved = {}
+        for name in dict.fromkeys(names):
+            if name:
+                resolved[name] = self.card_cache.get(name, missing)
+        pending = [name for name, card_data in resolved.items() if card_data is missing]
+        if progress is not None:
+            for name, card_data in resolved.items():
+                if card_data is not missing:
+                    progress(name, card_data)
+        
+        def settle(batch: List[str]) -> List[str]:
+            unresolved = []
+            for name in batch:
+                if not resolved[name]:
+                    unresolved.append(name)
+                elif progress is not None:
+                    progress(name, resolved[name])
+            return unresolved
+        
+        return names, resolved, pending, settle
+    
+    def _finish_batch(
+        self,
+        names: List[str],
+        resolved: Dict[str, Any],
+        pending: List[str],
+        progress: Optional[Callable]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Cache the results of a batch search and report its misses."""
+        for name in pending:
+            if not resolved[name]:
+                resolved[name] = None
+                self.logger.warning(f"No card found for: {name}")
+                if progress is not None:
+                    progress(name, None)
+            self.card_cache.set(name, resolved[name])
+        
+        return [resolved[name] if name else None for name in names]
+    
+    async def search_async(self, card_name: str, api_client) -> Optional[Dict[str, Any]]:
+        """Search for a card without blocking the event loop.
+        
+        Args:
+            card_name: The name of the card to search for
+            api_client: ``AsyncYGOPRODeckAPI`` used for the network lookups
+            
+        Returns:
+            Card data if found, None otherwise
+        """
+        return (await self.search_many_async([card_name], api_client))[0]
+    
+    async def search_many_async(
+        self,
+        card_names: List[str],
+        api_client,
+        concurrency: int = 32,
+        progress: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Search for a batch of cards without blocking the event loop.
+        
+        Follows ``search_many``: distinct names are resolved once, exact hits
+        and learned aliases come from the catalog, and the remaining exact
+        lookups are batched through the async client. The correction
+        strategies are CPU-bound once the catalog is loaded, so they run in
+        the default executor with at most ``concurrency`` names in flight.
+        
+        Args:
+            card_names: Names of the cards to search for
+            api_client: ``AsyncYGOPRODeckAPI`` used for the network lookups
+            concurrency: Maximum number of names being corrected at once
+            progress: Called with each distinct name and its card data (or
+                None) as soon as the name is resolved
+            
+        Returns:
+            Card data (or None) for each input name, in input order
+        """
+        names, resolved, pending, settle = self._start_batch(card_names, progress)
+        
+        offline = self.offline_first and bool(self.all_card_names)
+        
+        for name in pending:
+            resolved[name] = self.name_index.get_by_name(name) or self._alias_match(name)
+        remaining = settle(pending)
+        if remaining and not offline:
+            resolved.update(await self._api_exact_matches_async(remaining, api_client))
+            remaining = settle(remaining)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def correct(name):
+            async with semaphore:
+                card_data = await loop.run_in_executor(
+                    None, self._try_strategies, name, self._correction_strategies(offline)
+                )
+                if card_data or not offline:
+                    return card_data
+                
+                # In offline-first mode the API is only used for catalog misses
+                self.logger.info(f"Catalog miss for '{name}', falling back to the API")
+                card_data = await self._api_exact_match_async(name, api_client)
+                if card_data:
+                    return card_data
+                return await loop.run_in_executor(
+                    None, self._try_strategies, name, [self._fuzzy_api_search]
+                )
+        
+        matches = await asyncio.gather(*(correct(name) for name in remaining))
+        resolved.update(zip(remaining, matches))
+        settle(remaining)
+        
+        return self._finish_batch(names, resolved, pending, progress)
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction statistics of the search cache."""
+        return self.card_cache.stats()
+    
+    def _resolve(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a card name by trying each search method in turn."""
+        offline = self.offline_first and bool(self.all_card_names)
+        
+        # Try exact match, then the aliases learned in earlier runs
+        card_data = self._local_exact_match(card_name) or self._alias_match(card_name)
         if card_data:
-            self.card_cache[card_name] = card_data
-            self._record_correction(card_name, card_data['name'])
             return card_data
         
-        # Try token-based search
-        card_data = self._token_search(card_name)
+        if not offline:
+            card_data = self._api_exact_match(card_name)
+            if card_data:
+                return card_data
+        
+        # Try each correction strategy in order
+        card_data = self._try_strategies(card_name, self._correction_strategies(offline))
         if card_data:
-            self.card_cache[card_name] = card_data
-            self._record_correction(card_name, card_data['name'])
             return card_data
         
+        # In offline-first mode the API is only used on a catalog miss
+        if offline:
+            self.logger.info(f"Catalog miss for '{card_name}', falling back to the API")
+            
+            card_data = self._api_exact_match(card_name)
+            if card_data:
+                return card_data
+            
+            card_data = self._try_strategies(card_name, [self._fuzzy_api_search])
+            if card_data:
+                return card_data
+        
         # No matches found
         self.logger.warning(f"No card found for: {card_name}")
         return None
     
+    def _try_strategies(self, card_name: str, strategies: List) -> Optional[Dict[str, Any]]:
+        """Return the first correction found by the strategies, recording it."""
+        for strategy in strategies:
+            card_data = strategy(card_name)
+            if card_data:
+                self._record_correction(card_name, card_data['name'])
+                return card_data
+        return None
+    
+    def _correction_strategies(self, offline: bool) -> List:
+        """Get the fuzzy strategies to try, in order, after the exact match misses."""
+        local_strategies = [self._local_fuzzy_search, self._token_search, self._vector_search]
+        if offline:
+            return [self._prefix_search, self._fuzzy_local_search] + local_strategies
+        return [self._fuzzy_api_search] + local_strategies
+    
     def _record_correction(self, original: str, corrected: str):
-        """Record a name correction for reporting."""
+        """Record a name correction for reporting and learn it as an alias."""
         if original != corrected:
-            self.correction_map[original] = corrected
+            with self._correction_lock:
+                self.correction_map[original] = corrected
             self.logger.info(f"Corrected: '{original}' -> '{corrected}'")
+            
+            # Only names the catalog can resolve are worth remembering
+            if self.alias_store is not None and corrected in self.name_index:
+                self.alias_store.add(original, corrected, self.catalog_version)
+    
+    def _alias_match(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a name through the aliases learned in earlier runs."""
+        if self.alias_store is None:
+            return None
+        
+        canonical_name = self.alias_store.get(card_name)
+        if not canonical_name:
+            return None
+        
+        card_data = self.name_index.get_by_name(canonical_name)
+        if not card_data:
+            # The card left the catalog (or was renamed); forget the alias
+            if self.all_card_names:
+                self.alias_store.remove(card_name)
+            return None
+        
+        self.logger.info(f"Found learned alias for: {card_name}")
+        self._record_correction(card_name, card_data['name'])
+        return card_data
+    
+    def _local_exact_match(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Try to find an exact (case-insensitive) match in the local catalog."""
+        card_data = self.name_index.get_by_name(card_name)
+        if card_data:
+            self.logger.info(f"Found exact match in local catalog for: {card_name}")
+        return card_data
     
-    def _exact_match(self, card_name: str) -> Optional[Dict[str, Any]]:
-        """Try to find an exact match for a card name."""
+    def _api_exact_match(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Try to find an exact match for a card name through the API."""
         try:
             card_data = self.api_client.get_card_by_name(card_name)
             if card_data:
@@ -98,19 +437,98 @@ class CardSearchEngine:
         
         return None
     
+    def _api_exact_matches(self, card_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up several exact names through the API in batched requests."""
+        try:
+            matches = self.api_client.get_cards_by_names(card_names)
+            self.logger.info(f"Found {len(matches)} of {len(card_names)} exact matches through the API")
+            return matches
+        except Exception as e:
+            self.logger.warning(f"Error in batched exact match: {e}")
+            return {}
+    
+    async def _api_exact_match_async(self, card_name: str, api_client) -> Optional[Dict[str, Any]]:
+        """Try to find an exact match for a card name through the async API client."""
+        try:
+            card_data = await api_client.get_card_by_name_async(card_name)
+            if card_data:
+                self.logger.info(f"Found exact match for: {card_name}")
+                return card_data
+        except Exception as e:
+            self.logger.warning(f"Error in exact match: {e}")
+        
+        return None
+    
+    async def _api_exact_matches_async(self, card_names: List[str], api_client) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up several exact names through the async API client in batched requests."""
+        try:
+            matches = await api_client.get_cards_by_names_async(card_names)
+            self.logger.info(f"Found {len(matches)} of {len(card_names)} exact matches through the API")
+            return matches
+        except Exception as e:
+            self.logger.warning(f"Error in batched exact match: {e}")
+            return {}
+    
+    def _prefix_search(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Match a truncated name that is a prefix of exactly one catalog name."""
+        prefix = card_name.strip().lower()
+        if len(prefix) < 4:
+            return None
+        
+        start = bisect.bisect_left(self.sorted_lower_names, (prefix, -1))
+        matches = []
+        for name, position in self.sorted_lower_names[start:start + 2]:
+            if not name.startswith(prefix):
+                break
+            matches.append(position)
+        
+        if len(matches) != 1:
+            return None
+        
+        best_card = self.all_cards[matches[0]]
+        self.logger.info(f"Prefix match for '{card_name}': '{best_card['name']}'")
+        return best_card
+    
+    def _substring_search(self, query: str) -> List[Dict[str, Any]]:
+        """Find catalog cards whose name contains the query (case-insensitive)."""
+        return [self.all_cards[position] for position in self.substring_index.search(query)]
+    
     def _fuzzy_api_search(self, card_name: str) -> Optional[Dict[str, Any]]:
         """Search for a card using the API's partial search functionality."""
+        return self._fuzzy_partial_search(card_name, self.api_client.search_cards, "API")
+    
+    def _fuzzy_local_search(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Search for a card using partial name queries against the local catalog."""
+        return self._fuzzy_partial_search(card_name, self._substring_search, "catalog")
+    
+    def _fuzzy_partial_search(self, card_name: str, search_cards, source: str) -> Optional[Dict[str, Any]]:
+        """Score the results of several partial-name searches against the card name.
+        
+        Args:
+            card_name: The name of the card to search for
+            search_cards: Callable returning the cards matching a partial name
+            source: Label used in log messages
+            
+        Returns:
+            The most similar card above the threshold, None otherwise
+        """
         try:
             # Generate multiple search queries
             search_queries = self._generate_search_queries(card_name)
             
             best_match = None
             best_similarity = 0
+            query_profile = self._similarity_profile(card_name)
             
             for query in search_queries:
-                results = self.api_client.search_cards(query)
+                results = search_cards(query)
                 
                 for card in results:
+                    # Skip cards whose similarity cannot beat the current best
+                    bound = self._similarity_upper_bound(query_profile, card['name'])
+                    if bound <= best_similarity or bound < self.similarity_threshold:
+                        continue
+                    
                     # Calculate similarity using Levenshtein distance
                     similarity = self._calculate_similarity(card_name, card['name'])
                     
@@ -120,13 +538,13 @@ class CardSearchEngine:
             
             if best_match:
                 self.logger.info(
-                    f"Fuzzy API match for '{card_name}': '{best_match['name']}' "
+                    f"Fuzzy {source} match for '{card_name}': '{best_match['name']}' "
                     f"(similarity: {best_similarity:.2f})"
                 )
                 return best_match
                 
         except Exception as e:
-            self.logger.warning(f"Error in fuzzy API search: {e}")
+            self.logger.warning(f"Error in fuzzy {source} search: {e}")
         
         return None
     
@@ -168,34 +586,53 @@ class CardSearchEngine:
         return list(set(queries))  # Remove duplicates
     
     def _local_fuzzy_search(self, card_name: str) -> Optional[Dict[str, Any]]:
-        """Try to find a match using local fuzzy string matching."""
+        """Try to find a match using the local fuzzy name index.
+        
+        Every alternative spelling is looked up in the BK-tree within an edit
+        budget, and only the few candidates it returns are reranked with
+        the full similarity score.
+        """
         if not self.all_card_names:
             return None
-            
-        # Generate alternative spellings
-        alternatives = self._generate_alternative_spellings(card_name)
         
-        for alt in alternatives:
-            # Use difflib's get_close_matches for fuzzy matching
-            matches = difflib.get_close_matches(
-                alt, self.all_card_names, n=1, cutoff=self.similarity_threshold
-            )
+        # Generate alternative spellings (many collapse to the same normalized form)
+        candidates = {}
+        searched = set()
+        for alt in self._generate_alternative_spellings(card_name):
+            normalized = normalize_card_name(alt)
+            if not normalized or normalized in searched:
+                continue
+            searched.add(normalized)
             
-            if matches:
-                best_match = matches[0]
-                # Calculate similarity for reporting
-                similarity = self._calculate_similarity(card_name, best_match)
-                self.logger.info(
-                    f"Local fuzzy match for '{card_name}': '{best_match}' "
-                    f"(similarity: {similarity:.2f}, using: '{alt}')"
-                )
-                
-                # Find the corresponding card data
-                for card in self.all_cards:
-                    if card['name'] == best_match:
-                        return card
+            matches = self.fuzzy_index.search(
+                normalized, self._edit_budget(normalized), limit=self.FUZZY_TOP_K
+            )
+            for _, match in matches:
+                for position in self.normalized_positions[match]:
+                    candidates.setdefault(position, alt)
         
-        return None
+        if not candidates:
+            return None
+        
+        # Rerank the candidates with the full similarity score
+        similarity, position = max(
+            (self._calculate_similarity(card_name, self.all_card_names[position]), position)
+            for position in candidates
+        )
+        if similarity < self.similarity_threshold:
+            return None
+        
+        best_match = self.all_card_names[position]
+        self.logger.info(
+            f"Local fuzzy match for '{card_name}': '{best_match}' "
+            f"(similarity: {similarity:.2f}, using: '{candidates[position]}')"
+        )
+        return self.all_cards[position]
+    
+    def _edit_budget(self, normalized_name: str) -> int:
+        """Get the maximum edit distance allowed for a fuzzy lookup."""
+        budget = int(len(normalized_name) * (1 - self.similarity_threshold))
+        return max(1, min(self.MAX_EDIT_DISTANCE, budget))
     
     def _generate_alternative_spellings(self, card_name: str) -> List[str]:
         """Generate alternative spellings for the card name."""
@@ -227,44 +664,90 @@ class CardSearchEngine:
         tokens = re.findall(r'\b\w+\b', card_name)
         if len(tokens) < 2 or not self.all_cards:
             return None
-            
-        # Score each card based on token matches and semantic similarity
-        candidates = []
         
-        for card in self.all_cards:
-            card_name_lower = card['name'].lower()
-            # Tokenize card name
-            card_tokens = set(re.findall(r'\b\w+\b', card_name_lower))
+        # Only cards that share at least one token are candidates
+        token_scores = self.token_index.score(tokens)
+        if not token_scores:
+            return None
+        
+        card_name_lower = card_name.lower()
+        query_profile = self._similarity_profile(card_name)
+        best = None  # (score, similarity, position)
+        
+        # Visit candidates with the most matching token weight first. A card's
+        # similarity adds at most 10 to its score, so once the token weight can
+        # no longer reach the best score the remaining candidates are skipped.
+        for position, matching_tokens in sorted(
+            token_scores.items(), key=lambda item: item[1], reverse=True
+        ):
+            if best and matching_tokens + 10 < best[0]:
+                break
             
-            # Count matching tokens
-            matching_tokens = 0
-            for token in tokens:
-                if token.lower() in card_tokens:
-                    # Give higher weight to longer tokens
-                    matching_tokens += len(token)
+            # Skip cards whose similarity bound cannot lift them past the best
+            name = self.all_card_names[position]
+            if best and matching_tokens + 10 * self._similarity_upper_bound(query_profile, name) < best[0]:
+                continue
             
-            # Calculate overall similarity
-            similarity = self._calculate_similarity(card_name.lower(), card_name_lower)
+            similarity = self._calculate_similarity(
+                card_name_lower, name.lower()
+            )
             
             # Combined score: token matches + similarity
-            if matching_tokens > 0 or similarity > self.similarity_threshold / 2:
-                score = matching_tokens + (similarity * 10)
-                candidates.append((score, similarity, card))
-        
-        # Sort by score (highest first)
-        candidates.sort(reverse=True)
+            score = matching_tokens + (similarity * 10)
+            if best is None or (score, similarity) > best[:2]:
+                best = (score, similarity, position)
         
         # Return best candidate if good enough
-        if candidates and candidates[0][1] >= self.similarity_threshold / 1.5:  # Lower threshold for token search
-            best_card = candidates[0][2]
+        if best[1] >= self.similarity_threshold / 1.5:  # Lower threshold for token search
+            best_card = self.all_cards[best[2]]
             self.logger.info(
                 f"Token search match for '{card_name}': '{best_card['name']}' "
-                f"(similarity: {candidates[0][1]:.2f})"
+                f"(similarity: {best[1]:.2f})"
             )
             return best_card
             
         return None
     
+    def _vector_search(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Rank the whole catalog by n-gram cosine and rerank the top candidates."""
+        if self.vector_scorer is None:
+            return None
+        
+        candidates = self.vector_scorer.top_k(card_name, self.FUZZY_TOP_K)
+        return self._rerank_vector_candidates(card_name, candidates)
+    
+    def _vector_search_many(self, card_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Run the vector stage for a batch of names with one sparse matrix product."""
+        if self.vector_scorer is None or not card_names:
+            return {}
+        
+        matches = {}
+        ranked = self.vector_scorer.top_k_many(card_names, self.FUZZY_TOP_K)
+        for card_name, candidates in zip(card_names, ranked):
+            card_data = self._rerank_vector_candidates(card_name, candidates)
+            if card_data:
+                matches[card_name] = card_data
+        return matches
+    
+    def _rerank_vector_candidates(self, card_name: str, candidates: List[Tuple[int, float]]) -> Optional[Dict[str, Any]]:
+        """Pick the vector candidate with the best full similarity, if good enough."""
+        if not candidates:
+            return None
+        
+        similarity, position = max(
+            (self._calculate_similarity(card_name, self.all_card_names[position]), position)
+            for position, _ in candidates
+        )
+        if similarity < self.similarity_threshold:
+            return None
+        
+        best_card = self.all_cards[position]
+        self.logger.info(
+            f"Vector match for '{card_name}': '{best_card['name']}' "
+            f"(similarity: {similarity:.2f})"
+        )
+        return best_card
+    
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate the similarity between two strings.
         
@@ -287,3 +770,43 @@ class CardSearchEngine:
         
         # Return weighted average of the ratios
         return (standard_ratio * 0.4) + (lev_ratio * 0.3) + (token_ratio * 0.3)
+    
+    def _similarity_profile(self, text: str) -> Tuple[Counter, Counter]:
+        """Get the character profile of a string used by the similarity bound.
+        
+        Returns the character counts of the lowercased string and of its
+        whitespace-normalized form (the string the token ratio compares).
+        """
+        lowered = text.lower()
+        return Counter(lowered), Counter(' '.join(lowered.split()))
+    
+    def _similarity_upper_bound(self, query_profile: Tuple[Counter, Counter], name: str) -> float:
+        """Get a cheap upper bound on _calculate_similarity(query, name).
+        
+        Every matching block found by SequenceMatcher and every unedited
+        character in a Levenshtein alignment pairs up equal characters, so
+        each ratio is bounded by the overlap of the two character multisets.
+        A candidate whose bound is below a cutoff can never reach it and
+        does not need the full similarity.
+        
+        Args:
+            query_profile: Profile of the query from _similarity_profile
+            name: Candidate card name
+            
+        Returns:
+            A value that is never below the real similarity
+        """
+        query_chars, query_joined = query_profile
+        name_chars, name_joined = self._similarity_profile(name)
+        
+        len1, len2 = sum(query_chars.values()), sum(name_chars.values())
+        overlap = sum((query_chars & name_chars).values())
+        standard_bound = 2 * overlap / (len1 + len2) if len1 + len2 else 1.0
+        lev_bound = overlap / max(len1, len2) if len1 or len2 else 1.0
+        
+        len1, len2 = sum(query_joined.values()), sum(name_joined.values())
+        overlap = sum((query_joined & name_joined).values())
+        token_bound = 2 * overlap / (len1 + len2) if len1 + len2 else 1.0
+        
+        # Small margin so float rounding can never prune an exact tie
+        return (standard_bound * 0.4) + (lev_bound * 0.3) + (token_bound * 0.3) + 1e-9
@@ -0,0 +1,6 @@
+"""In-memory indexes over the card catalog used for fast name resolution."""
+
+from yugioh_db_generator.index.token_index import TokenIndex
+from yugioh_db_generator.index.name_index import CardNameIndex
+from yugioh_db_generator.index.bk_tree import BKTree
+from yugioh_db_generator.index.substring_index import SubstringIndex
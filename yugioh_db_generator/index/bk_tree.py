@@ -0,0 +1,86 @@
+"""BK-tree over normalized card names for bounded edit-distance lookups."""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import Levenshtein
+
+
+class BKTree:
+    """Metric tree keyed on Levenshtein distance.
+    
+    Each node stores a word and its children keyed by their distance to
+    that word. The triangle inequality lets a query skip every subtree
+    whose edge distance lies outside ``[d - max_distance, d + max_distance]``.
+    The tree is read-only once built, so a single instance can be shared
+    between threads.
+    """
+    
+    def __init__(self, distance: Callable[[str, str], int] = Levenshtein.distance):
+        """Initialize an empty tree.
+        
+        Args:
+            distance: Metric used to compare words
+        """
+        self.distance = distance
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+    
+    def add(self, word: str):
+        """Insert a word into the tree (duplicates are ignored)."""
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        
+        node = self.root
+        while True:
+            node_word, children = node
+            dist = self.distance(word, node_word)
+            if dist == 0:
+                return
+            child = children.get(dist)
+            if child is None:
+                children[dist] = (word, {})
+                self.size += 1
+                return
+            node = child
+    
+    def build(self, words: Iterable[str]):
+        """Rebuild the tree from a collection of words."""
+        self.root = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+    
+    def search(self, word: str, max_distance: int, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+        """Find words within ``max_distance`` edits of ``word``.
+        
+        Args:
+            word: The query word
+            max_distance: Maximum edit distance (inclusive)
+            limit: Maximum number of results to return (closest first)
+            
+        Returns:
+            List of (distance, word) tuples sorted by distance
+        """
+        if self.root is None:
+            return []
+        
+        results = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            dist = self.distance(word, node_word)
+            if dist <= max_distance:
+                results.append((dist, node_word))
+            
+            low, high = dist - max_distance, dist + max_distance
+            for edge, child in children.items():
+                if low <= edge <= high:
+                    stack.append(child)
+        
+        results.sort()
+        return results[:limit] if limit else results
+    
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,70 @@
+"""Hash indexes for O(1) card lookups by name and ID."""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+class CardNameIndex:
+    """Exact-name, lowercase-name and card-ID dictionaries over a catalog."""
+    
+    def __init__(self):
+        """Initialize empty indexes."""
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_lower_name: Dict[str, Dict[str, Any]] = {}
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+    
+    def add(self, card: Dict[str, Any]):
+        """Add a single card to every index.
+        
+        The first card seen keeps a lowercase name, mirroring the order the
+        API returns cards in.
+        """
+        name = card['name']
+        self.by_name[name] = card
+        self.by_lower_name.setdefault(name.lower(), card)
+        
+        card_id = card.get('id')
+        if card_id is not None:
+            self.by_id[int(card_id)] = card
+    
+    def remove(self, card: Dict[str, Any]):
+        """Remove a card from every index it is listed under.
+        
+        Entries are matched by card ID, so another card that took over the
+        name (or ID) is left in place.
+        """
+        card_id = card.get('id')
+        name = card['name']
+        if name in self.by_name and self.by_name[name].get('id') == card_id:
+            del self.by_name[name]
+        if name.lower() in self.by_lower_name and self.by_lower_name[name.lower()].get('id') == card_id:
+            del self.by_lower_name[name.lower()]
+        if card_id is not None and self.by_id.get(int(card_id), {}).get('name') == name:
+            del self.by_id[int(card_id)]
+    
+    def build(self, cards: Iterable[Dict[str, Any]]):
+        """Rebuild the indexes from a card catalog."""
+        self.by_name = {}
+        self.by_lower_name = {}
+        self.by_id = {}
+        for card in cards:
+            self.add(card)
+    
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a card by name, falling back to a case-insensitive match."""
+        card = self.by_name.get(name)
+        if card is None:
+            card = self.by_lower_name.get(name.lower())
+        return card
+    
+    def get_by_id(self, card_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a card by its numeric ID."""
+        try:
+            return self.by_id.get(int(card_id))
+        except (TypeError, ValueError):
+            return None
+    
+    def __len__(self) -> int:
+        return len(self.by_name)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_name
@@ -0,0 +1,79 @@
+"""Trigram index for case-insensitive substring search over card names."""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+class SubstringIndex:
+    """Answers "name contains query" lookups without scanning every name.
+    
+    Each lowercase name is split into overlapping trigrams. Any name
+    containing a query also contains all of the query's trigrams, so
+    intersecting their posting lists yields a small candidate set that is
+    then verified with a plain substring check. Queries shorter than a
+    trigram fall back to a scan.
+    """
+    
+    N = 3
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self.names: List[str] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+    
+    def _trigrams(self, text: str) -> set:
+        """Get the distinct trigrams of a lowercase string."""
+        return {text[i:i + self.N] for i in range(len(text) - self.N + 1)}
+    
+    def add(self, name: str) -> int:
+        """Add a name to the index.
+        
+        Returns:
+            The position assigned to the name
+        """
+        position = len(self.names)
+        lowered = name.lower()
+        self.names.append(lowered)
+        for gram in self._trigrams(lowered):
+            self.postings[gram].append(position)
+        return position
+    
+    def build(self, names: Iterable[str]):
+        """Rebuild the index, assigning positions in iteration order."""
+        self.names = []
+        self.postings = defaultdict(list)
+        for name in names:
+            self.add(name)
+    
+    def search(self, query: str) -> List[int]:
+        """Find the positions of all names containing the query.
+        
+        Args:
+            query: Substring to look for (case-insensitive)
+            
+        Returns:
+            Matching positions in ascending order
+        """
+        query = query.lower()
+        if len(query) < self.N:
+            return [position for position, name in enumerate(self.names) if query in name]
+        
+        posting_lists = []
+        for gram in self._trigrams(query):
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            posting_lists.append(posting)
+        
+        # Intersect starting from the rarest trigram
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        
+        return sorted(position for position in candidates if query in self.names[position])
+    
+    def __len__(self) -> int:
+        return len(self.names)
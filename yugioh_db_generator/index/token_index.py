@@ -0,0 +1,63 @@
+"""Inverted token index over card names."""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TokenIndex:
+    """Maps lowercase name tokens to posting lists of card positions.
+    
+    Card positions are indexes into the catalog list the index was built
+    from, so lookups never need to scan the catalog itself.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+    
+    def add(self, position: int, name: str):
+        """Add a card name to the index.
+        
+        Args:
+            position: Position of the card in the catalog
+            name: The card name to tokenize
+        """
+        for token in set(tokenize(name)):
+            self.postings[token].append(position)
+    
+    def build(self, names: Iterable[str]):
+        """Index every name, using its position in the iterable as the card position."""
+        self.postings = defaultdict(list)
+        for position, name in enumerate(names):
+            self.add(position, name)
+    
+    def score(self, tokens: List[str]) -> Dict[int, int]:
+        """Score cards sharing at least one token with the query.
+        
+        Each query token that appears in a card name adds its length to that
+        card's score, so longer (more distinctive) tokens weigh more.
+        
+        Args:
+            tokens: Query tokens (case-insensitive)
+            
+        Returns:
+            Dictionary mapping card positions to their token scores
+        """
+        scores: Dict[int, int] = defaultdict(int)
+        for token in tokens:
+            weight = len(token)
+            for position in self.postings.get(token.lower(), ()):
+                scores[position] += weight
+        return scores
+    
+    def __len__(self) -> int:
+        return len(self.postings)
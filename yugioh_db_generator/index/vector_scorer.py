@@ -0,0 +1,139 @@
+"""Vectorized character n-gram scoring over the whole card catalog.
+
+Requires NumPy and SciPy (``pip install yugioh-db-generator[vector]``).
+Use ``NgramVectorScorer.is_available()`` before constructing a scorer.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None
+    sparse = None
+
+
+class NgramVectorScorer:
+    """Cosine similarity between character n-gram vectors of names.
+    
+    Every catalog name is encoded once into a row of an L2-normalized sparse
+    n-gram count matrix. A query is scored against the whole catalog with
+    one sparse matrix-vector product, and a batch of queries with a single
+    sparse matrix product.
+    """
+    
+    def __init__(self, n: int = 3):
+        """Initialize an empty scorer.
+        
+        Args:
+            n: Length of the character n-grams
+        """
+        if not self.is_available():
+            raise ImportError("NgramVectorScorer requires numpy and scipy")
+        self.n = n
+        self.vocabulary: Dict[str, int] = {}
+        self.matrix = sparse.csc_matrix((0, 0), dtype=np.float32)
+    
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the optional NumPy/SciPy dependencies are installed."""
+        return np is not None and sparse is not None
+    
+    def _ngrams(self, text: str) -> List[str]:
+        """Split padded, lowercased text into overlapping n-grams."""
+        padded = f" {' '.join(text.lower().split())} "
+        return [padded[i:i + self.n] for i in range(max(1, len(padded) - self.n + 1))]
+    
+    def build(self, names: Iterable[str]):
+        """Encode every catalog name into the n-gram matrix."""
+        vocabulary = {}
+        indptr, indices, data = [0], [], []
+        for name in names:
+            counts = {}
+            for gram in self._ngrams(name):
+                column = vocabulary.setdefault(gram, len(vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), indices, indptr),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+        self.vocabulary = vocabulary
+        # Column-major storage lets a query touch only the columns of its n-grams
+        self.matrix = self._normalize_rows(matrix).tocsc()
+    
+    def _normalize_rows(self, matrix):
+        """Scale every row of a sparse matrix to unit L2 norm."""
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(matrix).astype(np.float32)
+    
+    def _encode(self, queries: List[str]):
+        """Encode queries into a normalized sparse matrix over the catalog vocabulary."""
+        indptr, indices, data = [0], [], []
+        for query in queries:
+            counts = {}
+            for gram in self._ngrams(query):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), indices, indptr),
+            shape=(len(queries), len(self.vocabulary))
+        )
+        return self._normalize_rows(matrix)
+    
+    def score(self, query: str):
+        """Score a query against every catalog name.
+        
+        Returns:
+            Array of cosine similarities, one per catalog position
+        """
+        encoded = self._encode([query])
+        columns = encoded.indices
+        if not len(columns):
+            return np.zeros(self.matrix.shape[0], dtype=np.float32)
+        return self.matrix[:, columns].dot(encoded.data)
+    
+    def top_k(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Get the ``k`` best-scoring catalog positions for a query.
+        
+        Returns:
+            List of (position, score) tuples, best first, excluding zero scores
+        """
+        return self._top_k_row(self.score(query), k)
+    
+    def top_k_many(self, queries: List[str], k: int = 10) -> List[List[Tuple[int, float]]]:
+        """Get the ``k`` best-scoring catalog positions for each query in a batch."""
+        if not queries:
+            return []
+        scores = self._encode(queries).dot(self.matrix.T).tocsr()
+        results = []
+        for row in range(len(queries)):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            positions = scores.indices[start:end]
+            results.append([
+                (int(positions[i]), value)
+                for i, value in self._top_k_row(scores.data[start:end], k)
+            ])
+        return results
+    
+    def _top_k_row(self, scores, k: int) -> List[Tuple[int, float]]:
+        """Select the top ``k`` entries of a dense score vector."""
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(i), float(scores[i])) for i in candidates if scores[i] > 0]
+    
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
@@ -17,3 +17,12 @@ from yugioh_db_generator.utils.string_utils import (
     extract_tokens,
     find_distinctive_tokens
 )
+
+from yugioh_db_generator.utils.cache_utils import (
+    AsyncSingleFlight,
+    FrozenDict,
+    FrozenList,
+    LRUCache,
+    SingleFlight,
+    freeze
+)
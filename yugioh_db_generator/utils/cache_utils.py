@@ -0,0 +1,308 @@
+"""Thread-safe in-memory caching utilities."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Cached data is read-only; copy it with dict() or list() to modify it")
+
+
+class FrozenDict(dict):
+    """Read-only dictionary, used for values shared through a cache.
+    
+    A ``dict`` subclass, so it compares equal to, serializes like and
+    passes ``isinstance`` checks as the dictionary it was made from;
+    ``dict(frozen)`` gives a mutable (shallow) copy.
+    """
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list, the counterpart of ``FrozenDict``."""
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Get a read-only deep copy of JSON data (``FrozenDict``s and ``FrozenList``s)."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+    
+    The first caller for a key runs the function; callers arriving while
+    it is still running wait for and share its result (or exception).
+    """
+    
+    def __init__(self):
+        """Initialize the in-flight call registry."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.shared = 0  # Calls answered by another caller's execution
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run ``func`` for ``key`` unless a call for it is already in flight.
+        
+        Args:
+            key: Identifies equivalent calls
+            func: Zero-argument function producing the result
+        
+        Returns:
+            The result of the (possibly shared) execution
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines running on one event loop."""
+    
+    def __init__(self):
+        """Initialize the in-flight call registry."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0  # Calls answered by another caller's execution
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``func()`` for ``key`` unless a call for it is already in flight.
+        
+        Args:
+            key: Identifies equivalent calls
+            func: Coroutine function producing the result
+        
+        Returns:
+            The result of the (possibly shared) execution
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # A cancelled waiter must not cancel the call the others share
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved: waiters re-raise it, no one else has to
+            raise
+        finally:
+            del self._calls[key]
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache with optional TTL.
+    
+    Besides the number of entries, the cache can bound their total weight
+    (e.g. their size in bytes): each entry has a weight, given to ``set``
+    or computed by ``weigh``, and least recently used entries are evicted
+    until both bounds hold.
+    
+    ``None`` is a valid cached value, which makes the cache suitable for
+    negative caching: a stored miss is returned as a hit instead of
+    triggering the computation again. Misses can be given a shorter
+    ``negative_ttl``, so one caused by a transient failure is retried soon.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_weight: Optional[int] = None,
+        weigh: Callable[[Any], int] = lambda value: 1,
+        negative_ttl: Optional[float] = None
+    ):
+        """Initialize the cache.
+        
+        Args:
+            capacity: Maximum number of entries (least recently used are evicted)
+            ttl: Seconds an entry stays valid (None for no expiry)
+            clock: Monotonic time source, replaceable for testing
+            max_weight: Maximum total weight of the entries (None for no bound)
+            weigh: Weight of a value stored without an explicit weight
+            negative_ttl: Seconds a cached None stays valid (None to use ``ttl``)
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.negative_ttl = negative_ttl
+        self.weight = 0  # Total weight of the entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._flight = SingleFlight()
+        
+        self.hits = 0
+        self.negative_hits = 0  # Hits on a cached None
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _lookup(self, key: Hashable, count: bool = True) -> Tuple[bool, Any]:
+        """Find a live entry, returning (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                        if value is None:
+                            self.negative_hits += 1
+                    return True, value
+                
+                self._remove(key)
+                self.expirations += 1
+            
+            if count:
+                self.misses += 1
+            return False, None
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or ``default`` if absent or expired."""
+        found, value = self._lookup(key)
+        return value if found else default
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value like ``get``, without counting a hit or miss."""
+        found, value = self._lookup(key, count=False)
+        return value if found else default
+    
+    def set(self, key: Hashable, value: Any, weight: Optional[int] = None):
+        """Store a value, evicting least recently used entries while over a bound.
+        
+        Args:
+            key: Key of the entry
+            value: Value to store
+            weight: Weight of the entry (``weigh(value)`` if omitted); a
+                value heavier than ``max_weight`` is not stored
+        """
+        ttl = self.ttl
+        if value is None and self.negative_ttl is not None:
+            ttl = self.negative_ttl if ttl is None else min(ttl, self.negative_ttl)
+        expires_at = self.clock() + ttl if ttl is not None else None
+        if weight is None:
+            weight = self.weigh(value)
+        with self._lock:
+            self._remove(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._entries[key] = (value, expires_at, weight)
+            self.weight += weight
+            while len(self._entries) > self.capacity or (
+                self.max_weight is not None and self.weight > self.max_weight
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def discard(self, key: Hashable):
+        """Remove an entry if present."""
+        with self._lock:
+            self._remove(key)
+    
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get a cached value, computing and storing it on a miss.
+        
+        Concurrent misses for the same key are coalesced so ``compute``
+        runs once; its result (including None) is cached.
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        
+        def load():
+            # Another caller may have stored the value since our miss
+            found, value = self._lookup(key, count=False)
+            if found:
+                return value
+            value = compute()
+            self.set(key, value)
+            return value
+        
+        return self._flight.do(key, load)
+    
+    def clear(self):
+        """Remove every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "weight": self.weight,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced": self._flight.shared
+            }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key, count=False)[0]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
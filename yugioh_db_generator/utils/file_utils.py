@@ -9,8 +9,17 @@ from typing import List, Dict, Optional
 logger = logging.getLogger(__name__)
 
 
-def read_deck_list(filename: str) -> List[str]:
-    """Read a deck list from a file."""
+def read_deck_list(filename: str, api_client=None) -> List[str]:
+    """Read a deck list from a file.
+    
+    Args:
+        filename: Path to a plain text deck list or a YDK file
+        api_client: ``YGOPRODeckAPI`` used to map the card IDs of a YDK
+            file to names (YDK files cannot be read without one)
+        
+    Returns:
+        List of card names
+    """
     if not os.path.exists(filename):
         logger.error(f"File not found: {filename}")
         return []
@@ -21,7 +30,7 @@ def read_deck_list(filename: str) -> List[str]:
             
         # Better format detection
         if content.strip().startswith('#main') or content.strip().startswith('#created by'):
-            return _parse_ydk_file(filename)  # Only for actual YDK files
+            return _parse_ydk_file(filename, api_client)  # Only for actual YDK files
         else:
             return _parse_text_file(filename)  # Plain text with possible comments
             
@@ -55,7 +64,7 @@ def _parse_text_file(filename: str) -> List[str]:
         return []
 
 
-def _parse_ydk_file(filename: str) -> List[str]:
+def _parse_ydk_file(filename: str, api_client=None) -> List[str]:
     """Parse a YDK deck list file.
     
     YDK Format:
@@ -66,18 +75,47 @@ def _parse_ydk_file(filename: str) -> List[str]:
     #extra
     <card_id>
     ...
+    !side
+    <card_id>
+    ...
+    
+    The IDs of every section are resolved in one batched lookup, from the
+    local catalog when it is available and otherwise in as few API
+    requests as the URL length allows.
     
     Args:
         filename: Path to the YDK file
+        api_client: ``YGOPRODeckAPI`` used to map the card IDs to names
         
     Returns:
-        List of card names (empty if YDK parsing is not implemented)
+        List of card names, one per copy, in file order
     """
-    # YDK files contain card IDs, not names
-    # We would need to lookup names using the IDs
-    logger.warning("YDK format parsing requires card ID to name mapping, which is not implemented yet")
-    logger.warning("Please convert your YDK file to a plain text file with one card name per line")
-    return []
+    if api_client is None:
+        logger.error("YDK files list card IDs; an API client is needed to look up their names")
+        return []
+    
+    card_ids = []
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                # Section headers (#main, #extra, !side) and comments
+                if not line or line[0] in '#!':
+                    continue
+                if line.isdigit():
+                    card_ids.append(int(line))
+                else:
+                    logger.warning(f"Skipping invalid YDK line: {line}")
+    except Exception as e:
+        logger.error(f"Error parsing YDK file: {e}")
+        return []
+    
+    cards = api_client.get_cards_by_ids(card_ids)
+    for card_id in dict.fromkeys(card_ids):
+        if card_id not in cards:
+            logger.warning(f"No card found for ID {card_id} in {filename}")
+    
+    return [cards[card_id]['name'] for card_id in card_ids if card_id in cards]
 
 
 def write_corrections(corrections: Dict[str, str], filename: str) -> None:
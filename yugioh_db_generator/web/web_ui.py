@@ -4,6 +4,7 @@ import os
 import sys
 import json
 import tempfile
+import threading
 from typing import List, Dict, Any
 import traceback
 
@@ -12,8 +13,10 @@ from flask import Flask, render_template, request, redirect, url_for, flash, sen
 # Add parent directory to path to import the package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from yugioh_db_generator.api.async_card_api import AsyncYGOPRODeckAPI
 from yugioh_db_generator.api.card_api import YGOPRODeckAPI
 from yugioh_db_generator.core.card_database import CardDatabaseGenerator
+from yugioh_db_generator.core.search_engine import CardSearchEngine
 from yugioh_db_generator.utils.logging_utils import setup_logging
 
 # Set up logging
@@ -41,6 +44,20 @@ current_progress = {
 # Store recent generations for download
 recent_outputs = []
 
+# Search engine shared by the API endpoints (built on first use)
+search_engine = None
+search_engine_lock = threading.Lock()
+
+
+def get_search_engine() -> CardSearchEngine:
+    """Get the shared search engine, loading the card catalog on first use."""
+    global search_engine
+    with search_engine_lock:
+        if search_engine is None:
+            api_client = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=True)
+            search_engine = CardSearchEngine(api_client)
+        return search_engine
+
 
 @app.route('/')
 def index():
@@ -71,7 +88,7 @@ def generate():
         
         # Convert text area to card list
         deck_list = [line.strip() for line in card_list.split('\n') if line.strip() and not line.strip().startswith('#')]
-        current_progress['total'] = len(deck_list)
+        current_progress['total'] = len(dict.fromkeys(deck_list))  # Copies are processed once
         
         if not deck_list:
             flash('Please enter at least one card name', 'error')
@@ -85,37 +102,26 @@ def generate():
         fd, corrections_file = tempfile.mkstemp(suffix='.txt')
         os.close(fd)
         
+        # Count each card as soon as its name is resolved
+        def track_progress(card_name, card_data):
+            current_progress['processed'] += 1
+            if card_data is None:
+                current_progress['not_found'] += 1
+            elif card_name in generator.get_name_corrections():
+                current_progress['corrected'] += 1
+            else:
+                current_progress['found'] += 1
+        
         # Create a generator with progress tracking
         generator = CardDatabaseGenerator(
             output_file=output_file,
             output_format=output_format,
             max_workers=thread_count,
             cache_dir=cache_dir,
-            use_cache=use_cache
+            use_cache=use_cache,
+            progress_callback=track_progress
         )
         
-        # Monkey patch the process card method to track progress
-        original_process_card = generator._process_card
-        
-        def process_card_with_tracking(card_name, current, total):
-            try:
-                result = original_process_card(card_name, current, total)
-                current_progress['processed'] += 1
-                if result:
-                    if card_name in generator.search_engine.correction_map:
-                        current_progress['corrected'] += 1
-                    else:
-                        current_progress['found'] += 1
-                else:
-                    current_progress['not_found'] += 1
-                return result
-            except Exception as e:
-                logger.error(f"Error processing card '{card_name}': {e}")
-                current_progress['not_found'] += 1
-                return None
-        
-        generator._process_card = process_card_with_tracking
-        
         # Generate the database
         try:
             generator.generate_database(deck_list)
@@ -175,7 +181,7 @@ def analyzer():
 
 # Add API endpoints for deck analysis
 @app.route('/api/analyze-deck', methods=['POST'])
-def analyze_deck_api():
+async def analyze_deck_api():
     """API endpoint for analyzing a deck."""
     try:
         # Get deck list from request
@@ -200,20 +206,27 @@ def analyze_deck_api():
         # Use the DeckStrengthAnalyzer to analyze the deck
         from yugioh_db_generator.ai.deck_analyzer import DeckStrengthAnalyzer
         
-        # Get card data
-        from yugioh_db_generator.api.card_api import YGOPRODeckAPI
-        api_client = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=True)
-        
-        # Fetch card data for the deck
+        # Fetch card data for the deck, resolving each distinct name once
         card_data = {}
         all_cards = main_deck + extra_deck
-        for card_name in all_cards:
-            try:
-                card_info = api_client.get_card_by_name(card_name)
+        try:
+            # Look the cards up on the event loop so waiting on the API holds no thread
+            engine = get_search_engine()
+            async with AsyncYGOPRODeckAPI(
+                cache_dir=cache_dir,
+                use_cache=True,
+                rate_limiter=engine.api_client.rate_limiter,
+                circuit_breaker=engine.api_client.circuit_breaker,
+                response_cache=engine.api_client.response_cache,
+                catalog=engine.api_client.catalog
+            ) as async_client:
+                results = await engine.search_many_async(all_cards, async_client)
+            for card_name, card_info in zip(all_cards, results):
                 if card_info:
-                    card_data[card_name] = card_info
-            except Exception as e:
-                logger.error(f"Error fetching card data for {card_name}: {e}")
+                    # Catalog cards are compact records; the response needs plain dicts
+                    card_data[card_name] = dict(card_info)
+        except Exception as e:
+            logger.error(f"Error fetching card data for the deck: {e}")
         
         # Initialize the analyzer
         analyzer = DeckStrengthAnalyzer()
@@ -254,13 +267,16 @@ def card_image(card_name):
 def card_details(card_name):
     """API endpoint for getting detailed card information."""
     try:
-        # Create API client
-        api_client = YGOPRODeckAPI(cache_dir=cache_dir, use_cache=True)
+        # Share the search engine's client, whose catalog is already loaded
+        api_client = get_search_engine().api_client
         
         # Get card information
         card_info = api_client.get_card_by_name(card_name)
         
         if card_info:
+            # Catalog cards are compact records; the response needs the full card
+            card_info = {**card_info, **api_client.get_card_extras(card_info)}
+            
             # Get rulings for the card
             from yugioh_db_generator.ai.rule_generator import AIRuleGenerator
             